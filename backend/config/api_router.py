@@ -11,7 +11,11 @@ from connect_access.core.loading import get_class, get_classes
 )
 
 MediationRequestViewSet = get_class("mediations.api", "MediationRequestViewSet")
+MediationRequestStatisticsView = get_class(
+    "statistics.api", "MediationRequestStatisticsView"
+)
 TraceReportViewSet = get_class("trace_report.api", "TraceReportViewSet")
+UploadViewSet = get_class("uploads.api", "UploadViewSet")
 UserViewSet = get_class("users.api", "UserViewSet")
 
 router: Union[SimpleRouter, DefaultRouter]
@@ -23,6 +27,7 @@ else:
 router.register("users", UserViewSet)
 router.register("mediation-requests", MediationRequestViewSet, "mediation_requests")
 router.register("trace-reports", TraceReportViewSet, "trace_reports")
+router.register("uploads", UploadViewSet, "uploads")
 
 urlpatterns: List[Union[URLPattern, URLResolver]] = [
     path(
@@ -40,6 +45,11 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
         TraceReportViewSet.as_view({"get": "by_mediation_request"}),
         name="trace_reports-by-mediation-request",
     ),
+    path(
+        "statistics/mediation-requests/",
+        MediationRequestStatisticsView.as_view(),
+        name="statistics-mediation-requests",
+    ),
 ]
 
 app_name = "api"
@@ -0,0 +1,39 @@
+"""
+ASGI config for Connect Access project.
+
+It exposes the ASGI callable as a module-level variable named ``application``,
+serving Django, and the event stream of the admin dashboard (see event_stream)
+on EVENTS_PATH. In production, it is served by gunicorn with uvicorn workers
+(``gunicorn config.asgi -k uvicorn.workers.UvicornWorker``).
+
+Django reads the request bodies on the event loop before calling the views,
+so slow uploads of the public submissions don't hold a worker. The
+asynchronous views (see AsyncViewMixin), like the public creation of the
+mediation requests and the configuration reads, only use a thread for their
+database accesses, while the synchronous ones run in a thread of their own per
+request. The benchmarkconcurrency command compares a deployment with the WSGI
+one.
+
+"""
+import os
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+
+ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(ROOT_DIR / "connect_access"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+django_application = get_asgi_application()
+
+# Imported once Django is set up.
+from connect_access.apps.events.asgi import event_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == settings.EVENTS_PATH:
+        await event_stream(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
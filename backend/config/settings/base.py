@@ -91,6 +91,10 @@ CONNECT_ACCESS_APPS = {
     "connect_access.apps.mediations": True,
     "connect_access.apps.mediations.trace_report": True,
     "connect_access.apps.configuration": True,
+    "connect_access.apps.notifications": True,
+    "connect_access.apps.statistics": True,
+    "connect_access.apps.events": True,
+    "connect_access.apps.uploads": True,
 }
 
 CONNECT_ACCESS_PLUGIN_APPS: Dict[str, bool] = {}
@@ -307,6 +311,49 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-routes
+# Emails have their own queue, so that they don't wait behind other tasks.
+CELERY_TASK_ROUTES = {
+    "connect_access.core.tasks.send_multialternative_mail": {"queue": "emails"},
+    "connect_access.core.tasks.send_multialternative_mails": {"queue": "emails"},
+    "connect_access.apps.notifications.tasks.drain_outbox": {"queue": "emails"},
+}
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-schedule
+# Installed in the database by the scheduler of django-celery-beat.
+CELERY_BEAT_SCHEDULE = {
+    "drain-email-outbox": {
+        "task": "connect_access.apps.notifications.tasks.drain_outbox",
+        "schedule": 60.0,
+    },
+    "update-statistics": {
+        "task": "connect_access.apps.statistics.tasks.update_statistics",
+        "schedule": 15 * 60.0,
+    },
+    "purge-tombstones": {
+        "task": "connect_access.apps.mediations.tasks.purge_tombstones",
+        "schedule": 24 * 60 * 60.0,
+    },
+    "remove-personal-information": {
+        "task": "connect_access.apps.mediations.tasks.remove_personal_information",
+        "schedule": 60 * 60.0,
+    },
+    "purge-mediation-requests": {
+        "task": "connect_access.apps.mediations.tasks.purge_mediation_requests",
+        "schedule": 24 * 60 * 60.0,
+    },
+    "purge-expired-uploads": {
+        "task": "connect_access.apps.uploads.tasks.purge_expired_uploads",
+        "schedule": 60 * 60.0,
+    },
+    "delete-files": {
+        "task": "connect_access.apps.uploads.tasks.delete_files",
+        "schedule": 5 * 60.0,
+    },
+    "reconcile-stored-files": {
+        "task": "connect_access.apps.uploads.tasks.reconcile_stored_files",
+        "schedule": 24 * 60 * 60.0,
+    },
+}
 
 # django-rest-framework
 # -------------------------------------------------------------------------------
@@ -316,8 +363,22 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # Scopes of ScopedRateThrottle.
+    "DEFAULT_THROTTLE_RATES": {
+        "uploads": env("UPLOADS_THROTTLE_RATE", default="30/hour"),
+    },
 }
 
+# Keyset pagination of the API lists, opted in by clients sending page_size or cursor.
+API_PAGE_SIZE = env.int("API_PAGE_SIZE", default=100)
+API_MAX_PAGE_SIZE = env.int("API_MAX_PAGE_SIZE", default=1000)
+# Delta sync of the API lists (see DeltaSyncViewMixin): days the deletions are kept,
+# seconds the changes are given again to clients, in case of late commits, and
+# changes per page.
+API_SYNC_RETENTION = env.int("API_SYNC_RETENTION", default=30)
+API_SYNC_OVERLAP = env.int("API_SYNC_OVERLAP", default=60)
+API_SYNC_PAGE_SIZE = env.int("API_SYNC_PAGE_SIZE", default=1000)
+
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
 # Your stuff...
@@ -348,6 +409,92 @@ DJOSER = {
 }
 
 MEDIATION_REQUEST_EMAIL = env("MEDIATION_REQUEST_EMAIL", default="")
+# Notify MEDIATION_REQUEST_EMAIL of the new requests with a digest email sent every
+# MEDIATION_REQUEST_DIGEST_INTERVAL seconds, except for the urgencies listed in
+# MEDIATION_REQUEST_IMMEDIATE_URGENCIES (names, such as VERY_URGENT).
+MEDIATION_REQUEST_DIGEST = env.bool("MEDIATION_REQUEST_DIGEST", default=False)
+MEDIATION_REQUEST_DIGEST_INTERVAL = env.int(
+    "MEDIATION_REQUEST_DIGEST_INTERVAL", default=60 * 60
+)
+MEDIATION_REQUEST_IMMEDIATE_URGENCIES = env.list(
+    "MEDIATION_REQUEST_IMMEDIATE_URGENCIES", default=[]
+)
+if MEDIATION_REQUEST_DIGEST:
+    CELERY_BEAT_SCHEDULE["mediators-digest"] = {
+        "task": "connect_access.apps.mediations.tasks.send_mediators_digest",
+        "schedule": float(MEDIATION_REQUEST_DIGEST_INTERVAL),
+    }
+# Maximum number of mediation requests accepted by the bulk endpoint, and number
+# of requests inserted per query.
+MEDIATION_REQUEST_BULK_MAX_SIZE = env.int(
+    "MEDIATION_REQUEST_BULK_MAX_SIZE", default=10000
+)
+MEDIATION_REQUEST_BULK_BATCH_SIZE = env.int(
+    "MEDIATION_REQUEST_BULK_BATCH_SIZE", default=500
+)
+# Retention of the mediation requests (see purge_expired_mediation_requests): days
+# without modification after which the requests of a status (name, such as
+# CLOTURED=730) are deleted, the other statuses being kept; statuses whose requests
+# are archived as NDJSON in MEDIATION_RETENTION_ARCHIVE_ROOT before; and number of
+# requests deleted per transaction.
+MEDIATION_RETENTION_DAYS = env.dict(
+    "MEDIATION_RETENTION_DAYS", cast={"value": int}, default={}
+)
+MEDIATION_RETENTION_ARCHIVED_STATUSES = env.list(
+    "MEDIATION_RETENTION_ARCHIVED_STATUSES", default=[]
+)
+MEDIATION_RETENTION_ARCHIVE_ROOT = env(
+    "MEDIATION_RETENTION_ARCHIVE_ROOT", default=str(ROOT_DIR / "archives")
+)
+MEDIATION_RETENTION_BATCH_SIZE = env.int("MEDIATION_RETENTION_BATCH_SIZE", default=500)
+# Number of closed anonymous requests whose personal information is removed per
+# transaction (see remove_personal_information).
+MEDIATION_ANONYMIZATION_BATCH_SIZE = env.int(
+    "MEDIATION_ANONYMIZATION_BATCH_SIZE", default=1000
+)
+
+# Event stream of the changes, served by config.asgi on EVENTS_PATH (see event_stream),
+# and broker fanning out the events between the processes.
+EVENTS_PATH = "/api/events/"
+EVENTS_BROKER = env(
+    "EVENTS_BROKER", default="connect_access.apps.events.brokers.RedisBroker"
+)
+EVENTS_REDIS_URL = env("REDIS_URL", default=CELERY_BROKER_URL)
+
+# Chunked uploads of the attached files (see UploadViewSet): directory of the partial
+# files, maximum length of a file in bytes, for the users and the anonymous ones, and
+# hours after which the uploads neither completed nor attached are deleted, as well as
+# the tokens attaching them to anonymous mediation requests.
+UPLOADS_PARTIAL_ROOT = env(
+    "UPLOADS_PARTIAL_ROOT", default=str(APPS_DIR / "media" / "partial_uploads")
+)
+UPLOADS_MAX_LENGTH = env.int("UPLOADS_MAX_LENGTH", default=2 * 1024**3)
+UPLOADS_ANONYMOUS_MAX_LENGTH = env.int(
+    "UPLOADS_ANONYMOUS_MAX_LENGTH", default=100 * 1024**2
+)
+UPLOADS_EXPIRATION = env.int("UPLOADS_EXPIRATION", default=24)
+
+# File deletions (see delete_files): number of files deleted per transaction, threads
+# deleting them, retries (delay doubled at each attempt), and hours after which a file
+# that no row references is deleted by reconcile_stored_files.
+FILE_DELETION_BATCH_SIZE = env.int("FILE_DELETION_BATCH_SIZE", default=100)
+FILE_DELETION_WORKERS = env.int("FILE_DELETION_WORKERS", default=8)
+FILE_DELETION_MAX_ATTEMPTS = env.int("FILE_DELETION_MAX_ATTEMPTS", default=5)
+FILE_DELETION_RETRY_DELAY = env.int("FILE_DELETION_RETRY_DELAY", default=60)
+FILE_ORPHAN_GRACE = env.int("FILE_ORPHAN_GRACE", default=24)
+
+# Email outbox (see OutboxEmailBackend): backend delivering the emails, number of
+# emails claimed at once by a worker, retries (delay doubled at each attempt),
+# seconds a run claims emails, within CELERY_TASK_SOFT_TIME_LIMIT, and seconds after
+# which the emails of a killed worker are claimed again, beyond CELERY_TASK_TIME_LIMIT.
+OUTBOX_EMAIL_BACKEND = env(
+    "OUTBOX_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+)
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=100)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=8)
+OUTBOX_RETRY_DELAY = env.int("OUTBOX_RETRY_DELAY", default=60)
+OUTBOX_RUN_TIME = env.int("OUTBOX_RUN_TIME", default=45)
+OUTBOX_SENDING_TIMEOUT = env.int("OUTBOX_SENDING_TIMEOUT", default=10 * 60)
 
 # django-csp - https://django-csp.readthedocs.io/en/latest/configuration.html
 CSP_DEFAULT_SRC = ["'self'", "'unsafe-inline'", "data:"]
@@ -206,11 +206,11 @@ WEBPACK_LOADER = {
     },
 }
 
-# django-celery-email
+# Email outbox
 # ------------------------------------------------------------------------------
-# https://github.com/pmclanahan/django-celery-email
-INSTALLED_APPS += ["djcelery_email"]  # noqa F405
-EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
+# Emails are written to the outbox in the transaction of the request, then
+# delivered by Celery over pooled SMTP connections (see OUTBOX_EMAIL_BACKEND).
+EMAIL_BACKEND = "connect_access.apps.notifications.backends.OutboxEmailBackend"
 
 # django-csp - https://django-csp.readthedocs.io/en/latest/configuration.html
 CSP_DEFAULT_SRC += [env("DATA_PLATFORM_DOMAIN_NAME")]  # noqa F405
@@ -60,5 +60,15 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index] # noqa F405
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# EVENTS
+# ------------------------------------------------------------------------------
+EVENTS_BROKER = "connect_access.apps.events.brokers.LocalBroker"
+
 # Your stuff...
 # ------------------------------------------------------------------------------
+# The bundles of the frontend, as listed by webpack, for the index view.
+WEBPACK_LOADER = {
+    "CONNECT_ACCESS": {
+        "STATS_FILE": str(APPS_DIR / "tests" / "webpack-stats.json"),  # noqa F405
+    }
+}
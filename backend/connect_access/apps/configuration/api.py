@@ -1,29 +1,40 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from connect_access.core.views import AsyncViewMixin
+
 from .models import AboutServiceInformation, ContactInformation
 from .serializers import AboutServiceInformationSerializer, ContactInformationSerializer
 
 
-class ContactInformationView(APIView):
+class ContactInformationView(AsyncViewMixin, APIView):
     permission_classes = [AllowAny]
     lookup_field = "uuid"
 
-    def get(self, request):
+    async def get(self, request):
         """Return the singleton contact information entry."""
-        contact_information = get_object_or_404(
+        contact_information = await sync_to_async(get_object_or_404)(
             ContactInformation,
         )
         serializer = ContactInformationSerializer(contact_information)
         return Response(serializer.data)
 
 
-class AboutServiceInformationView(ListAPIView):
+class AboutServiceInformationView(AsyncViewMixin, ListAPIView):
     """Links for the footer, in about section."""
 
     serializer_class = AboutServiceInformationSerializer
     queryset = AboutServiceInformation.objects.all().order_by("display_order")
     permission_classes = [AllowAny]
+
+    async def get(self, request, *args, **kwargs):
+        return Response(await sync_to_async(self.get_data)())
+
+    def get_data(self):
+        """Return the serialized links, read in a thread by get."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_serializer(queryset, many=True).data
@@ -1,11 +1,21 @@
+import json
 from operator import itemgetter
 
 import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.core.asgi import get_asgi_application
+from django.urls import reverse
 
 from connect_access.apps.configuration.tests.utils import _execute_about_service
+from connect_access.core.loading import get_class
 
 pytestmark = pytest.mark.django_db
 
+AboutServiceInformationFactory = get_class(
+    "configuration.tests.factories", "AboutServiceInformationFactory"
+)
+
 
 class TestAPI:
     def test_about_service_is_sorted_according_to_display_order(self):
@@ -17,3 +27,38 @@ class TestAPI:
         assert response.data[0]["id"] == about_service_2.uuid
         assert response.data[1]["display_order"] == 2
         assert response.data[1]["id"] == about_service_1.uuid
+
+    def test_contact_information_not_found_without_entry(self, client):
+        response = client.get(reverse("api:configuration-contact-information"))
+
+        assert response.status_code == 404
+        assert list(response.json()) == ["detail"]
+
+    def test_configuration_is_read_only(self, client):
+        response = client.post(reverse("api:configuration-about-service"))
+
+        assert response.status_code == 405
+
+    @pytest.mark.django_db(transaction=True)
+    def test_about_service_is_served_under_asgi(self):
+        about_service = AboutServiceInformationFactory()
+
+        async def read():
+            communicator = ApplicationCommunicator(
+                get_asgi_application(),
+                {
+                    "type": "http",
+                    "method": "GET",
+                    "path": reverse("api:configuration-about-service"),
+                    "query_string": b"",
+                    "headers": [(b"host", b"testserver")],
+                },
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(timeout=5)
+            body = await communicator.receive_output(timeout=5)
+            return start, body
+
+        start, body = async_to_sync(read)()
+        assert start["status"] == 200
+        assert json.loads(body["body"])[0]["id"] == str(about_service.uuid)
@@ -1,3 +1,4 @@
+from asgiref.sync import async_to_sync
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory
 
@@ -19,7 +20,7 @@ def _execute_contact_information():
         "api:configuration-contact-information",
     )
     request = APIRequestFactory().get(url)
-    response = ContactInformationView.as_view()(request)
+    response = async_to_sync(ContactInformationView.as_view())(request)
     return {
         "contact_information": contact_information,
         "response": response,
@@ -33,7 +34,7 @@ def _execute_about_service():
         "api:configuration-about-service",
     )
     request = APIRequestFactory().get(url)
-    response = AboutServiceInformationView.as_view()(request)
+    response = async_to_sync(AboutServiceInformationView.as_view())(request)
     return {
         "about_service_1": about_service_1,
         "about_service_2": about_service_2,
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class EventsConfig(AppConfig):
+    label = "events"
+    name = "connect_access.apps.events"
+    verbose_name = _("Events")
+
+    def ready(self):
+        import connect_access.apps.events.receivers  # noqa
+
+        super(EventsConfig, self).ready()
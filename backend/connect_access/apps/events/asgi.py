@@ -0,0 +1,100 @@
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework.authtoken.models import Token
+
+from .brokers import get_broker
+
+# Seconds without events after which a comment is sent, so that proxies keep
+# the connection open.
+KEEPALIVE_INTERVAL = 15
+
+
+async def event_stream(scope, receive, send):
+    """ASGI application streaming the changes to the staff as server-sent events.
+
+    Each event is a JSON object giving the model, the action (created,
+    updated or deleted) and the ids of the changed rows (see
+    publish_on_commit). The token of the user is given in the Authorization
+    header, or in the token query parameter for EventSource clients, which
+    can't set headers. The stream is served outside of Django, which can't
+    stream asynchronously before Django 4.2, so one connection only costs a
+    broker subscription.
+
+    """
+    token = _get_token(scope)
+    if not token or not await _is_staff(token):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 403,
+                "headers": [(b"content-type", b"text/plain")],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"Forbidden"})
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        }
+    )
+    stream = asyncio.ensure_future(_stream_events(send))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    await asyncio.wait({stream, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    for task in (stream, disconnect):
+        task.cancel()
+    await asyncio.gather(stream, disconnect, return_exceptions=True)
+
+
+async def _stream_events(send):
+    idle = 0
+    subscribed = False
+    async for event in get_broker().subscribe():
+        if event is not None:
+            idle = 0
+            data = f"data: {json.dumps(event)}\n\n"
+        elif not subscribed:
+            subscribed = True
+            data = ": connected\n\n"
+        elif idle < KEEPALIVE_INTERVAL:
+            idle += 1
+            continue
+        else:
+            idle = 0
+            data = ": keepalive\n\n"
+        await send(
+            {"type": "http.response.body", "body": data.encode(), "more_body": True}
+        )
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+def _get_token(scope):
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            keyword, _separator, key = value.decode("latin1").partition(" ")
+            if keyword == "Token":
+                return key.strip()
+    query = parse_qs(scope.get("query_string", b"").decode("latin1"))
+    return query.get("token", [None])[0]
+
+
+@sync_to_async
+def _is_staff(token):
+    user = (
+        Token.objects.filter(key=token, user__is_active=True)
+        .values_list("user__is_staff", flat=True)
+        .first()
+    )
+    return bool(user)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import threading
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class RedisBroker:
+    """Fan-out of the events through a Redis pub/sub channel.
+
+    Events are published from any process (web or Celery workers), and each
+    connection of the event stream subscribes to the channel.
+
+    """
+
+    def __init__(self, url=None, channel="connect_access:events"):
+        self.url = url or settings.EVENTS_REDIS_URL
+        self.channel = channel
+        self._client = None
+
+    def publish(self, event):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.channel, json.dumps(event))
+
+    async def subscribe(self):
+        """Yield the events published after the subscription.
+
+        Yields:
+            None once subscribed, then the events, or None every second without
+            events, so that the caller can send keepalives.
+
+        """
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            yield None
+            while True:
+                message = await pubsub.get_message(timeout=1.0)
+                yield json.loads(message["data"]) if message else None
+        finally:
+            await pubsub.unsubscribe(self.channel)
+            await pubsub.close()
+            await client.close()
+
+
+class LocalBroker:
+    """Fan-out of the events within the process, for tests and development."""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def subscribe(self):
+        """Yield the events published after the subscription.
+
+        Yields:
+            None once subscribed, then the events, or None every second without
+            events, so that the caller can send keepalives.
+
+        """
+        queue: asyncio.Queue[dict] = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield None
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+_broker = None
+
+
+def get_broker():
+    """Return the broker of the EVENTS_BROKER setting."""
+    global _broker
+    if _broker is None:
+        _broker = import_string(settings.EVENTS_BROKER)()
+    return _broker
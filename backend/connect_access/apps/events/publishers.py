@@ -0,0 +1,31 @@
+import logging
+
+from django.db import transaction
+from redis.exceptions import RedisError
+
+from .brokers import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def publish_on_commit(model_name, action, ids=None):
+    """Publish a change to the event stream once the transaction is committed.
+
+    Events carry no data but the identifiers of the changed rows, clients
+    reading the changes from the API (see DeltaSyncViewMixin). Without ids,
+    any row may have changed. Failures are logged without failing the change.
+
+    """
+    event = {
+        "model": model_name,
+        "action": action,
+        "ids": [str(id) for id in ids] if ids is not None else None,
+    }
+
+    def publish():
+        try:
+            get_broker().publish(event)
+        except RedisError as error:
+            logger.error(f"The event {event} couldn't be published: {error}")
+
+    transaction.on_commit(publish)
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from connect_access.core.loading import get_model
+
+from .publishers import publish_on_commit
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+
+
+@receiver(post_save, sender=MediationRequest)
+@receiver(post_save, sender=TraceReport)
+def publish_saved(sender, instance, created, **kwargs):
+    publish_on_commit(
+        sender._meta.model_name, "created" if created else "updated", [instance.uuid]
+    )
+
+
+@receiver(post_delete, sender=MediationRequest)
+@receiver(post_delete, sender=TraceReport)
+def publish_deleted(sender, instance, **kwargs):
+    publish_on_commit(sender._meta.model_name, "deleted", [instance.uuid])
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from rest_framework.authtoken.models import Token
+
+from connect_access.core.loading import get_class
+
+pytestmark = pytest.mark.django_db
+
+event_stream = get_class("events.asgi", "event_stream")
+get_broker = get_class("events.brokers", "get_broker")
+AdminUserFactory = get_class("users.tests.factories", "AdminUserFactory")
+UserFactory = get_class("users.tests.factories", "UserFactory")
+
+
+def _scope(query_string=b"", headers=()):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/events/",
+        "query_string": query_string,
+        "headers": list(headers),
+    }
+
+
+class TestEventStream:
+    def test_streams_the_events_to_the_staff(self):
+        token = Token.objects.create(user=AdminUserFactory())
+        event = {"model": "mediationrequest", "action": "updated", "ids": None}
+
+        async def stream():
+            communicator = ApplicationCommunicator(
+                event_stream,
+                _scope(headers=[(b"authorization", f"Token {token.key}".encode())]),
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(timeout=5)
+            connected = await communicator.receive_output(timeout=5)
+            get_broker().publish(event)
+            data = await communicator.receive_output(timeout=5)
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(timeout=5)
+            return start, connected, data
+
+        start, connected, data = async_to_sync(stream)()
+        assert start["status"] == 200
+        assert (b"content-type", b"text/event-stream") in start["headers"]
+        assert connected["body"] == b": connected\n\n"
+        assert data["body"] == f"data: {json.dumps(event)}\n\n".encode()
+
+    def test_accepts_the_token_in_the_query_string(self):
+        token = Token.objects.create(user=AdminUserFactory())
+
+        async def stream():
+            communicator = ApplicationCommunicator(
+                event_stream, _scope(f"token={token.key}".encode())
+            )
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(timeout=5)
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(timeout=5)
+            return start
+
+        assert async_to_sync(stream)()["status"] == 200
+
+    @pytest.mark.parametrize("with_token", [True, False])
+    def test_is_forbidden_without_a_staff_token(self, with_token):
+        query_string = b""
+        if with_token:
+            token = Token.objects.create(user=UserFactory())
+            query_string = f"token={token.key}".encode()
+
+        async def stream():
+            communicator = ApplicationCommunicator(event_stream, _scope(query_string))
+            await communicator.send_input({"type": "http.request"})
+            start = await communicator.receive_output(timeout=5)
+            await communicator.wait(timeout=5)
+            return start
+
+        assert async_to_sync(stream)()["status"] == 403
@@ -0,0 +1,72 @@
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from connect_access.core.loading import get_class
+
+pytestmark = pytest.mark.django_db
+
+get_broker = get_class("events.brokers", "get_broker")
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+TraceReportFactory = get_class(
+    "mediations.trace_report.tests.factories", "TraceReportFactory"
+)
+
+
+def _get_published_events(change, capture_on_commit_callbacks):
+    """Return the events published by the change, once committed."""
+
+    def commit_change():
+        with capture_on_commit_callbacks(execute=True):
+            change()
+
+    async def collect():
+        subscription = get_broker().subscribe()
+        await subscription.__anext__()
+        await sync_to_async(commit_change)()
+        events = []
+        async for event in subscription:
+            if event is None:
+                break
+            events.append(event)
+        await subscription.aclose()
+        return events
+
+    return async_to_sync(collect)()
+
+
+class TestReceivers:
+    def test_changes_are_published_once_committed(
+        self, django_capture_on_commit_callbacks
+    ):
+        created = []
+
+        def change():
+            created.append(TraceReportFactory())
+
+        events = _get_published_events(change, django_capture_on_commit_callbacks)
+        trace_report = created[0]
+        assert {
+            "model": "mediationrequest",
+            "action": "created",
+            "ids": [str(trace_report.mediation_request.uuid)],
+        } in events
+        assert events[-1] == {
+            "model": "tracereport",
+            "action": "created",
+            "ids": [str(trace_report.uuid)],
+        }
+
+    def test_deletions_are_published(self, django_capture_on_commit_callbacks):
+        mediation_request = MediationRequestFactory()
+        events = _get_published_events(
+            mediation_request.delete, django_capture_on_commit_callbacks
+        )
+        assert events == [
+            {
+                "model": "mediationrequest",
+                "action": "deleted",
+                "ids": [str(mediation_request.uuid)],
+            }
+        ]
@@ -1,23 +1,44 @@
 import uuid
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 
 import connect_access.apps.mediations.choices as choices
 import connect_access.models.fields as local_fields
+from connect_access.core.loading import get_class, get_classes
 
 User = get_user_model()
+(
+    MediationRequestManager,
+    CLOSED_STATUSES,
+    PERSONAL_INFORMATION_FIELDS,
+    PERSONAL_INFORMATION_TO_REMOVE,
+) = get_classes(
+    "mediations.managers",
+    [
+        "MediationRequestManager",
+        "CLOSED_STATUSES",
+        "PERSONAL_INFORMATION_FIELDS",
+        "PERSONAL_INFORMATION_TO_REMOVE",
+    ],
+)
+ContentAddressedStorage = get_class("uploads.storages", "ContentAddressedStorage")
 
 
 def user_directory_path(instance, filename):
+    # Not used anymore, the files being named after their content (see
+    # ContentAddressedStorage), kept for the migrations.
     if instance.complainant:
-        # file will be uploaded to MEDIA_ROOT/further_info/user_<id>/<filename>
+        # file was uploaded to MEDIA_ROOT/further_info/user_<id>/<filename>
         return f"further_info/user_{instance.complainant.uuid}/{filename}"
     else:
-        # file will be uploaded to MEDIA_ROOT/further_info/anonymous/<filename>
+        # file was uploaded to MEDIA_ROOT/further_info/anonymous/<filename>
         return f"further_info/anonymous/{filename}"
 
 
@@ -34,6 +55,51 @@ class AbstractMediationRequest(TimeStampedModel):
         app_label = "mediations"
         verbose_name = _("Mediation request")
         verbose_name_plural = _("Mediation requests")
+        indexes = [
+            # Serves the API ordering and its keyset pagination.
+            models.Index(
+                fields=["-request_date", "-id"], name="mediation_request_date_idx"
+            ),
+            # Serve the API filters, keeping the default ordering.
+            models.Index(
+                fields=["status", "-request_date", "-id"],
+                name="mediation_status_date_idx",
+            ),
+            models.Index(
+                fields=["urgency", "-request_date", "-id"],
+                name="mediation_urgency_date_idx",
+            ),
+            models.Index(
+                fields=["issue_type", "-request_date", "-id"],
+                name="mediation_issue_type_date_idx",
+            ),
+            models.Index(
+                fields=["inaccessibility_level", "-request_date", "-id"],
+                name="mediation_inaccess_date_idx",
+            ),
+            # Serves the requests of a complainant, in the default ordering.
+            models.Index(
+                fields=["complainant", "-request_date", "-id"],
+                name="mediation_complainant_date_idx",
+            ),
+            models.Index(fields=["-modified", "-id"], name="mediation_modified_idx"),
+            # Matches the UPPER() comparison of iexact lookups.
+            models.Index(Upper("organization_name"), name="mediation_org_name_idx"),
+            GinIndex(fields=["search_vector"], name="mediation_search_idx"),
+            # Serves the mediators digest, only the waiting requests being indexed.
+            models.Index(
+                fields=["id"],
+                name="mediation_awaiting_digest_idx",
+                condition=models.Q(awaiting_digest=True),
+            ),
+            # Serves remove_personal_information, only the requests having
+            # personal information to remove being indexed.
+            models.Index(
+                fields=["id"],
+                name="mediation_anonymization_idx",
+                condition=PERSONAL_INFORMATION_TO_REMOVE,
+            ),
+        ]
 
     uuid = models.UUIDField(
         verbose_name=_("Public identifier"),
@@ -50,6 +116,8 @@ class AbstractMediationRequest(TimeStampedModel):
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
+        # Indexed by mediation_complainant_date_idx.
+        db_index=False,
     )
     status = models.CharField(
         verbose_name=_("Status of the request"),
@@ -158,8 +226,12 @@ class AbstractMediationRequest(TimeStampedModel):
         blank=True,
     )
     further_info = models.TextField(verbose_name=_("Further information"), blank=True)
+    # Maintained by a database trigger, see connect_access.models.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Set when the mediators are to be notified by the next digest email.
+    awaiting_digest = models.BooleanField(default=False, editable=False)
     attached_file = models.FileField(
-        verbose_name=_("Attached file"), upload_to=user_directory_path, blank=True
+        verbose_name=_("Attached file"), storage=ContentAddressedStorage(), blank=True
     )
 
     # organization infos
@@ -188,22 +260,49 @@ class AbstractMediationRequest(TimeStampedModel):
         blank=True,
     )
 
+    objects = MediationRequestManager()
+
     def __str__(self) -> str:
         return str(self.uuid)
 
     def save(self, *args, **kwargs):
         already_existing = bool(self.pk)
-        no_account = bool(not self.complainant)
-        request_closed = (
-            self.status == choices.MediationRequestStatus.CLOTURED.value
-            or self.status == choices.MediationRequestStatus.MEDIATION_FAILED.value
-        )
+        no_account = self.complainant_id is None
+        request_closed = self.status in CLOSED_STATUSES
         if already_existing and no_account and request_closed:
             self._remove_personal_information()
         super().save(*args, **kwargs)
 
     def _remove_personal_information(self):
-        self.first_name = ""
-        self.last_name = ""
-        self.email = ""
-        self.phone_number = ""
+        for field in PERSONAL_INFORMATION_FIELDS:
+            setattr(self, field, "")
+
+
+class AbstractTombstone(models.Model):
+    """Trace of a deleted mediation request or trace report.
+
+    Lets the clients syncing the lists learn about the deletions (see
+    DeltaSyncViewMixin). Recorded on deletion, and purged after
+    API_SYNC_RETENTION days.
+
+    """
+
+    model_name = models.CharField(verbose_name=_("Model"), max_length=100)
+    uuid = models.UUIDField(verbose_name=_("Public identifier"))
+    deleted = models.DateTimeField(
+        verbose_name=_("Date of the deletion"), default=timezone.now
+    )
+
+    class Meta:
+        abstract = True
+        app_label = "mediations"
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
+        indexes = [
+            models.Index(
+                fields=["model_name", "deleted"], name="tombstone_model_deleted_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model_name} {self.uuid}"
@@ -6,16 +6,9 @@ from connect_access.core.loading import get_model
 MediationRequest = get_model("mediations", "MediationRequest")
 
 
-class MediationRequestAdmin(core_admin.ModelAdminMixin, admin.ModelAdmin):  # type: ignore
-    search_fields = (
-        "uuid",
-        "first_name",
-        "last_name",
-        "issue_description",
-        "step_description",
-        "further_info",
-        "organization_name",
-    )
+class MediationRequestAdmin(  # type: ignore
+    core_admin.FullTextSearchAdminMixin, core_admin.ModelAdminMixin, admin.ModelAdmin
+):
     list_display = (
         "request_date",
         "urgency",
@@ -1,63 +1,145 @@
+import json
 import logging
-from smtplib import SMTPException
+from typing import TYPE_CHECKING, Any, cast
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.mail import BadHeaderError
+from django.core import serializers
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
+from kombu.exceptions import OperationalError
 from rest_framework import authentication, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 
-from connect_access.core.loading import get_model
-from connect_access.core.tasks import send_multialternative_mail
+from connect_access.core.filters import FullTextSearchFilter
+from connect_access.core.loading import get_class, get_model
+from connect_access.core.pagination import KeysetPagination
+from connect_access.core.parsers import NDJSONParser
+from connect_access.core.tasks import (
+    send_multialternative_mail_on_commit,
+    send_multialternative_mails_on_commit,
+)
+from connect_access.core.views import (
+    AsyncViewMixin,
+    CompiledListViewMixin,
+    ConditionalGetViewMixin,
+    DeltaSyncViewMixin,
+    SparseFieldsetViewMixin,
+)
 
 from .choices import MediationRequestStatus, UrgencyLevel
+from .exports import EXPORT_CONTENT_TYPES, EXPORT_FORMATS, MediationRequestExporter
+from .filters import MediationRequestFilterBackend
 from .permissions import IsAdmin, IsAnon, IsOwner
-from .serializers import MediationRequestSerializer
+from .serializers import (
+    MediationRequestSerializer,
+    MediationRequestTransitionSerializer,
+)
+from .tasks import send_mediators_digest
+
+if TYPE_CHECKING:
+    from .managers import MediationRequestQuerySet
 
 MediationRequest = get_model("mediations", "MediationRequest")
+Tombstone = get_model("mediations", "Tombstone")
 TraceReport = get_model("mediations", "TraceReport")
+publish_on_commit = get_class("events.publishers", "publish_on_commit")
+make_attach_token = get_class("uploads.tokens", "make_attach_token")
 
 logger = logging.getLogger(__name__)
 
+# Statuses a mediation request can be created with through the API.
+CREATION_STATUSES = (
+    MediationRequestStatus.PENDING.value,
+    MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.value,
+)
+
 
-class MediationRequestViewSet(viewsets.ModelViewSet):
+class MediationRequestViewSet(
+    AsyncViewMixin,
+    DeltaSyncViewMixin,
+    ConditionalGetViewMixin,
+    CompiledListViewMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """Complete viewset to manage mediation requests.
 
     Admins can do everything, whereas everybody can create a request, and
     owners of a request can update it.
 
+    Lists are ordered from the most recent request to the oldest unless an
+    ``ordering`` query parameter is given, can be filtered (see
+    MediationRequestFilterBackend), searched by relevance with the ``q`` query
+    parameter (see FullTextSearchFilter), and can be paginated with a cursor
+    (see KeysetPagination). Reads can be restricted to some fields (see
+    SparseFieldsetViewMixin). Lists are serialized in bulk (see
+    CompiledListViewMixin), and reads support conditional requests (see
+    ConditionalGetViewMixin). The list can return only the changes since a
+    date (see DeltaSyncViewMixin). The creation is asynchronous (see
+    AsyncViewMixin). Admins can also create requests, and change their
+    status, in bulk, and export them.
+
     """
 
-    queryset = MediationRequest.objects.order_by("-request_date")
+    queryset = MediationRequest.objects.order_by("-request_date", "-id")
     permission_classes = [IsAdmin | IsAnon | IsOwner]
     authentication_classes = [authentication.TokenAuthentication]
     serializer_class = MediationRequestSerializer
     lookup_field = "uuid"
+    pagination_class = KeysetPagination
+    filter_backends = [
+        MediationRequestFilterBackend,
+        FullTextSearchFilter,
+        OrderingFilter,
+    ]
+    ordering_fields = [
+        "request_date",
+        "modified",
+        "status",
+        "urgency",
+        "issue_type",
+        "inaccessibility_level",
+        "organization_name",
+    ]
 
-    def create(self, request):
+    async def create(self, request):
         """Create mediation request, and sends emails on success.
 
         Emails are sent to the complainant, and to an email defined in
-        MEDIATION_REQUEST_EMAIL setting.
+        MEDIATION_REQUEST_EMAIL setting. They are sent by Celery tasks, queued
+        once the request is committed. With MEDIATION_REQUEST_DIGEST, the
+        mediators are rather notified by the next digest email, unless the
+        urgency is listed in MEDIATION_REQUEST_IMMEDIATE_URGENCIES.
+
+        The response gives the identifier of the request, and, for a request
+        without complainant, the ``upload_token`` its file can be attached with
+        (see UploadViewSet.attach).
+
+        The handler is asynchronous (see AsyncViewMixin): the body is parsed,
+        and the database accessed, in a thread, so that an ASGI server keeps
+        serving other requests meanwhile.
 
         Note: only "pending", and "waiting for mediator validation" statuses are
         accepted for the creation through this endpoint.
 
         """
-        serializer = self.get_serializer(data=request.data)
+        data = await sync_to_async(getattr)(request, "data")
+        serializer = self.get_serializer(data=data)
         log_message = ""
         if logger.isEnabledFor(logging.INFO):
-            filled_fields = {k: v for k, v in request.data.items() if v}
+            filled_fields = {k: v for k, v in data.items() if v}
             log_message = f"Received mediation request with content: {filled_fields}\n"
-        if not serializer.is_valid():
+        if not await sync_to_async(serializer.is_valid)():
             logger.info(f"{log_message}The request was rejected by the serializer.")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        if serializer.validated_data["status"] not in (
-            MediationRequestStatus.PENDING.value,
-            MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.value,
-        ):
+        if serializer.validated_data["status"] not in CREATION_STATUSES:
             logger.info(
                 f"{log_message}The request status {(serializer.validated_data['status'])} was incorrect."
             )
@@ -72,50 +154,244 @@ class MediationRequestViewSet(viewsets.ModelViewSet):
             )
 
         mediation_request = MediationRequest(**serializer.validated_data)
-        mediation_request.save()
+        await sync_to_async(self._save_and_notify)(mediation_request)
         logger.info(f"{log_message}The request was correctly saved.")
-        try:
-            send_multialternative_mail(
-                {"id": str(mediation_request.uuid)[:8]},
-                _("Mediation request successfully submited"),
-                [mediation_request.email],
-                "mediations/emails/user_request_creation",
+        data = {"message": _("mediation request created"), "id": mediation_request.uuid}
+        if mediation_request.complainant_id is None:
+            data["upload_token"] = make_attach_token(mediation_request)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @transaction.atomic
+    def _save_and_notify(self, mediation_request):
+        mediators_email = getattr(settings, "MEDIATION_REQUEST_EMAIL", "")
+        if mediators_email and self._notify_in_digest(mediation_request):
+            mediation_request.awaiting_digest = True
+        mediation_request.save()
+        send_multialternative_mail_on_commit(
+            {"id": str(mediation_request.uuid)[:8]},
+            _("Mediation request successfully submited"),
+            [mediation_request.email],
+            "mediations/emails/user_request_creation",
+        )
+        if mediators_email and not mediation_request.awaiting_digest:
+            urgency = None
+            if mediation_request.urgency:
+                urgency = str(UrgencyLevel(mediation_request.urgency).label)
+            context = {
+                "mediation_request": self._get_email_fields(mediation_request),
+                "mediation_request_id": str(mediation_request.uuid)[:8],
+                "mediation_request_urgency": urgency,
+            }
+            send_multialternative_mail_on_commit(
+                context,
+                _("A new mediation request has been submitted"),
+                [mediators_email],
+                "mediations/emails/mediator_request_creation",
+            )
+
+    @action(
+        detail=False,
+        methods=["POST"],
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """Create mediation requests in bulk, for admins importing them.
+
+        The body is either a JSON array of mediation requests, or NDJSON with
+        one request per line. Each request is validated like with create, and
+        the valid ones are inserted in batches of
+        MEDIATION_REQUEST_BULK_BATCH_SIZE. The response gives, in the order
+        of the body, the identifier of each created request, or the errors of
+        the rejected ones.
+
+        The complainants are sent their emails by batches, and the mediators
+        one digest email for the whole import.
+
+        """
+        if not isinstance(request.data, list):
+            return Response(
+                {"message": _("a list of mediation requests is expected")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_size = getattr(settings, "MEDIATION_REQUEST_BULK_MAX_SIZE", 10000)
+        if len(request.data) > max_size:
+            return Response(
+                {
+                    "message": _(
+                        "at most %(max_size)d mediation requests can be created at once"
+                    )
+                    % {"max_size": max_size}
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            mediators_email = getattr(settings, "MEDIATION_REQUEST_EMAIL", "")
-            if mediators_email:
-                urgency = None
-                if mediation_request.urgency:
-                    urgency = UrgencyLevel(mediation_request.urgency).label
-                context = {
-                    "mediation_request": mediation_request,
-                    "mediation_request_id": str(mediation_request.uuid)[:8],
-                    "mediation_request_urgency": urgency,
+
+        results, mediation_requests = self._validate_bulk(request.data)
+        mediators_email = getattr(settings, "MEDIATION_REQUEST_EMAIL", "")
+        for mediation_request in mediation_requests:
+            mediation_request.awaiting_digest = bool(mediators_email)
+        MediationRequest.objects.bulk_create(
+            mediation_requests,
+            batch_size=getattr(settings, "MEDIATION_REQUEST_BULK_BATCH_SIZE", 500),
+        )
+        logger.info(f"{len(mediation_requests)} requests were created in bulk.")
+        publish_on_commit(
+            MediationRequest._meta.model_name,
+            "created",
+            [mediation_request.uuid for mediation_request in mediation_requests],
+        )
+        send_multialternative_mails_on_commit(
+            [
+                {
+                    "context": {"id": str(mediation_request.uuid)[:8]},
+                    "subject": _("Mediation request successfully submited"),
+                    "to": [mediation_request.email],
+                    "content_filename": "mediations/emails/user_request_creation",
+                }
+                for mediation_request in mediation_requests
+            ]
+        )
+        if mediators_email and mediation_requests:
+            transaction.on_commit(self._enqueue_mediators_digest)
+        return Response(
+            {
+                "created": len(mediation_requests),
+                "failed": len(results) - len(mediation_requests),
+                "results": results,
+            },
+            status=status.HTTP_201_CREATED
+            if len(results) == len(mediation_requests)
+            else status.HTTP_207_MULTI_STATUS,
+        )
+
+    @action(detail=False, methods=["POST"])
+    def transition(self, request):
+        """Move mediation requests to a new status in a single UPDATE.
+
+        The body gives the name of the status, and the ids of the requests.
+        Without ids, the requests are selected by the filters of the list
+        (see MediationRequestFilterBackend and FullTextSearchFilter), at least
+        one of them being required with a non-blank value: other query
+        parameters, like the pagination or the ordering, select nothing. The
+        personal information of the closed anonymous requests is removed (see
+        MediationRequestQuerySet.transition).
+
+        """
+        serializer = MediationRequestTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if "ids" in serializer.validated_data:
+            mediation_requests = self.get_queryset().filter(
+                uuid__in=serializer.validated_data["ids"]
+            )
+        elif self._is_filtered(request):
+            mediation_requests = self.filter_queryset(self.get_queryset())
+        else:
+            return Response(
+                {"message": _("either ids or filters are required")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        updated = cast("MediationRequestQuerySet", mediation_requests).transition(
+            serializer.validated_data["status"]
+        )
+        logger.info(f"{updated} requests were moved to a new status in bulk.")
+        publish_on_commit(MediationRequest._meta.model_name, "updated")
+        return Response({"updated": updated})
+
+    @action(detail=False, methods=["GET"])
+    def export(self, request):
+        """Stream the mediation requests with their trace reports.
+
+        The export_format query parameter is either csv (the default) or
+        ndjson (see MediationRequestExporter). The requests are filtered,
+        searched, sorted and restricted to some fields like the list.
+
+        Raises:
+            ValidationError: the export format is unknown.
+
+        """
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {
+                    "export_format": [
+                        _("Unknown value %(value)s.") % {"value": export_format}
+                    ]
                 }
-                send_multialternative_mail(
-                    context,
-                    _("A new mediation request has been submitted"),
-                    [mediators_email],
-                    "mediations/emails/mediator_request_creation",
-                )
-        except BadHeaderError as error:
-            logger.error(
-                f"The header of the email for mediation request {mediation_request.id} "
-                f"creation was incorrectly formed. The email couldn't be sent. Actual error: {error}"
             )
-        except SMTPException as error:
+        exporter = MediationRequestExporter(
+            self.filter_queryset(self.get_queryset()),
+            fields=self.get_sparse_fieldset(),
+            context=self.get_serializer_context(),
+        )
+        response = StreamingHttpResponse(
+            exporter.iter_export(export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="mediation-requests.{export_format}"'
+        return response
+
+    def _validate_bulk(self, items):
+        results = []
+        mediation_requests = []
+        for item in items:
+            serializer = self.get_serializer(data=item)
+            if not serializer.is_valid():
+                results.append({"errors": serializer.errors})
+            elif serializer.validated_data["status"] not in CREATION_STATUSES:
+                results.append(
+                    {"errors": {"status": [_("unauthorized mediation request status")]}}
+                )
+            else:
+                mediation_request = MediationRequest(**serializer.validated_data)
+                mediation_requests.append(mediation_request)
+                results.append({"id": str(mediation_request.uuid)})
+        return results, mediation_requests
+
+    @staticmethod
+    def _enqueue_mediators_digest():
+        try:
+            send_mediators_digest.delay()
+        except OperationalError as error:
             logger.error(
-                f"The mediation request {mediation_request.id} failed for a reason "
-                f"linked to SMTP. The email couldn't be sent. Actual error: {error}"
+                f"The mediators digest couldn't be queued. Actual error: {error}"
             )
-        return Response(
-            {"message": _("mediation request created")},
-            status=status.HTTP_201_CREATED,
+
+    def _is_filtered(self, request):
+        # Backends telling whether they filter, OrderingFilter not filtering.
+        backends: list[Any] = [backend() for backend in self.filter_backends]
+        return any(
+            backend.is_filtering(request)
+            for backend in backends
+            if hasattr(backend, "is_filtering")
+        )
+
+    @staticmethod
+    def _get_email_fields(mediation_request):
+        # Every field of the model, fields added by forks included, in a form
+        # the email task can receive as JSON.
+        return json.loads(serializers.serialize("json", [mediation_request]))[0][
+            "fields"
+        ]
+
+    @staticmethod
+    def _notify_in_digest(mediation_request):
+        if not getattr(settings, "MEDIATION_REQUEST_DIGEST", False):
+            return False
+        immediate_urgencies = getattr(
+            settings, "MEDIATION_REQUEST_IMMEDIATE_URGENCIES", []
         )
+        return not (
+            mediation_request.urgency
+            and UrgencyLevel(mediation_request.urgency).name in immediate_urgencies
+        )
+
+    def get_tombstones(self):
+        return Tombstone.objects.filter(model_name=MediationRequest._meta.model_name)
 
     @action(detail=False, methods=["GET"])
     def user(self, request):
-        mediation_requests = MediationRequest.objects.filter(
-            complainant__uuid=request.user.uuid
+        mediation_requests = self.filter_queryset(
+            self.get_queryset().filter(complainant=request.user)
         )
-        serializer = self.get_serializer(mediation_requests, many=True)
-        return Response(serializer.data)
+        return self.get_list_response(mediation_requests)
@@ -6,6 +6,7 @@ class MediationsConfig(AppConfig):
     name = "connect_access.apps.mediations"
 
     def ready(self):
+        import connect_access.apps.mediations.receivers  # noqa
         import connect_access.models.receivers  # noqa
 
         super().ready()
@@ -0,0 +1,134 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils.encoders import JSONEncoder
+
+from connect_access.core.loading import get_class, get_model
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+MediationRequestSerializer = get_class(
+    "mediations.serializers", "MediationRequestSerializer"
+)
+TraceReportSerializer = get_class(
+    "mediations.trace_report.serializers", "TraceReportSerializer"
+)
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+# First characters making spreadsheets read a CSV cell as a formula.
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object handing back what the csv writer writes."""
+
+    def write(self, value):
+        return value
+
+
+class MediationRequestExporter:
+    """Stream mediation requests, with their trace reports, as CSV or NDJSON.
+
+    The mediation requests are read with .values() by chunks of chunk_size
+    rows, from a server-side cursor, and the trace reports of each chunk with
+    one more query. Both are serialized with the compiled plans of their
+    serializers (see CompiledSerializerMixin), so that the export has the
+    representation of the API, and the memory used only depends on the size of
+    the chunks.
+
+    In NDJSON, each line is a mediation request, its trace reports being listed
+    under trace_reports. In CSV, each row is a trace report, prefixed by the
+    columns of its mediation request, a mediation request without trace reports
+    having a single row. CSV cells that spreadsheets would read as formulas are
+    prefixed with a quote.
+
+    """
+
+    def __init__(self, queryset, fields=None, context=None, chunk_size=2000):
+        self.queryset = queryset
+        self.plan = MediationRequestSerializer.get_plan(fields)
+        self.trace_report_plan = TraceReportSerializer.get_plan()
+        if self.plan is None or self.trace_report_plan is None:
+            raise ImproperlyConfigured(
+                "The serializers of mediation requests and trace reports have to "
+                "be compiled to be exported."
+            )
+        self.context = context or {}
+        self.chunk_size = chunk_size
+
+    def iter_items(self):
+        rows = self.queryset.values(*self.plan.paths, "pk").iterator(
+            chunk_size=self.chunk_size
+        )
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            trace_reports = self._get_trace_reports([row["pk"] for row in chunk])
+            for row, item in zip(chunk, self.plan.serialize(chunk, self.context)):
+                item["trace_reports"] = trace_reports.get(row["pk"], [])
+                yield item
+
+    def _get_trace_reports(self, pks):
+        rows = list(
+            TraceReport.objects.filter(mediation_request__in=pks)
+            .order_by("contact_date", "id")
+            .values(*self.trace_report_plan.paths, "mediation_request")
+        )
+        trace_reports: dict = {}
+        for row, item in zip(
+            rows, self.trace_report_plan.serialize(rows, self.context)
+        ):
+            trace_reports.setdefault(row["mediation_request"], []).append(item)
+        return trace_reports
+
+    def iter_ndjson(self):
+        encoder = JSONEncoder(ensure_ascii=False)
+        for item in self.iter_items():
+            yield encoder.encode(item) + "\n"
+
+    def iter_csv(self):
+        writer = csv.writer(_Echo())
+        names = [name for name, _path, _convert, _null in self.plan.plan]
+        trace_report_names = [
+            name
+            for name, _path, _convert, _null in self.trace_report_plan.plan
+            if name != "mediation_request"
+        ]
+        yield writer.writerow(
+            names + [f"trace_report_{name}" for name in trace_report_names]
+        )
+        for item in self.iter_items():
+            values = [self._to_csv(item[name]) for name in names]
+            for trace_report in item["trace_reports"] or [{}]:
+                yield writer.writerow(
+                    values
+                    + [
+                        self._to_csv(trace_report.get(name))
+                        for name in trace_report_names
+                    ]
+                )
+
+    def iter_export(self, export_format):
+        if export_format == "csv":
+            return self.iter_csv()
+        return self.iter_ndjson()
+
+    @staticmethod
+    def _to_csv(value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, tuple)):
+            value = ",".join(str(element) for element in value)
+        elif isinstance(value, (dict, bool)):
+            return json.dumps(value)
+        value = str(value)
+        if value.startswith(CSV_FORMULA_PREFIXES):
+            return f"'{value}"
+        return value
@@ -0,0 +1,121 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .choices import (
+    InaccessibilityLevel,
+    IssueType,
+    MediationRequestStatus,
+    UrgencyLevel,
+)
+
+
+class MediationRequestFilterBackend(BaseFilterBackend):
+    """Filter mediation requests in SQL from the query parameters.
+
+    Enum parameters take the names used by the API representation, several of
+    them being accepted either comma separated or repeated, for example
+    ``?status=FILED,MEDIATING&urgency=VERY_URGENT``. Date ranges are given with
+    the ``_after`` and ``_before`` suffixes, both bounds being inclusive. The
+    organization name is matched exactly, but case-insensitively.
+
+    """
+
+    enum_filters = {
+        "status": MediationRequestStatus,
+        "urgency": UrgencyLevel,
+        "issue_type": IssueType,
+        "inaccessibility_level": InaccessibilityLevel,
+    }
+    date_filters = ("request_date", "modified")
+
+    def filter_queryset(self, request, queryset, view):
+        filters = self.get_filters(request)
+        for field, choice_model in self.enum_filters.items():
+            if field in filters:
+                queryset = queryset.filter(
+                    **{
+                        f"{field}__in": self._to_values(
+                            field, filters[field], choice_model
+                        )
+                    }
+                )
+        for field in self.date_filters:
+            for suffix, lookup in (("after", "gte"), ("before", "lte")):
+                param = f"{field}_{suffix}"
+                if param in filters:
+                    queryset = queryset.filter(
+                        **{
+                            f"{field}__{lookup}": self._to_datetime(
+                                param, filters[param]
+                            )
+                        }
+                    )
+        if "complainant" in filters:
+            queryset = queryset.filter(
+                complainant__uuid=self._to_uuid("complainant", filters["complainant"])
+            )
+        if "organization_name" in filters:
+            queryset = queryset.filter(
+                organization_name__iexact=filters["organization_name"]
+            )
+        return queryset
+
+    def is_filtering(self, request):
+        """Tell whether a filter of the backend is given a non-blank value."""
+        return bool(self.get_filters(request))
+
+    def get_filters(self, request):
+        """Return the non-blank values of the filters, stripped, by parameter.
+
+        The values of the enum filters are lists of names.
+
+        """
+        params = request.query_params
+        filters = {}
+        for field in self.enum_filters:
+            names = [
+                value.strip()
+                for values in params.getlist(field)
+                for value in values.split(",")
+                if value.strip()
+            ]
+            if names:
+                filters[field] = names
+        for param in [
+            *(
+                f"{field}_{suffix}"
+                for field in self.date_filters
+                for suffix in ("after", "before")
+            ),
+            "complainant",
+            "organization_name",
+        ]:
+            value = params.get(param, "").strip()
+            if value:
+                filters[param] = value
+        return filters
+
+    @staticmethod
+    def _to_values(param, names, choice_model):
+        try:
+            return [choice_model[name].value for name in names]
+        except KeyError as error:
+            raise ValidationError(
+                {param: [_("Unknown value %(value)s.") % {"value": error.args[0]}]}
+            )
+
+    @staticmethod
+    def _to_datetime(param, value):
+        try:
+            return serializers.DateTimeField().to_internal_value(value)
+        except serializers.ValidationError as error:
+            raise ValidationError({param: error.detail})
+
+    @staticmethod
+    def _to_uuid(param, value):
+        try:
+            return serializers.UUIDField().to_internal_value(value)
+        except serializers.ValidationError as error:
+            raise ValidationError({param: error.detail})
@@ -0,0 +1,337 @@
+import datetime
+import multiprocessing
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.utils import timezone
+
+from connect_access.core.loading import get_model
+
+from .choices import (
+    AssistiveTechnology,
+    Browser,
+    InaccessibilityLevel,
+    IssueType,
+    MediationRequestStatus,
+    MobileAppPlatform,
+    UrgencyLevel,
+)
+from .trace_report.choices import ContactEntityType, TraceType
+
+User = get_user_model()
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+StoredFile = get_model("uploads", "StoredFile")
+
+# Weights of the values, an empty value being an unanswered question.
+OPEN_STATUSES = {
+    MediationRequestStatus.PENDING: 10,
+    MediationRequestStatus.WAITING_MEDIATOR_VALIDATION: 15,
+    MediationRequestStatus.FILED: 10,
+    MediationRequestStatus.WAITING_ADMIN: 5,
+    MediationRequestStatus.WAITING_CONTACT: 15,
+    MediationRequestStatus.WAITING_CONTACT_BIS: 5,
+    MediationRequestStatus.MEDIATING: 40,
+}
+CLOSED_STATUSES = {
+    MediationRequestStatus.CLOTURED: 80,
+    MediationRequestStatus.MEDIATION_FAILED: 20,
+}
+URGENCIES = {
+    UrgencyLevel.VERY_URGENT: 15,
+    UrgencyLevel.MODERATELY_URGENT: 35,
+    UrgencyLevel.NOT_URGENT: 40,
+    "": 10,
+}
+ISSUE_TYPES = {
+    IssueType.ACCESSIBILITY: 70,
+    IssueType.UNDERSTANDING: 10,
+    IssueType.USABILITY: 15,
+    "": 5,
+}
+INACCESSIBILITY_LEVELS = {
+    InaccessibilityLevel.IMPOSSIBLE_ACCESS: 35,
+    InaccessibilityLevel.ACCESS_DIFFICULT: 40,
+    InaccessibilityLevel.RANDOM_ACCESS: 20,
+    "": 5,
+}
+BROWSERS = {
+    Browser.FIREFOX: 25,
+    Browser.CHROME: 50,
+    Browser.MICROSOFT_EDGE: 10,
+    Browser.INTERNET_EXPLORER: 5,
+    Browser.OTHER: 5,
+    Browser.DONT_KNOW: 5,
+}
+MOBILE_APP_PLATFORMS = {
+    MobileAppPlatform.IOS: 40,
+    MobileAppPlatform.ANDROID: 50,
+    MobileAppPlatform.WINDOWS_PHONE: 2,
+    MobileAppPlatform.OTHER: 8,
+}
+ASSISTIVE_TECHNOLOGIES = {
+    AssistiveTechnology.SCREEN_READER_VOCAL_SYNTHESIS: 40,
+    AssistiveTechnology.KEYBOARD: 25,
+    AssistiveTechnology.ZOOM_SOFTWARE: 15,
+    AssistiveTechnology.BRAILLE_DISPLAY: 8,
+    AssistiveTechnology.VOCAL_COMMAND_SOFTWARE: 5,
+    AssistiveTechnology.DYS_DISORDER_SOFTWARE: 4,
+    AssistiveTechnology.VIRTUAL_KEYBOARD: 3,
+    AssistiveTechnology.ADAPTED_NAVIGATION_DISPOSITIVE: 2,
+    AssistiveTechnology.EXCLUSIVE_KEYBOARD_NAVIGATION: 5,
+    AssistiveTechnology.OTHER: 3,
+}
+TRACE_TYPES = {
+    TraceType.CALL: 30,
+    TraceType.MAIL: 50,
+    TraceType.LETTER: 10,
+    TraceType.OTHER: 10,
+}
+CONTACT_ENTITY_TYPES = {
+    ContactEntityType.COMPLAINANT: 30,
+    ContactEntityType.MEDIATOR: 40,
+    ContactEntityType.ORGANIZATION: 20,
+    ContactEntityType.EXTERNAL_ORGANIZATION: 5,
+    ContactEntityType.OTHER: 5,
+}
+
+FIRST_NAMES = ("Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Inès", "Jules")
+LAST_NAMES = ("Martin", "Bernard", "Dubois", "Leroy", "Moreau", "Girard", "Nguyen")
+ORGANIZATION_KINDS = ("Bank", "Insurance", "Town hall", "Airline", "Shop", "School")
+TECHNOLOGIES = ("Website", "Mobile application", "Kiosk", "PDF document", "Form")
+ISSUES = (
+    "The buttons of the form have no label.",
+    "The captcha can't be solved with a screen reader.",
+    "The text contrast is too low to be read.",
+    "The menu can't be opened with the keyboard.",
+    "The videos have no captions.",
+    "The session expires before the form can be filled.",
+)
+# Distinct attached files, shared by the requests as uploaded files would be.
+ATTACHMENTS = 50
+
+
+class MediationDataGenerator:
+    """Generate realistic mediation requests, trace reports and users in bulk.
+
+    The values of every choice follow the weights above, and the request dates
+    are spread over the given number of days, the older requests being more
+    often closed. Requests are created by chunks of chunk_size with
+    bulk_create, each chunk in its own transaction and with its own random
+    generator, so that the data only depends on the seed, whatever the number
+    of processes sharing the chunks. The processes have their own database
+    connections, and can't see the rows of an uncommitted transaction.
+
+    A share of the requests, anonymous, have no complainant, and a share
+    have one of ATTACHMENTS attached files, their references being counted
+    in bulk (see StoredFileQuerySet.acquire_many).
+
+    """
+
+    def __init__(
+        self,
+        users=1000,
+        anonymous=0.3,
+        trace_reports=2.0,
+        attachments=0.0,
+        days=730,
+        chunk_size=5000,
+        seed=0,
+    ):
+        self.users = users
+        self.anonymous = anonymous
+        self.trace_reports = trace_reports
+        self.attachments = attachments
+        self.days = days
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.now = timezone.now()
+        self.user_ids = []
+        self.attachment_names = []
+
+    def generate(self, count, processes=1):
+        """Generate count mediation requests, with their trace reports and users.
+
+        Returns:
+            The numbers of created users, mediation requests and trace reports.
+
+        """
+        self.user_ids = self._create_users()
+        if self.attachments:
+            self.attachment_names = self._store_attachments()
+        starts = range(0, count, self.chunk_size)
+        sizes = [min(self.chunk_size, count - start) for start in starts]
+        if processes > 1:
+            # Each process opens its own connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                created = list(executor.map(self.generate_chunk, starts, sizes))
+        else:
+            created = list(map(self.generate_chunk, starts, sizes))
+        return {
+            "users": len(self.user_ids),
+            "mediation_requests": count,
+            "trace_reports": sum(created),
+        }
+
+    def generate_chunk(self, start, size):
+        """Create the size mediation requests following the start first ones.
+
+        Returns:
+            The number of created trace reports.
+
+        """
+        generator = random.Random(f"{self.seed}:{start}")
+        with transaction.atomic():
+            mediation_requests = MediationRequest.objects.bulk_create(
+                [
+                    self._make_mediation_request(generator, start + index)
+                    for index in range(size)
+                ],
+                batch_size=1000,
+            )
+            trace_reports = TraceReport.objects.bulk_create(
+                [
+                    trace_report
+                    for mediation_request in mediation_requests
+                    for trace_report in self._make_trace_reports(
+                        generator, mediation_request
+                    )
+                ],
+                batch_size=1000,
+            )
+            StoredFile.objects.acquire_many(
+                row.attached_file.name
+                for row in (*mediation_requests, *trace_reports)
+                if row.attached_file
+            )
+        return len(trace_reports)
+
+    def _create_users(self):
+        generator = random.Random(f"{self.seed}:users")
+        # Unique for each run, so that generating again adds users.
+        run = uuid.uuid4().hex[:8]
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"synthetic-{run}-{index}@example.com",
+                    first_name=generator.choice(FIRST_NAMES),
+                    last_name=generator.choice(LAST_NAMES),
+                    password=password,
+                )
+                for index in range(self.users)
+            ],
+            batch_size=1000,
+        )
+        return [user.pk for user in users]
+
+    @staticmethod
+    def _store_attachments():
+        storage = MediationRequest._meta.get_field("attached_file").storage
+        return [
+            storage.save(
+                f"attachment-{index}.txt",
+                ContentFile(f"Synthetic attachment {index}".encode()),
+            )
+            for index in range(ATTACHMENTS)
+        ]
+
+    def _make_mediation_request(self, generator, index):
+        request_date = self.now - datetime.timedelta(
+            seconds=generator.uniform(0, self.days * 24 * 60 * 60)
+        )
+        age = (self.now - request_date).days
+        closed = generator.random() < min(0.95, age / 365)
+        status = _choose(generator, CLOSED_STATUSES if closed else OPEN_STATUSES)
+        complainant_id = None
+        if self.user_ids and generator.random() >= self.anonymous:
+            complainant_id = generator.choice(self.user_ids)
+        first_name = generator.choice(FIRST_NAMES)
+        last_name = generator.choice(LAST_NAMES)
+        browser_used = generator.random() < 0.6
+        mobile_app_used = not browser_used and generator.random() < 0.6
+        organization = generator.randrange(500)
+        mediation_request = MediationRequest(
+            request_date=request_date,
+            modified=min(
+                self.now,
+                request_date + datetime.timedelta(days=generator.randint(0, 60)),
+            ),
+            complainant_id=complainant_id,
+            status=status,
+            first_name=first_name,
+            last_name=last_name,
+            email=f"{first_name}.{last_name}.{index}@example.com".lower(),
+            phone_number=f"+336{generator.randrange(10**8):08d}",
+            assistive_technology_used=_sample(generator, ASSISTIVE_TECHNOLOGIES),
+            technology_name=generator.choice(TECHNOLOGIES),
+            urgency=_choose(generator, URGENCIES),
+            issue_description=generator.choice(ISSUES),
+            issue_type=_choose(generator, ISSUE_TYPES),
+            inaccessibility_level=_choose(generator, INACCESSIBILITY_LEVELS),
+            browser_used=browser_used,
+            browser=_choose(generator, BROWSERS) if browser_used else "",
+            mobile_app_used=mobile_app_used,
+            mobile_app_platform=_choose(generator, MOBILE_APP_PLATFORMS)
+            if mobile_app_used
+            else "",
+            did_tell_organization=generator.random() < 0.5,
+            organization_name=(
+                f"{ORGANIZATION_KINDS[organization % len(ORGANIZATION_KINDS)]} "
+                f"{organization}"
+            ),
+            attached_file=self._choose_attachment(generator),
+        )
+        if complainant_id is None and status in CLOSED_STATUSES:
+            # Like AbstractMediationRequest.save().
+            mediation_request._remove_personal_information()
+        return mediation_request
+
+    def _make_trace_reports(self, generator, mediation_request):
+        count = (
+            round(generator.expovariate(1 / self.trace_reports))
+            if self.trace_reports
+            else 0
+        )
+        for _index in range(count):
+            contact_date = min(
+                self.now,
+                mediation_request.request_date
+                + datetime.timedelta(hours=generator.uniform(1, 90 * 24)),
+            )
+            yield TraceReport(
+                mediation_request=mediation_request,
+                contact_date=contact_date,
+                modified=contact_date,
+                trace_type=_choose(generator, TRACE_TYPES),
+                sender_type=_choose(generator, CONTACT_ENTITY_TYPES),
+                recipient_type=_choose(generator, CONTACT_ENTITY_TYPES),
+                comment=generator.choice(ISSUES),
+                attached_file=self._choose_attachment(generator),
+            )
+
+    def _choose_attachment(self, generator):
+        if self.attachment_names and generator.random() < self.attachments:
+            return generator.choice(self.attachment_names)
+        return ""
+
+
+def _choose(generator, weights):
+    return generator.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _sample(generator, weights):
+    values = set(
+        generator.choices(
+            list(weights), weights=list(weights.values()), k=generator.randint(0, 3)
+        )
+    )
+    return [value for value in weights if value in values]
@@ -0,0 +1,32 @@
+import time
+
+from connect_access.core.loading import get_class
+from connect_access.core.management.commands import BaseCommand
+
+remove_personal_information = get_class(
+    "mediations.tasks", "remove_personal_information"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Removes the personal information left in the closed requests of "
+        "complainants without an account, by batches, and reports the number of "
+        "anonymized requests and the throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Number of mediation requests anonymized per transaction",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        anonymized = remove_personal_information(options["batch_size"])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{anonymized} mediation requests anonymized in {elapsed:.2f} s "
+            f"({anonymized / elapsed:.0f} requests/s)"
+        )
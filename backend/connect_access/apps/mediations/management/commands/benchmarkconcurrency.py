@@ -0,0 +1,133 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from connect_access.core.management.commands import BaseCommand
+
+SUBMISSION = {
+    "status": "PENDING",
+    "first_name": "Benchmark",
+    "email": "benchmark@example.com",
+    "issue_description": "Created by the benchmarkconcurrency command.",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how a running server holds slow public submissions: clients "
+        "send mediation requests with their body trickled over --upload-time "
+        "seconds, while the configuration is read at the same time. Run it "
+        "against the WSGI (gunicorn config.wsgi) and the ASGI (gunicorn "
+        "config.asgi -k uvicorn.workers.UvicornWorker, as in production) "
+        "deployments, with the same number of workers, to compare them: the "
+        "submissions and the configuration reads are asynchronous views. The "
+        "mediation requests are created in the database of the server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url", help="Root URL of the server, like http://localhost:5000"
+        )
+        parser.add_argument(
+            "--clients", type=int, default=50, help="Number of slow submissions"
+        )
+        parser.add_argument(
+            "--upload-time",
+            type=float,
+            default=5.0,
+            help="Seconds taken by each submission to send its body",
+        )
+        parser.add_argument(
+            "--probes",
+            type=int,
+            default=20,
+            help="Number of configuration reads during the submissions",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            url = urlsplit(options["url"])
+            if url.scheme not in ("http", "https") or not url.hostname:
+                raise Exception(f"{options['url']} is not an HTTP URL.")
+            results = asyncio.run(self._run(url, options))
+        except Exception as e:
+            raise CommandError('Exception "%s"' % e)
+        self.stdout.write(self._format(results, options))
+
+    async def _run(self, url, options):
+        submit_path = reverse("api:mediation_requests-list")
+        probe_path = reverse("api:configuration-about-service")
+        body = json.dumps(SUBMISSION).encode()
+        start = time.perf_counter()
+        pending_submissions = asyncio.gather(
+            *(
+                self._request(url, "POST", submit_path, body, options["upload_time"])
+                for _client in range(options["clients"])
+            )
+        )
+        probes = []
+        interval = options["upload_time"] / max(options["probes"], 1)
+        for _probe in range(options["probes"]):
+            await asyncio.sleep(interval)
+            probes.append(await self._request(url, "GET", probe_path))
+        submissions = await pending_submissions
+        return {
+            "elapsed": time.perf_counter() - start,
+            "submissions": submissions,
+            "probes": probes,
+        }
+
+    @staticmethod
+    async def _request(url, method, path, body=b"", upload_time=0):
+        """Send a request, trickling its body, and return its status and duration."""
+        start = time.perf_counter()
+        reader, writer = await asyncio.open_connection(
+            url.hostname,
+            url.port or (443 if url.scheme == "https" else 80),
+            ssl=url.scheme == "https",
+        )
+        writer.write(
+            (
+                f"{method} {url.path.rstrip('/')}{path} HTTP/1.1\r\n"
+                f"Host: {url.netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        # Ten pieces, so that the server waits for the body all along.
+        size = max(len(body) // 10, 1)
+        for offset in range(0, len(body), size):
+            await asyncio.sleep(upload_time / 10)
+            writer.write(body[offset : offset + size])  # noqa: E203
+            await writer.drain()
+        response = await reader.read()
+        writer.close()
+        status_line = response.split(b"\r\n", 1)[0].split()
+        status = int(status_line[1]) if len(status_line) > 1 else 0
+        return status, time.perf_counter() - start
+
+    @staticmethod
+    def _format(results, options):
+        created = sum(status == 201 for status, _duration in results["submissions"])
+        durations = [duration * 1000 for status, duration in results["probes"]]
+        failed_probes = sum(status != 200 for status, _duration in results["probes"])
+        lines = [
+            f"{options['clients']} submissions trickled over "
+            f"{options['upload_time']:.1f} s: {created} created, "
+            f"{options['clients'] - created} failed, "
+            f"all done in {results['elapsed']:.1f} s"
+        ]
+        if durations:
+            lines.append(
+                f"{len(durations)} configuration reads meanwhile: "
+                f"median {statistics.median(durations):.1f} ms, "
+                f"max {max(durations):.1f} ms, {failed_probes} failed"
+            )
+        return "\n".join(lines)
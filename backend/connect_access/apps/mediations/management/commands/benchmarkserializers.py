@@ -0,0 +1,74 @@
+import timeit
+
+from django.core.management.base import CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from connect_access.core.loading import get_class, get_model
+from connect_access.core.management.commands import BaseCommand
+
+MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestSerializer = get_class(
+    "mediations.serializers", "MediationRequestSerializer"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the serialization of the mediation requests list with the "
+        "serializer and with its compiled plan, on the rows of the database."
+    )
+
+    @staticmethod
+    def _check_requirements():
+        if not MediationRequest.objects.exists():
+            raise Exception(
+                "The database should contain mediation requests to apply "
+                "benchmarkserializers command."
+            )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=1000, help="Number of serialized rows"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of timed runs, best is kept"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self._check_requirements()
+            queryset = MediationRequest.objects.order_by("-request_date", "-id")[
+                : options["limit"]
+            ]
+            context = {"request": APIRequestFactory().get("/api/mediation-requests/")}
+            plan = MediationRequestSerializer.get_plan()
+
+            def serialize():
+                return MediationRequestSerializer(
+                    queryset.select_related("complainant"), many=True, context=context
+                ).data
+
+            def serialize_compiled():
+                return plan.serialize(queryset.values(*plan.paths), context)
+
+            renderer = JSONRenderer()
+            if renderer.render(serialize()) != renderer.render(serialize_compiled()):
+                raise Exception(
+                    "The compiled serialization differs from the serializer."
+                )
+            count = len(serialize_compiled())
+            serializer_time = min(
+                timeit.repeat(serialize, number=1, repeat=options["repeat"])
+            )
+            compiled_time = min(
+                timeit.repeat(serialize_compiled, number=1, repeat=options["repeat"])
+            )
+        except Exception as e:
+            raise CommandError('Exception "%s"' % e)
+        self.stdout.write(
+            f"{count} mediation requests\n"
+            f"serializer: {serializer_time * 1000:.1f} ms\n"
+            f"compiled: {compiled_time * 1000:.1f} ms "
+            f"({serializer_time / compiled_time:.1f}x faster)"
+        )
@@ -1,10 +1,11 @@
 from django.core.management.base import CommandError
-from django.db.models import ProtectedError
+from django.db import DatabaseError
 
-from connect_access.core.loading import get_model
+from connect_access.core.loading import get_class, get_model
 from connect_access.core.management.commands import BaseCommand
 
 MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestPurger = get_class("mediations.retention", "MediationRequestPurger")
 
 
 class Command(BaseCommand):
@@ -13,7 +14,14 @@ class Command(BaseCommand):
     )
 
     def handle(self, *args, **options):
+        purger = MediationRequestPurger()
         try:
-            MediationRequest.objects.all().delete()
-        except ProtectedError as e:
+            deleted = purger.purge(MediationRequest.objects.all())
+        except DatabaseError as e:
             raise CommandError('Exception "%s"' % e)
+        self.stdout.write(f"{deleted} deleted")
+        if purger.skipped:
+            self.stdout.write(
+                f"{purger.skipped} skipped, locked by another transaction: "
+                "run the command again to delete them"
+            )
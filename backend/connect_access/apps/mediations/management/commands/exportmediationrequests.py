@@ -0,0 +1,44 @@
+from django.core.management.base import CommandError
+
+from connect_access.core.loading import get_classes, get_model
+from connect_access.core.management.commands import BaseCommand
+
+MediationRequest = get_model("mediations", "MediationRequest")
+EXPORT_FORMATS, MediationRequestExporter = get_classes(
+    "mediations.exports", ["EXPORT_FORMATS", "MediationRequestExporter"]
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports the mediation requests, with their trace reports, as CSV or NDJSON "
+        "on the standard output or in a file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=EXPORT_FORMATS, default="csv", help="Export format"
+        )
+        parser.add_argument("--output", help="File to write, instead of stdout")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of mediation requests read per query",
+        )
+
+    def handle(self, *args, **options):
+        exporter = MediationRequestExporter(
+            MediationRequest.objects.order_by("request_date", "id"),
+            chunk_size=options["chunk_size"],
+        )
+        lines = exporter.iter_export(options["format"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+        try:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                output.writelines(lines)
+        except OSError as e:
+            raise CommandError('Exception "%s"' % e)
@@ -0,0 +1,86 @@
+import time
+
+from django.core.management.base import CommandError
+
+from connect_access.core.loading import get_class
+from connect_access.core.management.commands import BaseCommand
+
+MediationDataGenerator = get_class("mediations.generators", "MediationDataGenerator")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates synthetic mediation requests, with their trace reports, "
+        "complainants and attached files, for load testing. Their modification "
+        "dates being backdated, before the checkpoint of the statistics, run "
+        "update_statistics(full=True) afterwards to count them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "count", type=int, help="Number of generated mediation requests"
+        )
+        parser.add_argument(
+            "--users", type=int, default=1000, help="Number of generated complainants"
+        )
+        parser.add_argument(
+            "--anonymous",
+            type=float,
+            default=0.3,
+            help="Share of the requests without complainant account",
+        )
+        parser.add_argument(
+            "--trace-reports",
+            type=float,
+            default=2.0,
+            help="Mean number of trace reports per request",
+        )
+        parser.add_argument(
+            "--attachments",
+            type=float,
+            default=0.0,
+            help="Share of the requests and trace reports with an attached file",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=730,
+            help="Number of past days over which the requests are spread",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes creating the chunks of requests",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Number of mediation requests created per transaction",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed of the random values"
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            created = MediationDataGenerator(
+                users=options["users"],
+                anonymous=options["anonymous"],
+                trace_reports=options["trace_reports"],
+                attachments=options["attachments"],
+                days=options["days"],
+                chunk_size=options["chunk_size"],
+                seed=options["seed"],
+            ).generate(options["count"], processes=options["processes"])
+        except Exception as e:
+            raise CommandError('Exception "%s"' % e)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"{created['users']} users, {created['mediation_requests']} mediation "
+            f"requests and {created['trace_reports']} trace reports generated in "
+            f"{elapsed:.2f} s ({created['mediation_requests'] / elapsed:.0f} "
+            "requests/s)"
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import CommandError
+
+from connect_access.core.loading import get_class, get_classes
+from connect_access.core.management.commands import BaseCommand
+
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+get_retention_days, purge_expired_mediation_requests = get_classes(
+    "mediations.retention",
+    ["get_retention_days", "purge_expired_mediation_requests"],
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the mediation requests not modified for the retention of their "
+        "status, MEDIATION_RETENTION_DAYS or the --retention options, by batches. "
+        "An interrupted purge is resumed by running the command again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention",
+            action="append",
+            default=[],
+            metavar="STATUS=DAYS",
+            help="Retention of a status, such as CLOTURED=730, replacing the settings",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Number of mediation requests deleted per transaction",
+        )
+
+    def handle(self, *args, **options):
+        retention_days = get_retention_days()
+        if options["retention"]:
+            retention_days = self._parse_retention(options["retention"])
+        deleted = purge_expired_mediation_requests(
+            retention_days, options["batch_size"]
+        )
+        for status, count in deleted.items():
+            self.stdout.write(f"{MediationRequestStatus(status).name}: {count} deleted")
+
+    @staticmethod
+    def _parse_retention(values):
+        """Parse the STATUS=DAYS values by status value.
+
+        Raises:
+            CommandError: when a value is invalid.
+
+        Returns:
+            A dictionary of the number of days, by status value.
+
+        """
+        retention_days = {}
+        for value in values:
+            name, _separator, days = value.partition("=")
+            try:
+                retention_days[MediationRequestStatus[name].value] = int(days)
+            except (KeyError, ValueError):
+                raise CommandError(f"{value} is not a STATUS=DAYS retention.")
+        return retention_days
@@ -0,0 +1,65 @@
+import functools
+import operator
+
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Now
+
+import connect_access.apps.mediations.choices as choices
+
+# Statuses closing a mediation request.
+CLOSED_STATUSES = (
+    choices.MediationRequestStatus.CLOTURED.value,
+    choices.MediationRequestStatus.MEDIATION_FAILED.value,
+)
+# Personal information removed from the closed requests of complainants without
+# an account.
+PERSONAL_INFORMATION_FIELDS = ("first_name", "last_name", "email", "phone_number")
+# Closed requests of complainants without an account still having personal
+# information, left by the changes of status not going through save(). Condition
+# of the partial index mediation_anonymization_idx, which only indexes them.
+PERSONAL_INFORMATION_TO_REMOVE = Q(
+    status__in=CLOSED_STATUSES, complainant__isnull=True
+) & functools.reduce(
+    operator.or_, (~Q(**{field: ""}) for field in PERSONAL_INFORMATION_FIELDS)
+)
+
+
+class MediationRequestQuerySet(models.QuerySet):
+    def transition(self, status):
+        """Move the mediation requests to the status in a single UPDATE.
+
+        Like AbstractMediationRequest.save(), the personal information of the
+        anonymous requests is removed when they are closed, in the same
+        statement.
+
+        Args:
+            status: the value of the new MediationRequestStatus.
+
+        Returns:
+            The number of updated mediation requests.
+
+        """
+        values = {"status": status, "modified": Now()}
+        if status in CLOSED_STATUSES:
+            for field in PERSONAL_INFORMATION_FIELDS:
+                values[field] = Case(
+                    When(complainant__isnull=True, then=Value("")),
+                    default=F(field),
+                    output_field=self.model._meta.get_field(field),
+                )
+        return self.update(**values)
+
+    def remove_personal_information(self):
+        """Remove the personal information of the mediation requests in a single UPDATE.
+
+        Returns:
+            The number of updated mediation requests.
+
+        """
+        return self.update(
+            modified=Now(), **{field: "" for field in PERSONAL_INFORMATION_FIELDS}
+        )
+
+
+MediationRequestManager = models.Manager.from_queryset(MediationRequestQuerySet)
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0002_tracereport"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["-request_date", "-id"], name="mediation_request_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0003_request_date_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["status", "-request_date", "-id"],
+                name="mediation_status_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["urgency", "-request_date", "-id"],
+                name="mediation_urgency_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["issue_type", "-request_date", "-id"],
+                name="mediation_issue_type_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["inaccessibility_level", "-request_date", "-id"],
+                name="mediation_inaccess_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["-modified", "-id"], name="mediation_modified_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                django.db.models.functions.text.Upper("organization_name"),
+                name="mediation_org_name_idx",
+            ),
+        ),
+    ]
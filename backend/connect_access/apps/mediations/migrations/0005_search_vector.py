@@ -0,0 +1,82 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:19
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from connect_access.models.search import (
+    create_search_vector_trigger,
+    drop_search_vector_trigger,
+)
+
+# (column, weight, stemmed) of the indexed columns.
+MEDIATION_REQUEST_SEARCH_COLUMNS = [
+    ("issue_description", "A", True),
+    ("organization_name", "A", False),
+    ("step_description", "B", True),
+    ("first_name", "B", False),
+    ("last_name", "B", False),
+    ("further_info", "C", True),
+]
+TRACE_REPORT_SEARCH_COLUMNS = [
+    ("comment", "A", True),
+]
+
+
+def create_triggers(apps, schema_editor):
+    create_search_vector_trigger(
+        schema_editor,
+        apps.get_model("mediations", "MediationRequest"),
+        MEDIATION_REQUEST_SEARCH_COLUMNS,
+    )
+    create_search_vector_trigger(
+        schema_editor,
+        apps.get_model("mediations", "TraceReport"),
+        TRACE_REPORT_SEARCH_COLUMNS,
+    )
+
+
+def drop_triggers(apps, schema_editor):
+    drop_search_vector_trigger(
+        schema_editor, apps.get_model("mediations", "MediationRequest")
+    )
+    drop_search_vector_trigger(
+        schema_editor, apps.get_model("mediations", "TraceReport")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0004_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediationrequest",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="tracereport",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="mediation_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tracereport",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="trace_report_search_idx"
+            ),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0005_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediationrequest",
+            name="awaiting_digest",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                condition=models.Q(("awaiting_digest", True)),
+                fields=["id"],
+                name="mediation_awaiting_digest_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0006_awaiting_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_name", models.CharField(max_length=100, verbose_name="Model")),
+                ("uuid", models.UUIDField(verbose_name="Public identifier")),
+                (
+                    "deleted",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Date of the deletion",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tombstone",
+                "verbose_name_plural": "Tombstones",
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="tracereport",
+            index=models.Index(
+                fields=["modified", "id"], name="trace_report_modified_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["model_name", "deleted"], name="tombstone_model_deleted_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:58
+
+from django.db import migrations, models
+
+import connect_access.apps.uploads.storages
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0007_tombstones"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="mediationrequest",
+            name="attached_file",
+            field=models.FileField(
+                blank=True,
+                storage=connect_access.apps.uploads.storages.ContentAddressedStorage(),
+                upload_to="",
+                verbose_name="Attached file",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tracereport",
+            name="attached_file",
+            field=models.FileField(
+                blank=True,
+                storage=connect_access.apps.uploads.storages.ContentAddressedStorage(),
+                upload_to="",
+                verbose_name="Attached file",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.8 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mediations", "0008_content_addressed_attachments"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                condition=models.Q(
+                    ("complainant__isnull", True),
+                    ("status__in", ("cl", "fa")),
+                    models.Q(
+                        models.Q(("first_name", ""), _negated=True),
+                        models.Q(("last_name", ""), _negated=True),
+                        models.Q(("email", ""), _negated=True),
+                        models.Q(("phone_number", ""), _negated=True),
+                        _connector="OR",
+                    ),
+                ),
+                fields=["id"],
+                name="mediation_anonymization_idx",
+            ),
+        ),
+    ]
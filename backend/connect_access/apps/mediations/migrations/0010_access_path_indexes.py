@@ -0,0 +1,53 @@
+# Generated by Django 4.0.8 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("mediations", "0009_anonymization_index"),
+    ]
+
+    operations = [
+        # The composite indexes replace the ones of the foreign keys, created first.
+        migrations.AddIndex(
+            model_name="mediationrequest",
+            index=models.Index(
+                fields=["complainant", "-request_date", "-id"],
+                name="mediation_complainant_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tracereport",
+            index=models.Index(
+                fields=["mediation_request", "-contact_date", "-id"],
+                name="trace_report_request_date_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="mediationrequest",
+            name="complainant",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="User who submitted this request",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="tracereport",
+            name="mediation_request",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="mediations.mediationrequest",
+                verbose_name="The mediation request to which this trace is linked",
+            ),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from connect_access.apps.mediations.abstract_models import AbstractMediationRequest
+from connect_access.apps.mediations.abstract_models import (
+    AbstractMediationRequest,
+    AbstractTombstone,
+)
 from connect_access.core.loading import is_model_registered
 from connect_access.models import model_factory
 
@@ -7,3 +10,7 @@ __all__ = []
 if not is_model_registered("mediations", "MediationRequest"):
     MediationRequest = model_factory(AbstractMediationRequest)
     __all__.append("MediationRequest")
+
+if not is_model_registered("mediations", "Tombstone"):
+    Tombstone = model_factory(AbstractTombstone)
+    __all__.append("Tombstone")
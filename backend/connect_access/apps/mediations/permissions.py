@@ -11,7 +11,13 @@ class IsAnon(permissions.BasePermission):
 
 class IsOwner(permissions.BasePermission):
     def has_permission(self, request, view):
-        action_forbidden = view.action in ["list", "delete"]
+        action_forbidden = view.action in [
+            "list",
+            "delete",
+            "bulk",
+            "transition",
+            "export",
+        ]
         return request.user and request.user.is_authenticated and not action_forbidden
 
     def has_object_permission(self, request, view, obj):
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from connect_access.core.loading import get_model
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+Tombstone = get_model("mediations", "Tombstone")
+
+
+@receiver(post_delete, sender=MediationRequest)
+@receiver(post_delete, sender=TraceReport)
+def add_tombstone(sender, instance, **kwargs):
+    """Record the deletion for the clients syncing the lists."""
+    Tombstone.objects.create(model_name=sender._meta.model_name, uuid=instance.uuid)
@@ -0,0 +1,233 @@
+import datetime
+import logging
+import os
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_model
+
+from .choices import MediationRequestStatus
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+Tombstone = get_model("mediations", "Tombstone")
+StoredFile = get_model("uploads", "StoredFile")
+StatisticsStaleDay = get_model("statistics", "StatisticsStaleDay")
+MediationRequestExporter = get_class("mediations.exports", "MediationRequestExporter")
+publish_on_commit = get_class("events.publishers", "publish_on_commit")
+
+logger = logging.getLogger(__name__)
+
+
+class MediationRequestPurger:
+    """Delete mediation requests, with their trace reports, by batches.
+
+    The requests are deleted by ranges of batch_size primary keys, each in its
+    own short transaction, without loading the instances: the deletion
+    signals are replaced by their bulk equivalents (tombstones, stale
+    statistics days, events and file references). An interrupted purge is
+    resumed by running it again, the bounds of the ranges being the ones of
+    the remaining requests, and the requests locked by another transaction
+    are left to the next run, their number being kept in skipped.
+
+    The raw deletions skip the collector of Django, which follows the
+    relations: the rows related to the deleted ones are deleted by the
+    purger, for the relations of deleted_relations, and a relation missing
+    from it makes the purge fail (see check_relations).
+
+    When archive is given, a file-like object, the requests are written to it
+    as NDJSON (see MediationRequestExporter) before being deleted. A batch
+    whose transaction fails is archived again by the next run.
+
+    """
+
+    # Relations to the deleted models whose rows are deleted along, as the
+    # label of the related model and the name of its field.
+    deleted_relations = {("mediations.tracereport", "mediation_request")}
+
+    def __init__(self, batch_size=500, archive=None):
+        self.batch_size = batch_size
+        self.archive = archive
+        self.skipped = 0
+
+    def purge(self, queryset):
+        """Delete the mediation requests of queryset.
+
+        Returns:
+            The number of deleted mediation requests.
+
+        """
+        self.check_relations()
+        bounds = queryset.aggregate(first=Min("id"), last=Max("id"))
+        if bounds["first"] is None:
+            return 0
+        deleted = 0
+        for start in range(bounds["first"], bounds["last"] + 1, self.batch_size):
+            deleted += self._purge_batch(
+                queryset.filter(id__gte=start, id__lt=start + self.batch_size)
+            )
+        return deleted
+
+    def check_relations(self):
+        """Check that the rows related to the deleted ones are deleted along.
+
+        Raises:
+            ImproperlyConfigured: when a relation to the mediation requests or
+                the trace reports, added by a fork for instance, is missing
+                from deleted_relations.
+
+        """
+        for model in (MediationRequest, TraceReport):
+            for relation in model._meta.related_objects:
+                label = relation.related_model._meta.label_lower
+                if (label, relation.field.name) not in self.deleted_relations:
+                    raise ImproperlyConfigured(
+                        f"The rows of {label} related to the deleted "
+                        f"{model._meta.label_lower} by {relation.field.name} "
+                        f"aren't deleted by {type(self).__name__}."
+                    )
+
+    def _purge_batch(self, queryset):
+        with transaction.atomic():
+            mediation_requests = list(
+                queryset.select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "uuid", "request_date", "attached_file")
+            )
+            if not mediation_requests:
+                self.skipped += queryset.count()
+                return 0
+            pks = [pk for pk, _uuid, _date, _file in mediation_requests]
+            if self.archive is not None:
+                self.archive.writelines(
+                    MediationRequestExporter(
+                        MediationRequest.objects.filter(pk__in=pks).order_by("id")
+                    ).iter_ndjson()
+                )
+                self.archive.flush()
+            trace_reports = list(
+                TraceReport.objects.filter(mediation_request__in=pks).values_list(
+                    "id", "uuid", "attached_file"
+                )
+            )
+            # Raw deletions: the deletion signals would load every instance.
+            TraceReport.objects.filter(
+                pk__in=[pk for pk, _uuid, _file in trace_reports]
+            )._raw_delete(TraceReport.objects.db)
+            MediationRequest.objects.filter(pk__in=pks)._raw_delete(
+                MediationRequest.objects.db
+            )
+            # The locked requests remain.
+            self.skipped += queryset.count()
+            self._record_deletions(
+                TraceReport, [uuid for _pk, uuid, _file in trace_reports]
+            )
+            self._record_deletions(
+                MediationRequest,
+                [uuid for _pk, uuid, _date, _file in mediation_requests],
+            )
+            StatisticsStaleDay.objects.bulk_create(
+                [
+                    StatisticsStaleDay(day=day)
+                    for day in {
+                        timezone.localdate(request_date)
+                        for _pk, _uuid, request_date, _file in mediation_requests
+                    }
+                ],
+                ignore_conflicts=True,
+            )
+            for model, names in (
+                (MediationRequest, [name for *_row, name in mediation_requests]),
+                (TraceReport, [name for *_row, name in trace_reports]),
+            ):
+                StoredFile.objects.release_many(
+                    names, model._meta.get_field("attached_file").storage
+                )
+        return len(mediation_requests)
+
+    @staticmethod
+    def _record_deletions(model, uuids):
+        if not uuids:
+            return
+        model_name = model._meta.model_name
+        Tombstone.objects.bulk_create(
+            Tombstone(model_name=model_name, uuid=uuid) for uuid in uuids
+        )
+        publish_on_commit(model_name, "deleted", uuids)
+
+
+def get_retention_days():
+    """Return the retention of MEDIATION_RETENTION_DAYS, by status value.
+
+    Returns:
+        A dictionary of the number of days, by status value.
+
+    """
+    return {
+        MediationRequestStatus[name].value: days
+        for name, days in getattr(settings, "MEDIATION_RETENTION_DAYS", {}).items()
+    }
+
+
+def purge_expired_mediation_requests(retention_days=None, batch_size=None):
+    """Delete the mediation requests not modified for the retention of their status.
+
+    The requests of the statuses listed in MEDIATION_RETENTION_ARCHIVED_STATUSES
+    are archived before, in an NDJSON file of MEDIATION_RETENTION_ARCHIVE_ROOT
+    per day. Statuses without retention are kept.
+
+    Args:
+        retention_days: the number of days by status value, the ones of
+            MEDIATION_RETENTION_DAYS by default.
+        batch_size: the number of requests deleted per transaction,
+            MEDIATION_RETENTION_BATCH_SIZE by default.
+
+    Returns:
+        The number of deleted mediation requests, by status value.
+
+    """
+    if retention_days is None:
+        retention_days = get_retention_days()
+    batch_size = batch_size or getattr(settings, "MEDIATION_RETENTION_BATCH_SIZE", 500)
+    archived_statuses = {
+        MediationRequestStatus[name].value
+        for name in getattr(settings, "MEDIATION_RETENTION_ARCHIVED_STATUSES", [])
+    }
+    now = timezone.now()
+    deleted = {}
+    for status, days in retention_days.items():
+        queryset = MediationRequest.objects.filter(
+            status=status, modified__lt=now - datetime.timedelta(days=days)
+        )
+        if status in archived_statuses:
+            with _open_archive(now) as archive:
+                purger = MediationRequestPurger(batch_size, archive)
+                deleted[status] = purger.purge(queryset)
+        else:
+            purger = MediationRequestPurger(batch_size)
+            deleted[status] = purger.purge(queryset)
+        if deleted[status]:
+            logger.info(
+                f"{deleted[status]} mediation requests of the status {status} were "
+                "deleted after their retention."
+            )
+        if purger.skipped:
+            logger.info(
+                f"{purger.skipped} mediation requests of the status {status}, locked "
+                "by another transaction, are left to the next run."
+            )
+    return deleted
+
+
+def _open_archive(now):
+    root = settings.MEDIATION_RETENTION_ARCHIVE_ROOT
+    os.makedirs(root, exist_ok=True)
+    return open(
+        os.path.join(root, f"mediation-requests-{now:%Y-%m-%d}.ndjson"),
+        "a",
+        encoding="utf-8",
+    )
@@ -4,8 +4,10 @@ from rest_framework import serializers
 from connect_access.core.loading import get_model
 from connect_access.models.serializers import (
     BooleanSerializerNullField,
+    CompiledSerializerMixin,
     EnumArraySerializerField,
     EnumSerializerField,
+    SparseFieldsetMixin,
     ToReprMixin,
 )
 
@@ -23,10 +25,16 @@ MediationRequest = get_model("mediations", "MediationRequest")
 TraceReport = get_model("mediations", "TraceReport")
 
 
-class MediationRequestSerializer(ToReprMixin, serializers.ModelSerializer):
+class MediationRequestSerializer(
+    CompiledSerializerMixin,
+    SparseFieldsetMixin,
+    ToReprMixin,
+    serializers.ModelSerializer,
+):
     """Serializes all the fields of mediation request.
 
-    attached_file is serialized as a string representing its URL.
+    attached_file is serialized as a string representing its URL. Large files
+    are rather uploaded in chunks, and attached (see UploadViewSet).
 
     """
 
@@ -93,3 +101,19 @@ class MediationRequestSerializer(ToReprMixin, serializers.ModelSerializer):
             "organization_phone_number",
             "organization_contact",
         ]
+
+
+class MediationRequestTransitionSerializer(serializers.Serializer):
+    """Validates a status transition of mediation requests.
+
+    The requests are selected by their identifiers when ids is given.
+
+    """
+
+    status = serializers.ChoiceField(choices=MediationRequestStatus.names)
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, required=False
+    )
+
+    def validate_status(self, value):
+        return MediationRequestStatus[value].value
@@ -0,0 +1,169 @@
+import datetime
+import logging
+import time
+
+import celery
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+from django.utils.translation import ngettext
+
+from connect_access.core.loading import get_class, get_model
+from connect_access.core.tasks import send_multialternative_mail_on_commit
+
+from .choices import UrgencyLevel
+
+MediationRequest = get_model("mediations", "MediationRequest")
+Tombstone = get_model("mediations", "Tombstone")
+purge_expired_mediation_requests = get_class(
+    "mediations.retention", "purge_expired_mediation_requests"
+)
+PERSONAL_INFORMATION_TO_REMOVE = get_class(
+    "mediations.managers", "PERSONAL_INFORMATION_TO_REMOVE"
+)
+publish_on_commit = get_class("events.publishers", "publish_on_commit")
+
+logger = logging.getLogger(__name__)
+
+
+def urgency_order():
+    """Order by urgency, from the most urgent, requests without one last."""
+    return Case(
+        *[
+            When(urgency=value, then=Value(rank))
+            for rank, value in enumerate(UrgencyLevel.values)
+        ],
+        default=Value(len(UrgencyLevel.values)),
+        output_field=IntegerField(),
+    )
+
+
+@celery.shared_task()
+def send_mediators_digest():
+    """Send the mediators one email summing up the requests awaiting a digest.
+
+    Returns:
+        The number of requests in the digest.
+
+    """
+    with transaction.atomic():
+        mediation_requests = list(
+            MediationRequest.objects.select_for_update(skip_locked=True)
+            .filter(awaiting_digest=True)
+            .order_by(urgency_order(), "request_date", "id")
+        )
+        if not mediation_requests:
+            return 0
+        mediators_email = getattr(settings, "MEDIATION_REQUEST_EMAIL", "")
+        if mediators_email:
+            context = {
+                "mediation_requests": [
+                    {
+                        "id": str(mediation_request.uuid)[:8],
+                        "urgency": str(UrgencyLevel(mediation_request.urgency).label)
+                        if mediation_request.urgency
+                        else None,
+                        "first_name": mediation_request.first_name,
+                        "last_name": mediation_request.last_name,
+                        "email": mediation_request.email,
+                        "issue_description": mediation_request.issue_description,
+                        "organization_name": mediation_request.organization_name,
+                    }
+                    for mediation_request in mediation_requests
+                ]
+            }
+            send_multialternative_mail_on_commit(
+                context,
+                ngettext(
+                    "%(count)d new mediation request has been submitted",
+                    "%(count)d new mediation requests have been submitted",
+                    len(mediation_requests),
+                )
+                % {"count": len(mediation_requests)},
+                [mediators_email],
+                "mediations/emails/mediator_digest",
+            )
+        MediationRequest.objects.filter(
+            pk__in=[mediation_request.pk for mediation_request in mediation_requests]
+        ).update(awaiting_digest=False)
+    return len(mediation_requests)
+
+
+@celery.shared_task()
+def purge_tombstones():
+    """Delete the tombstones older than API_SYNC_RETENTION days.
+
+    Returns:
+        The number of deleted tombstones.
+
+    """
+    retention = datetime.timedelta(days=getattr(settings, "API_SYNC_RETENTION", 30))
+    deleted, _rows = Tombstone.objects.filter(
+        deleted__lt=timezone.now() - retention
+    ).delete()
+    return deleted
+
+
+@celery.shared_task()
+def purge_mediation_requests():
+    """Delete the mediation requests past the retention of their status.
+
+    See purge_expired_mediation_requests and MEDIATION_RETENTION_DAYS.
+
+    Returns:
+        The number of deleted mediation requests.
+
+    """
+    return sum(purge_expired_mediation_requests().values())
+
+
+@celery.shared_task()
+def remove_personal_information(batch_size=None):
+    """Remove the personal information left in the closed anonymous requests.
+
+    AbstractMediationRequest.save() removes it when a request is closed, but
+    not the other changes of status (bulk updates, imports, older data). The
+    requests are found through the partial index mediation_anonymization_idx,
+    by batches of MEDIATION_ANONYMIZATION_BATCH_SIZE in the order of their
+    ids, each locked with SKIP LOCKED and updated with a single UPDATE in its
+    own transaction.
+
+    Returns:
+        The number of anonymized mediation requests.
+
+    """
+    batch_size = batch_size or getattr(
+        settings, "MEDIATION_ANONYMIZATION_BATCH_SIZE", 1000
+    )
+    start = time.perf_counter()
+    anonymized = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            mediation_requests = list(
+                MediationRequest.objects.select_for_update(skip_locked=True)
+                .filter(PERSONAL_INFORMATION_TO_REMOVE, id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "uuid")[:batch_size]
+            )
+            if mediation_requests:
+                MediationRequest.objects.filter(
+                    pk__in=[pk for pk, _uuid in mediation_requests]
+                ).remove_personal_information()
+                publish_on_commit(
+                    MediationRequest._meta.model_name,
+                    "updated",
+                    [uuid for _pk, uuid in mediation_requests],
+                )
+        anonymized += len(mediation_requests)
+        if len(mediation_requests) < batch_size:
+            break
+        last_id = mediation_requests[-1][0]
+    if anonymized:
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"The personal information of {anonymized} requests was removed in "
+            f"{elapsed:.1f} s ({anonymized / elapsed:.0f} requests/s)."
+        )
+    return anonymized
@@ -1,6 +1,16 @@
+import asyncio
+import csv
+import datetime
+import json
+
 import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
 from django.core import mail
+from django.core.asgi import get_asgi_application
 from django.test import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
 from pytest_django.asserts import assertContains, assertNotContains
 from rest_framework.test import APIRequestFactory, force_authenticate
 
@@ -17,6 +27,8 @@ MediationRequestFactory = get_class(
     "mediations.tests.factories", "MediationRequestFactory"
 )
 UserFactory = get_class("users.tests.factories", "UserFactory")
+AdminUserFactory = get_class("users.tests.factories", "AdminUserFactory")
+check_attach_token = get_class("uploads.tokens", "check_attach_token")
 
 
 class TestAPI:
@@ -51,6 +63,296 @@ class TestAPI:
         assert response.data[1]["request_date"] == mediation_request1.request_date
         assert response.data[2]["request_date"] == mediation_request3.request_date
 
+    def test_mediation_requests_list_is_not_paginated_by_default(self, authenticate):
+        MediationRequestFactory.create_batch(3)
+        request = APIRequestFactory().get(_get_mediation_request_absolute_url("list"))
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert len(response.data) == 3
+
+    def test_mediation_requests_list_pages_follow_the_cursor_without_gaps_or_duplicates(
+        self, authenticate
+    ):
+        same_date = "2020-05-27T23:10:05.084022+02:00"
+        mediation_requests = MediationRequestFactory.create_batch(
+            3, request_date=same_date
+        ) + [
+            MediationRequestFactory(request_date="2020-05-28T23:10:05.084022+02:00"),
+            MediationRequestFactory(request_date="2020-05-26T23:10:05.084022+02:00"),
+        ]
+        url = f"{_get_mediation_request_absolute_url('list')}?page_size=2"
+        received = []
+        pages = 0
+        while url:
+            request = APIRequestFactory().get(url)
+            authenticate.authenticate_request_as_admin(request)
+            response = MediationRequestViewSet.as_view({"get": "list"})(request)
+            assert len(response.data["results"]) <= 2
+            received += [result["id"] for result in response.data["results"]]
+            url = response.data["next"]
+            pages += 1
+        expected = MediationRequest.objects.order_by("-request_date", "-id")
+        assert pages == 3
+        assert received == [mediation_request.uuid for mediation_request in expected]
+        assert len(set(received)) == len(mediation_requests)
+
+    def test_mediation_requests_list_with_invalid_cursor_is_not_found(
+        self, authenticate
+    ):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"cursor": "invalid"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 404
+
+    def test_mediation_requests_list_filters_by_statuses(self, authenticate):
+        filed = MediationRequestFactory(status=MediationRequestStatus.FILED.value)
+        mediating = MediationRequestFactory(
+            status=MediationRequestStatus.MEDIATING.value
+        )
+        closed = MediationRequestFactory(status=MediationRequestStatus.CLOTURED.value)
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {"status": "FILED,MEDIATING"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assertContains(response, filed.issue_description)
+        assertContains(response, mediating.issue_description)
+        assertNotContains(response, closed.issue_description)
+
+    def test_mediation_requests_list_filters_by_request_date_range_and_organization(
+        self, authenticate
+    ):
+        inside = MediationRequestFactory(
+            request_date="2020-05-27T23:10:05+02:00", organization_name="Koena SAS"
+        )
+        MediationRequestFactory(
+            request_date="2020-05-29T23:10:05+02:00", organization_name="Koena SAS"
+        )
+        MediationRequestFactory(
+            request_date="2020-05-27T23:10:05+02:00", organization_name="Other"
+        )
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {
+                "request_date_after": "2020-05-27T00:00:00+02:00",
+                "request_date_before": "2020-05-28T00:00:00+02:00",
+                "organization_name": "koena sas",
+            },
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert [result["id"] for result in response.data] == [inside.uuid]
+
+    def test_mediation_requests_list_strips_the_filter_values(self, authenticate):
+        koena = MediationRequestFactory(organization_name="Koena SAS")
+        MediationRequestFactory(organization_name="Other")
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {"organization_name": " Koena SAS ", "request_date_after": " "},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert [result["id"] for result in response.data] == [koena.uuid]
+
+    def test_mediation_requests_list_with_unknown_filter_value_is_rejected(
+        self, authenticate
+    ):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"urgency": "UNKNOWN"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 400
+        assert "urgency" in response.data
+
+    def test_mediation_requests_list_can_be_sorted_and_paginated(self, authenticate):
+        for organization_name in ["b", "a", "c", "a"]:
+            MediationRequestFactory(organization_name=organization_name)
+        url = _get_mediation_request_absolute_url("list")
+        request = APIRequestFactory().get(
+            url, {"ordering": "organization_name", "page_size": 3}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        first_page = [
+            result["organization_name"] for result in response.data["results"]
+        ]
+        request = APIRequestFactory().get(response.data["next"])
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        second_page = [
+            result["organization_name"] for result in response.data["results"]
+        ]
+        assert first_page + second_page == ["a", "a", "b", "c"]
+
+    def test_mediation_requests_list_searches_stemmed_words_by_relevance(
+        self, authenticate
+    ):
+        in_further_info = MediationRequestFactory(
+            issue_description="Le site est illisible.",
+            further_info="Les boutons sont trop petits.",
+        )
+        in_issue_description = MediationRequestFactory(
+            issue_description="Le bouton de validation ne fonctionne pas."
+        )
+        MediationRequestFactory(issue_description="Le formulaire est illisible.")
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"q": "boutons"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert [result["id"] for result in response.data] == [
+            in_issue_description.uuid,
+            in_further_info.uuid,
+        ]
+
+    def test_mediation_requests_search_follows_text_updates(self, authenticate):
+        mediation_request = MediationRequestFactory(issue_description="Menu")
+        MediationRequest.objects.filter(pk=mediation_request.pk).update(
+            issue_description="Captcha"
+        )
+        url = _get_mediation_request_absolute_url("list")
+        for terms, expected in (("menu", []), ("captcha", [mediation_request.uuid])):
+            request = APIRequestFactory().get(url, {"q": terms})
+            authenticate.authenticate_request_as_admin(request)
+            response = MediationRequestViewSet.as_view({"get": "list"})(request)
+            assert [result["id"] for result in response.data] == expected
+
+    def test_mediation_requests_search_can_be_paginated(self, authenticate):
+        for further_info in ["", "contraste", "contraste contraste", ""]:
+            MediationRequestFactory(
+                issue_description="Mauvais contraste", further_info=further_info
+            )
+        MediationRequestFactory(issue_description="Vidéo sans sous-titres")
+        url = _get_mediation_request_absolute_url("list")
+        ids = []
+        next_url = f"{url}?q=contraste&page_size=2"
+        while next_url:
+            request = APIRequestFactory().get(next_url)
+            authenticate.authenticate_request_as_admin(request)
+            response = MediationRequestViewSet.as_view({"get": "list"})(request)
+            ids += [result["id"] for result in response.data["results"]]
+            next_url = response.data["next"]
+        assert len(ids) == len(set(ids)) == 4
+
+    def test_mediation_requests_list_returns_only_requested_fields(
+        self, authenticate, django_assert_num_queries
+    ):
+        mediation_request = MediationRequestFactory(
+            status=MediationRequestStatus.FILED.value, further_info="Long text"
+        )
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {"fields": "id,status,complainant", "page_size": 10},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        # The ETag aggregate, then the rows.
+        with django_assert_num_queries(2) as captured:
+            response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.data["results"] == [
+            {
+                "id": mediation_request.uuid,
+                "complainant": mediation_request.complainant.uuid,
+                "status": "FILED",
+            }
+        ]
+        assert "further_info" not in captured.captured_queries[1]["sql"]
+
+    def test_mediation_requests_list_omits_fields(self, authenticate):
+        MediationRequestFactory()
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {"omit": "issue_description,further_info"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert "issue_description" not in response.data[0]
+        assert "further_info" not in response.data[0]
+        assert "organization_reply" in response.data[0]
+
+    def test_mediation_requests_list_with_unknown_field_is_rejected(self, authenticate):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"fields": "id,unknown"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 400
+        assert "fields" in response.data
+
+    def test_mediation_requests_list_is_not_modified_when_etag_matches(
+        self, django_assert_num_queries
+    ):
+        admin = AdminUserFactory()
+        MediationRequestFactory()
+        url = _get_mediation_request_absolute_url("list")
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=admin)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 200
+        request = APIRequestFactory().get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        force_authenticate(request, user=admin)
+        with django_assert_num_queries(1):
+            response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 304
+
+    def test_mediation_requests_list_etag_changes_on_update_and_delete(self):
+        admin = AdminUserFactory()
+        mediation_request1 = MediationRequestFactory()
+        mediation_request2 = MediationRequestFactory()
+        url = _get_mediation_request_absolute_url("list")
+
+        def get_etag():
+            request = APIRequestFactory().get(url)
+            force_authenticate(request, user=admin)
+            return MediationRequestViewSet.as_view({"get": "list"})(request)["ETag"]
+
+        etags = [get_etag()]
+        mediation_request2.first_name = "Changed"
+        mediation_request2.save()
+        etags.append(get_etag())
+        mediation_request1.delete()
+        etags.append(get_etag())
+        assert len(set(etags)) == 3
+
+    def test_mediation_requests_page_etag_changes_when_a_row_replaces_another(self):
+        admin = AdminUserFactory()
+        mediation_requests = [
+            MediationRequestFactory(request_date=f"2020-05-2{day}T10:00:00+02:00")
+            for day in range(4)
+        ]
+        url = f"{_get_mediation_request_absolute_url('list')}?page_size=2"
+
+        def get_etag():
+            request = APIRequestFactory().get(url)
+            force_authenticate(request, user=admin)
+            return MediationRequestViewSet.as_view({"get": "list"})(request)["ETag"]
+
+        etag = get_etag()
+        # The next request enters the page, with an older modification date.
+        MediationRequest.objects.filter(pk=mediation_requests[3].pk).delete()
+        assert get_etag() != etag
+
+    def test_mediation_request_retrieve_is_not_modified_when_etag_matches(self):
+        admin = AdminUserFactory()
+        mediation_request = MediationRequestFactory()
+        url = _get_mediation_request_absolute_url("detail", mediation_request.uuid)
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=admin)
+        response = MediationRequestViewSet.as_view({"get": "retrieve"})(
+            request, uuid=mediation_request.uuid
+        )
+        assert response.status_code == 200
+        assert response["Last-Modified"]
+        request = APIRequestFactory().get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        force_authenticate(request, user=admin)
+        response = MediationRequestViewSet.as_view({"get": "retrieve"})(
+            request, uuid=mediation_request.uuid
+        )
+        assert response.status_code == 304
+
     def test_mediation_request_create_with_authorirequest_dateed_status_succeeds(
         self, request_data_for_mediation_request, authenticate
     ):
@@ -151,20 +453,482 @@ class TestAPI:
         assertContains(response, mediation_request3.issue_description)
         assertContains(response, mediation_request4.issue_description)
 
+    def test_mediation_requests_user_can_be_paginated(self):
+        complainant = UserFactory()
+        MediationRequestFactory()
+        MediationRequestFactory.create_batch(3, complainant=complainant)
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("user"), {"page_size": 2}
+        )
+        force_authenticate(request, user=complainant)
+        response = MediationRequestViewSet.as_view({"get": "user"})(request)
+        assert len(response.data["results"]) == 2
+        request = APIRequestFactory().get(response.data["next"])
+        force_authenticate(request, user=complainant)
+        response = MediationRequestViewSet.as_view({"get": "user"})(request)
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is None
+
     @pytest.mark.usefixtures("_set_default_language")
     @override_settings(MEDIATION_REQUEST_EMAIL="mediator@mediation.org")
     def test_send_emails_when_a_mediation_request_is_created(
-        self, request_data_for_mediation_request_creation, authenticate
+        self,
+        request_data_for_mediation_request_creation,
+        authenticate,
+        settings,
+        django_capture_on_commit_callbacks,
     ):
         # An email is sent to complainant, and another one to MEDIATION_REQUEST_EMAIL.
+        settings.CELERY_TASK_ALWAYS_EAGER = True
         assert len(mail.outbox) == 0
-        _add_mediation_request(
-            request_data_for_mediation_request_creation,
-            MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.name,
-            authenticate,
-        )
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            _add_mediation_request(
+                request_data_for_mediation_request_creation,
+                MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.name,
+                authenticate,
+            )
+            # Nothing is sent before the transaction is committed.
+            assert len(mail.outbox) == 0
+        # Both emails, and the event of the creation (see publish_on_commit).
+        assert len(callbacks) == 3
         assert len(mail.outbox) == 2
         assert mail.outbox[0].recipients() == ["john@doe.com"]
         assert "successfully" in mail.outbox[0].subject
         assert mail.outbox[1].recipients() == ["mediator@mediation.org"]
         assert "new" in mail.outbox[1].subject
+        assert "Here is the problem" in mail.outbox[1].body
+
+    @pytest.mark.django_db(transaction=True)
+    def test_mediation_request_is_created_asynchronously_under_asgi(self, settings):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        path = reverse("api:mediation_requests-list")
+        assert asyncio.iscoroutinefunction(resolve(path).func)
+        body = json.dumps(
+            {
+                "status": "PENDING",
+                "first_name": "John",
+                "email": "john@doe.com",
+                "issue_description": "Created under ASGI",
+            }
+        ).encode()
+
+        async def create():
+            communicator = ApplicationCommunicator(
+                get_asgi_application(),
+                {
+                    "type": "http",
+                    "method": "POST",
+                    "path": path,
+                    "query_string": b"",
+                    "headers": [
+                        (b"host", b"testserver"),
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ],
+                },
+            )
+            await communicator.send_input({"type": "http.request", "body": body})
+            start = await communicator.receive_output(timeout=5)
+            response_body = await communicator.receive_output(timeout=5)
+            return start, json.loads(response_body["body"])
+
+        start, data = async_to_sync(create)()
+        assert start["status"] == 201
+        mediation_request = MediationRequest.objects.get()
+        assert mediation_request.issue_description == "Created under ASGI"
+        # Submitted without account, its file is attached with the token.
+        assert data["id"] == str(mediation_request.uuid)
+        assert check_attach_token(data["upload_token"], mediation_request)
+
+    def test_mediation_requests_list_view_stays_synchronous(self):
+        view = MediationRequestViewSet.as_view({"get": "list"})
+        assert not asyncio.iscoroutinefunction(view)
+
+    def test_mediator_email_is_given_every_field_of_the_mediation_request(self):
+        mediation_request = MediationRequestFactory()
+        fields = MediationRequestViewSet._get_email_fields(mediation_request)
+        assert set(fields) == {
+            field.name
+            for field in MediationRequest._meta.fields
+            if not field.primary_key
+        }
+        assert fields["technology_name"] == mediation_request.technology_name
+        json.dumps(fields)
+
+    @pytest.mark.usefixtures("_set_default_language")
+    @override_settings(
+        MEDIATION_REQUEST_EMAIL="mediator@mediation.org",
+        MEDIATION_REQUEST_DIGEST=True,
+        MEDIATION_REQUEST_IMMEDIATE_URGENCIES=["VERY_URGENT"],
+    )
+    def test_mediators_are_notified_by_the_digest_when_enabled(
+        self,
+        request_data_for_mediation_request_creation,
+        authenticate,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        request_data_for_mediation_request_creation["urgency"] = "MODERATELY_URGENT"
+        with django_capture_on_commit_callbacks(execute=True):
+            _add_mediation_request(
+                request_data_for_mediation_request_creation,
+                MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.name,
+                authenticate,
+            )
+        # Only the complainant gets an email.
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].recipients() == ["john@doe.com"]
+        assert MediationRequest.objects.get().awaiting_digest
+
+    @pytest.mark.usefixtures("_set_default_language")
+    @override_settings(
+        MEDIATION_REQUEST_EMAIL="mediator@mediation.org",
+        MEDIATION_REQUEST_DIGEST=True,
+        MEDIATION_REQUEST_IMMEDIATE_URGENCIES=["VERY_URGENT"],
+    )
+    def test_mediators_are_notified_at_once_of_immediate_urgencies(
+        self,
+        request_data_for_mediation_request_creation,
+        authenticate,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        request_data_for_mediation_request_creation["urgency"] = "VERY_URGENT"
+        with django_capture_on_commit_callbacks(execute=True):
+            _add_mediation_request(
+                request_data_for_mediation_request_creation,
+                MediationRequestStatus.WAITING_MEDIATOR_VALIDATION.name,
+                authenticate,
+            )
+        assert len(mail.outbox) == 2
+        assert mail.outbox[1].recipients() == ["mediator@mediation.org"]
+        assert not MediationRequest.objects.get().awaiting_digest
+
+    @pytest.mark.usefixtures("_set_default_language")
+    @override_settings(MEDIATION_REQUEST_EMAIL="mediator@mediation.org")
+    def test_mediation_requests_bulk_creates_the_valid_requests(
+        self,
+        request_data_for_mediation_request_creation,
+        authenticate,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.MEDIATION_REQUEST_BULK_BATCH_SIZE = 2
+        items = [
+            {**request_data_for_mediation_request_creation, "email": f"{i}@doe.com"}
+            for i in range(3)
+        ]
+        items.insert(1, {**request_data_for_mediation_request_creation, "email": ""})
+        items.append({**request_data_for_mediation_request_creation, "status": "FILED"})
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("bulk"), items, format="json"
+        )
+        authenticate.authenticate_request_as_admin(request)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = MediationRequestViewSet.as_view(
+                {"post": "bulk"}, **MediationRequestViewSet.bulk.kwargs
+            )(request)
+        assert response.status_code == 207
+        assert response.data["created"] == 3
+        assert response.data["failed"] == 2
+        results = response.data["results"]
+        assert "email" in results[1]["errors"]
+        assert "status" in results[4]["errors"]
+        created = MediationRequest.objects.order_by("email")
+        assert [str(mediation_request.uuid) for mediation_request in created] == [
+            results[0]["id"],
+            results[2]["id"],
+            results[3]["id"],
+        ]
+        # Each complainant gets an email, and the mediators one digest.
+        assert sorted(email.to[0] for email in mail.outbox) == [
+            "0@doe.com",
+            "1@doe.com",
+            "2@doe.com",
+            "mediator@mediation.org",
+        ]
+        assert not created.filter(awaiting_digest=True).exists()
+
+    def test_mediation_requests_bulk_accepts_ndjson(
+        self, request_data_for_mediation_request_creation, authenticate
+    ):
+        line = json.dumps(request_data_for_mediation_request_creation)
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("bulk"),
+            f"{line}\n\n{line}\n",
+            content_type="application/x-ndjson",
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view(
+            {"post": "bulk"}, **MediationRequestViewSet.bulk.kwargs
+        )(request)
+        assert response.status_code == 201
+        assert response.data["created"] == 2
+        assert MediationRequest.objects.count() == 2
+
+    def test_mediation_requests_bulk_with_invalid_ndjson_is_rejected(
+        self, authenticate
+    ):
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("bulk"),
+            '{"status": "PENDING"}\n{"status"\n',
+            content_type="application/x-ndjson",
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view(
+            {"post": "bulk"}, **MediationRequestViewSet.bulk.kwargs
+        )(request)
+        assert response.status_code == 400
+        assert "line 2" in str(response.data["detail"])
+
+    @pytest.mark.parametrize("permission", ["user", "anonymous"])
+    def test_mediation_requests_bulk_is_forbidden_to_non_admins(
+        self, permission, request_data_for_mediation_request_creation, authenticate
+    ):
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("bulk"),
+            [request_data_for_mediation_request_creation],
+            format="json",
+        )
+        authenticate.authenticate_if_needed(request, permission)
+        response = MediationRequestViewSet.as_view(
+            {"post": "bulk"}, **MediationRequestViewSet.bulk.kwargs
+        )(request)
+        assert response.status_code in (401, 403)
+
+    def test_mediation_requests_transition_moves_the_given_requests(self, authenticate):
+        anonymous = MediationRequestFactory(complainant=None)
+        other = MediationRequestFactory(
+            complainant=None, status=MediationRequestStatus.FILED.value
+        )
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("transition"),
+            {"status": "CLOTURED", "ids": [str(anonymous.uuid)]},
+            format="json",
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"post": "transition"})(request)
+        assert response.data == {"updated": 1}
+        anonymous.refresh_from_db()
+        other.refresh_from_db()
+        assert anonymous.status == MediationRequestStatus.CLOTURED.value
+        assert not anonymous.email
+        assert other.status == MediationRequestStatus.FILED.value
+
+    def test_mediation_requests_transition_moves_the_filtered_requests(
+        self, authenticate
+    ):
+        MediationRequestFactory.create_batch(
+            2, status=MediationRequestStatus.WAITING_ADMIN.value
+        )
+        pending = MediationRequestFactory(status=MediationRequestStatus.PENDING.value)
+        request = APIRequestFactory().post(
+            f"{_get_mediation_request_absolute_url('transition')}?status=WAITING_ADMIN",
+            {"status": "FILED"},
+            format="json",
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"post": "transition"})(request)
+        assert response.data == {"updated": 2}
+        assert (
+            MediationRequest.objects.filter(
+                status=MediationRequestStatus.FILED.value
+            ).count()
+            == 2
+        )
+        pending.refresh_from_db()
+        assert pending.status == MediationRequestStatus.PENDING.value
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "page_size=50",
+            "q=",
+            "q=%20",
+            "status=",
+            "status=%20,%20",
+            "request_date_after=%20",
+            "complainant=%20",
+            "organization_name=%20",
+            "ordering=status",
+        ],
+    )
+    def test_mediation_requests_transition_without_filter_updates_nothing(
+        self, query, authenticate
+    ):
+        anonymous = MediationRequestFactory(
+            complainant=None, status=MediationRequestStatus.PENDING.value
+        )
+        request = APIRequestFactory().post(
+            f"{_get_mediation_request_absolute_url('transition')}?{query}",
+            {"status": "CLOTURED"},
+            format="json",
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"post": "transition"})(request)
+        assert response.status_code == 400
+        anonymous.refresh_from_db()
+        assert anonymous.status == MediationRequestStatus.PENDING.value
+        assert anonymous.email
+
+    @pytest.mark.parametrize(
+        "data", [{"status": "FILED"}, {"status": "UNKNOWN", "ids": []}]
+    )
+    def test_mediation_requests_transition_with_invalid_data_is_rejected(
+        self, data, authenticate
+    ):
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("transition"), data, format="json"
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"post": "transition"})(request)
+        assert response.status_code == 400
+
+    def test_mediation_requests_transition_is_forbidden_to_users(self, authenticate):
+        request = APIRequestFactory().post(
+            _get_mediation_request_absolute_url("transition"),
+            {"status": "FILED"},
+            format="json",
+        )
+        authenticate.authenticate_request_as_user(request)
+        response = MediationRequestViewSet.as_view({"post": "transition"})(request)
+        assert response.status_code == 403
+
+    def test_mediation_requests_export_streams_the_filtered_requests(
+        self, authenticate
+    ):
+        filed = MediationRequestFactory(status=MediationRequestStatus.FILED.value)
+        MediationRequestFactory(status=MediationRequestStatus.PENDING.value)
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("export"),
+            {"export_format": "ndjson", "status": "FILED"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "export"})(request)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [str(filed.uuid)]
+
+    def test_mediation_requests_export_is_csv_by_default(self, authenticate):
+        MediationRequestFactory.create_batch(2)
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("export"), {"fields": "id,status"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "export"})(request)
+        assert response["Content-Type"].startswith("text/csv")
+        assert "mediation-requests.csv" in response["Content-Disposition"]
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith("id,status,trace_report_id")
+        assert len(lines) == 3
+
+    def test_mediation_requests_export_escapes_csv_formulas(self, authenticate):
+        MediationRequestFactory(
+            organization_name='=HYPERLINK("http://example.com")',
+            first_name="@SUM(A1)",
+            last_name="Doe",
+        )
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("export"),
+            {"fields": "first_name,last_name,organization_name"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "export"})(request)
+        content = b"".join(response.streaming_content).decode()
+        row = next(csv.DictReader(content.splitlines()))
+        assert row["first_name"] == "'@SUM(A1)"
+        assert row["last_name"] == "Doe"
+        assert row["organization_name"] == '\'=HYPERLINK("http://example.com")'
+
+    def test_mediation_requests_export_with_unknown_format_is_rejected(
+        self, authenticate
+    ):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("export"), {"export_format": "xml"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "export"})(request)
+        assert response.status_code == 400
+
+    def test_mediation_requests_export_is_forbidden_to_users(self, authenticate):
+        request = APIRequestFactory().get(_get_mediation_request_absolute_url("export"))
+        authenticate.authenticate_request_as_user(request)
+        response = MediationRequestViewSet.as_view({"get": "export"})(request)
+        assert response.status_code == 403
+
+    def test_mediation_requests_list_since_returns_the_changes(self, authenticate):
+        unchanged, modified, deleted = MediationRequestFactory.create_batch(3)
+        MediationRequest.objects.update(
+            modified=timezone.now() - datetime.timedelta(days=1)
+        )
+        since = timezone.now() - datetime.timedelta(hours=1)
+        modified.save()
+        added = MediationRequestFactory()
+        deleted_uuid = str(deleted.uuid)
+        deleted.delete()
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"since": since.isoformat()}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 200
+        assert [item["id"] for item in response.data["changed"]] == [
+            modified.uuid,
+            added.uuid,
+        ]
+        assert response.data["deleted"] == [deleted_uuid]
+        next_since = datetime.datetime.fromisoformat(response.data["since"])
+        assert since < next_since < timezone.now()
+
+    def test_mediation_requests_list_since_paginates_the_changes(
+        self, authenticate, settings
+    ):
+        settings.API_SYNC_PAGE_SIZE = 2
+        mediation_requests = MediationRequestFactory.create_batch(3)
+        # The same modification date, as set by a transition.
+        MediationRequest.objects.update(modified=timezone.now())
+        deleted_uuid = str(mediation_requests[0].uuid)
+        mediation_requests[0].delete()
+        MediationRequestFactory()
+        since = timezone.now() - datetime.timedelta(hours=1)
+        url = _get_mediation_request_absolute_url("list")
+        request = APIRequestFactory().get(url, {"since": since.isoformat()})
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert len(response.data["changed"]) == 2
+        assert response.data["deleted"] == []
+        assert response.data["since"] is None
+        changed = [item["id"] for item in response.data["changed"]]
+        request = APIRequestFactory().get(response.data["next"])
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.data["next"] is None
+        changed += [item["id"] for item in response.data["changed"]]
+        assert sorted(changed) == sorted(
+            MediationRequest.objects.values_list("uuid", flat=True)
+        )
+        assert response.data["deleted"] == [deleted_uuid]
+        assert response.data["since"]
+
+    def test_mediation_requests_list_since_too_old_is_gone(self, authenticate):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"),
+            {"since": (timezone.now() - datetime.timedelta(days=31)).isoformat()},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 410
+
+    def test_mediation_requests_list_with_invalid_since_is_rejected(self, authenticate):
+        request = APIRequestFactory().get(
+            _get_mediation_request_absolute_url("list"), {"since": "yesterday"}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = MediationRequestViewSet.as_view({"get": "list"})(request)
+        assert response.status_code == 400
+        assert "since" in response.data
@@ -1,6 +1,12 @@
+import csv
+import datetime
+import json
+from io import StringIO
+
 import pytest
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.utils import timezone
 
 from connect_access.core.loading import get_model
 
@@ -35,3 +41,108 @@ class TestCommands:
         assert len(MediationRequest.objects.all()) != 0
         self._delete()
         assert len(MediationRequest.objects.all()) == 0
+
+    def test_deletemediations_reports_the_deleted_requests(self):
+        self._create()
+        out = StringIO()
+        call_command("deletemediations", stdout=out)
+        assert out.getvalue() == "2 deleted\n"
+
+    def test_purgemediationrequests_deletes_the_requests_past_the_retention(self):
+        self._create()
+        MediationRequest.objects.update(
+            status="cl", modified=timezone.now() - datetime.timedelta(days=31)
+        )
+        out = StringIO()
+        call_command(
+            "purgemediationrequests",
+            "--retention",
+            "CLOTURED=30",
+            "--batch-size",
+            "1",
+            stdout=out,
+        )
+        assert "CLOTURED: 2 deleted" in out.getvalue()
+        assert not MediationRequest.objects.exists()
+
+    def test_purgemediationrequests_raises_exception_on_invalid_retention(self):
+        with pytest.raises(CommandError):
+            call_command("purgemediationrequests", "--retention", "CLOSED=30")
+
+    def test_anonymizemediationrequests_reports_the_anonymized_requests(self):
+        self._create()
+        MediationRequest.objects.update(status="cl", complainant=None)
+        out = StringIO()
+        call_command("anonymizemediationrequests", stdout=out)
+        assert "2 mediation requests anonymized" in out.getvalue()
+        assert "requests/s" in out.getvalue()
+        assert not MediationRequest.objects.exclude(email="").exists()
+
+    def test_benchmarkserializers_compares_both_serializations(self):
+        self._create()
+        out = StringIO()
+        call_command("benchmarkserializers", "--repeat", "1", stdout=out)
+        assert "2 mediation requests" in out.getvalue()
+        assert "compiled:" in out.getvalue()
+
+    def test_benchmarkserializers_raises_exception_when_called_on_empty_database(
+        self,
+    ):
+        with pytest.raises(CommandError):
+            call_command("benchmarkserializers")
+
+    def test_exportmediationrequests_writes_ndjson_on_stdout(self):
+        self._create()
+        out = StringIO()
+        call_command("exportmediationrequests", "--format", "ndjson", stdout=out)
+        items = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(items) == MediationRequest.objects.count()
+        assert {item["id"] for item in items} == {
+            str(uuid)
+            for uuid in MediationRequest.objects.values_list("uuid", flat=True)
+        }
+        assert all("trace_reports" in item for item in items)
+
+    def test_exportmediationrequests_writes_csv_in_a_file(self, tmp_path):
+        self._create()
+        output = tmp_path / "export.csv"
+        call_command("exportmediationrequests", "--output", str(output))
+        with open(output, newline="") as export:
+            rows = list(csv.DictReader(export))
+        assert {row["id"] for row in rows} == {
+            str(uuid)
+            for uuid in MediationRequest.objects.values_list("uuid", flat=True)
+        }
+
+    def test_benchmarkconcurrency_submits_to_a_running_server(
+        self, live_server, settings
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        out = StringIO()
+        call_command(
+            "benchmarkconcurrency",
+            live_server.url,
+            "--clients",
+            "3",
+            "--upload-time",
+            "0.2",
+            "--probes",
+            "2",
+            stdout=out,
+        )
+        assert "3 created, 0 failed" in out.getvalue()
+        assert "2 configuration reads meanwhile" in out.getvalue()
+        assert MediationRequest.objects.count() == 3
+
+    def test_benchmarkconcurrency_raises_exception_on_invalid_url(self):
+        with pytest.raises(CommandError):
+            call_command("benchmarkconcurrency", "localhost")
+
+    def test_generatemediations_reports_the_generated_rows(self):
+        out = StringIO()
+        call_command(
+            "generatemediations", "50", "--users", "5", "--chunk-size", "20", stdout=out
+        )
+        assert "5 users, 50 mediation requests" in out.getvalue()
+        assert "requests/s" in out.getvalue()
+        assert MediationRequest.objects.count() == 50
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestExporter = get_class("mediations.exports", "MediationRequestExporter")
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+TraceReportFactory = get_class(
+    "mediations.trace_report.tests.factories", "TraceReportFactory"
+)
+
+
+class TestMediationRequestExporter:
+    def _create(self):
+        mediation_requests = MediationRequestFactory.create_batch(5)
+        TraceReportFactory.create_batch(
+            2, mediation_request=mediation_requests[0], comment="First"
+        )
+        TraceReportFactory(mediation_request=mediation_requests[3], comment="Other")
+        return mediation_requests
+
+    def test_ndjson_lists_the_trace_reports_of_each_mediation_request(self):
+        mediation_requests = self._create()
+        exporter = MediationRequestExporter(
+            MediationRequest.objects.order_by("id"), chunk_size=2
+        )
+        with CaptureQueriesContext(connection) as queries:
+            items = [json.loads(line) for line in exporter.iter_ndjson()]
+        assert [item["id"] for item in items] == [
+            str(mediation_request.uuid) for mediation_request in mediation_requests
+        ]
+        assert [len(item["trace_reports"]) for item in items] == [2, 0, 0, 1, 0]
+        assert items[0]["trace_reports"][0]["comment"] == "First"
+        assert items[3]["trace_reports"][0]["mediation_request"] == items[3]["id"]
+        # The trace reports are read once per chunk of mediation requests.
+        trace_report_queries = [
+            query for query in queries if "tracereport" in query["sql"]
+        ]
+        assert len(trace_report_queries) == 3
+
+    def test_csv_has_one_row_per_trace_report(self):
+        mediation_requests = self._create()
+        exporter = MediationRequestExporter(
+            MediationRequest.objects.order_by("id"), fields=["id", "status"]
+        )
+        rows = list(csv.DictReader(io.StringIO("".join(exporter.iter_csv()))))
+        assert len(rows) == 6
+        assert list(rows[0])[:3] == ["id", "status", "trace_report_id"]
+        assert [row["trace_report_comment"] for row in rows[:2]] == ["First"] * 2
+        assert rows[2]["id"] == str(mediation_requests[1].uuid)
+        assert rows[2]["trace_report_id"] == ""
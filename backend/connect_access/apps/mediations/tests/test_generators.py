@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db.models import F, Sum
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+StoredFile = get_model("uploads", "StoredFile")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+MediationDataGenerator = get_class("mediations.generators", "MediationDataGenerator")
+
+
+def get_values(queryset, *fields):
+    return list(queryset.order_by("id").values_list(*fields))
+
+
+class TestMediationDataGenerator:
+    def test_generate_creates_the_requests_by_chunks(self):
+        created = MediationDataGenerator(users=20, chunk_size=30).generate(100)
+        assert created["users"] == User.objects.count() == 20
+        assert created["mediation_requests"] == MediationRequest.objects.count() == 100
+        assert created["trace_reports"] == TraceReport.objects.count()
+        assert created["trace_reports"] > 0
+
+    def test_generate_spreads_the_values_of_the_choices(self):
+        MediationDataGenerator(users=20, days=1000).generate(500)
+        statuses = set(MediationRequest.objects.values_list("status", flat=True))
+        assert statuses == set(MediationRequestStatus.values)
+        assert MediationRequest.objects.filter(complainant=None).exists()
+        assert MediationRequest.objects.exclude(complainant=None).exists()
+
+    def test_generate_keeps_the_dates_of_the_requests(self):
+        MediationDataGenerator(users=5, days=365).generate(50)
+        assert not MediationRequest.objects.filter(
+            modified__lt=F("request_date")
+        ).exists()
+        assert not TraceReport.objects.filter(
+            contact_date__lt=F("mediation_request__request_date")
+        ).exists()
+        dates = MediationRequest.objects.values_list("request_date", flat=True)
+        assert (max(dates) - min(dates)).days > 30
+
+    def test_generate_removes_the_personal_information_of_closed_anonymous_requests(
+        self,
+    ):
+        MediationDataGenerator(users=5, anonymous=1, days=2000).generate(100)
+        closed = MediationRequest.objects.filter(
+            status__in=[
+                MediationRequestStatus.CLOTURED,
+                MediationRequestStatus.MEDIATION_FAILED,
+            ]
+        )
+        assert closed.exists()
+        assert not closed.exclude(email="").exists()
+
+    def test_generate_depends_only_on_the_seed(self):
+        fields = ("status", "urgency", "browser", "assistive_technology_used")
+        MediationDataGenerator(users=5, chunk_size=10, seed=1).generate(40)
+        first = get_values(MediationRequest.objects, *fields)
+        MediationRequest.objects.all().delete()
+        MediationDataGenerator(users=5, chunk_size=10, seed=1).generate(40)
+        assert get_values(MediationRequest.objects, *fields) == first
+
+    def test_generate_counts_the_references_of_the_attached_files(
+        self, settings, tmp_path
+    ):
+        settings.MEDIA_ROOT = str(tmp_path)
+        MediationDataGenerator(users=5, attachments=0.5).generate(50)
+        references = MediationRequest.objects.exclude(attached_file="").count()
+        references += TraceReport.objects.exclude(attached_file="").count()
+        assert references > 0
+        assert (
+            StoredFile.objects.aggregate(references=Sum("references"))["references"]
+            == references
+        )
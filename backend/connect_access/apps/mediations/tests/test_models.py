@@ -1,7 +1,7 @@
+import hashlib
 import os.path
 
 import pytest
-from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from connect_access.core.loading import get_class, get_model
@@ -9,6 +9,7 @@ from connect_access.core.loading import get_class, get_model
 pytestmark = pytest.mark.django_db
 
 MediationRequest = get_model("mediations", "MediationRequest")
+StoredFile = get_model("uploads", "StoredFile")
 MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
 MediationRequestFactory = get_class(
     "mediations.tests.factories", "MediationRequestFactory"
@@ -22,53 +23,85 @@ class TestMediationModels:
         mediation_request = MediationRequestFactory()
         assert str(mediation_request.uuid) == str(mediation_request)
 
-    def test_attached_file_with_complainant_is_stored_in_correct_path(self):
-        user = UserFactory()
+    def test_attached_file_is_stored_after_its_content(self):
         attached_file = SimpleUploadedFile(
-            "test_file.png",
+            "test_file.PNG",
             b"file content",
             content_type="multipart/form-data",
         )
         mediation_request = MediationRequestFactory(
-            complainant=user,
+            complainant=UserFactory(),
             attached_file=attached_file,
         )
+        digest = hashlib.sha256(b"file content").hexdigest()
         assert (
-            mediation_request.attached_file.name
-            == f"further_info/user_{user.uuid}/test_file.png"
+            mediation_request.attached_file.name == f"sha256/{digest[:2]}/{digest}.png"
         )
 
-    def test_attached_file_without_complainant_is_stored_in_correct_path(self):
-        attached_file = SimpleUploadedFile(
-            "test_file.png",
-            b"file content",
-            content_type="multipart/form-data",
-        )
-        mediation_request = MediationRequestFactory(
-            complainant=None,
-            attached_file=attached_file,
-        )
-        assert (
-            mediation_request.attached_file.name
-            == "further_info/anonymous/test_file.png"
-        )
+    def test_identical_attached_files_are_stored_once(self):
+        mediation_requests = [
+            MediationRequestFactory(
+                complainant=complainant,
+                attached_file=SimpleUploadedFile(
+                    filename,
+                    b"same file content",
+                    content_type="multipart/form-data",
+                ),
+            )
+            for complainant, filename in ((UserFactory(), "a.png"), (None, "b.png"))
+        ]
+        name = mediation_requests[0].attached_file.name
+        assert mediation_requests[1].attached_file.name == name
+        assert StoredFile.objects.get(name=name).references == 2
 
-    def test_attached_file_is_removed_when_removing_from_db(self):
-        attached_file = SimpleUploadedFile(
-            "test_file.png",
-            b"file content",
-            content_type="multipart/form-data",
-        )
-        mediation_request = MediationRequestFactory(
-            complainant=None, attached_file=attached_file
+    def test_attached_file_is_removed_when_removing_from_db(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        mediation_requests = [
+            MediationRequestFactory(
+                complainant=None,
+                attached_file=SimpleUploadedFile(
+                    "test_file.png",
+                    b"file content",
+                    content_type="multipart/form-data",
+                ),
+            )
+            for _index in range(2)
+        ]
+        path = mediation_requests[0].attached_file.path
+        assert os.path.isfile(path)
+        with django_capture_on_commit_callbacks(execute=True):
+            mediation_requests[0].attached_file = None
+            mediation_requests[0].save()
+        assert os.path.isfile(path)
+        with django_capture_on_commit_callbacks(execute=True):
+            mediation_requests[1].delete()
+        assert not os.path.isfile(path)
+
+    def test_saving_a_mediation_request_does_not_read_it_again(
+        self, django_assert_num_queries
+    ):
+        mediation_request = MediationRequest.objects.get(
+            pk=MediationRequestFactory().pk
         )
-        assert os.path.isfile(
-            f"{settings.MEDIA_ROOT}/further_info/anonymous/test_file.png"
+        mediation_request.first_name = "Jane"
+        with django_assert_num_queries(1):
+            mediation_request.save()
+
+    def test_replacing_a_deferred_attached_file_releases_the_original(self):
+        original = MediationRequestFactory(
+            attached_file=SimpleUploadedFile("original.png", b"original content")
+        ).attached_file.name
+        mediation_request = MediationRequest.objects.only("uuid").get(
+            attached_file=original
         )
-        mediation_request.attached_file = None
+        mediation_request.attached_file = SimpleUploadedFile("new.png", b"new content")
         mediation_request.save()
-        assert not os.path.isfile(
-            f"{settings.MEDIA_ROOT}/further_info/anonymous/test_file.png"
+        assert not StoredFile.objects.filter(name=original).exists()
+        assert (
+            StoredFile.objects.get(name=mediation_request.attached_file.name).references
+            == 1
         )
 
     @pytest.mark.usefixtures("_set_default_language")
@@ -99,3 +132,36 @@ class TestMediationModels:
         assert not mediation_request.last_name
         assert not mediation_request.email
         assert not mediation_request.phone_number
+
+    @pytest.mark.parametrize(
+        "closing_status",
+        [
+            MediationRequestStatus.CLOTURED.value,
+            MediationRequestStatus.MEDIATION_FAILED.value,
+        ],
+    )
+    def test_transition_removes_personal_information_of_closed_anonymous_requests(
+        self,
+        closing_status,
+    ):
+        anonymous = MediationRequestFactory(complainant=None)
+        owned = MediationRequestFactory(complainant=UserFactory())
+        modified = anonymous.modified
+        assert MediationRequest.objects.all().transition(closing_status) == 2
+        anonymous.refresh_from_db()
+        owned.refresh_from_db()
+        assert anonymous.status == owned.status == closing_status
+        assert anonymous.modified > modified
+        assert not anonymous.first_name
+        assert not anonymous.last_name
+        assert not anonymous.email
+        assert not anonymous.phone_number
+        assert owned.first_name
+        assert owned.email
+
+    def test_transition_keeps_personal_information_of_open_requests(self):
+        mediation_request = MediationRequestFactory(complainant=None)
+        MediationRequest.objects.all().transition(MediationRequestStatus.FILED.value)
+        mediation_request.refresh_from_db()
+        assert mediation_request.status == MediationRequestStatus.FILED.value
+        assert mediation_request.email
@@ -0,0 +1,178 @@
+import datetime
+import random
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from connect_access.core.loading import get_class, get_model
+from connect_access.tests.plans import AssertIndexedQueries
+
+from ..trace_report.tests.utils import _get_trace_report_absolute_url
+from .utils import _get_mediation_request_absolute_url
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+MediationRequestViewSet = get_class("mediations.api", "MediationRequestViewSet")
+TraceReportViewSet = get_class("mediations.trace_report.api", "TraceReportViewSet")
+
+USERS = 1000
+MEDIATION_REQUESTS = 10000
+TRACE_REPORTS_PER_REQUEST = 2
+LARGE_TABLES = (MediationRequest._meta.db_table, TraceReport._meta.db_table)
+
+
+@pytest.fixture(scope="module")
+def large_dataset(django_db_setup, django_db_blocker):
+    """Tables large enough for the planner to choose the production plans.
+
+    Created once for the module, in a transaction rolled back at its end, the
+    tests running in savepoints.
+
+    Yields:
+        The created users and mediation requests.
+
+    """
+    now = timezone.now()
+    generator = random.Random(0)
+    with django_db_blocker.unblock(), transaction.atomic():
+        users = User.objects.bulk_create(
+            User(email=f"user{index}@example.com", first_name=f"User {index}")
+            for index in range(USERS)
+        )
+        mediation_requests = MediationRequest.objects.bulk_create(
+            (
+                MediationRequest(
+                    complainant=generator.choice(users + [None]),
+                    request_date=now - datetime.timedelta(minutes=index),
+                    status=generator.choice(MediationRequestStatus.values),
+                    first_name=f"Complainant {index}",
+                    issue_description="Generated for the query plan tests.",
+                )
+                for index in range(MEDIATION_REQUESTS)
+            ),
+            batch_size=2000,
+        )
+        TraceReport.objects.bulk_create(
+            (
+                TraceReport(
+                    mediation_request=mediation_request,
+                    contact_date=mediation_request.request_date
+                    + datetime.timedelta(days=day),
+                )
+                for mediation_request in mediation_requests
+                for day in range(TRACE_REPORTS_PER_REQUEST)
+            ),
+            batch_size=2000,
+        )
+        # Modified along the requests, for the changes since a date.
+        MediationRequest.objects.update(modified=F("request_date"))
+        with connection.cursor() as cursor:
+            for table in LARGE_TABLES + (User._meta.db_table,):
+                cursor.execute(f'ANALYZE "{table}"')
+        yield {"users": users, "mediation_requests": mediation_requests}
+        transaction.set_rollback(True)
+
+
+def get_as(user, url, viewset, actions, **kwargs):
+    request = APIRequestFactory().get(url)
+    force_authenticate(request, user=user)
+    with AssertIndexedQueries(LARGE_TABLES):
+        response = viewset.as_view(actions)(request, **kwargs)
+    assert response.status_code == 200
+    return response
+
+
+@pytest.fixture()
+def admin(large_dataset):
+    return User.objects.create(
+        email="admin@example.com", first_name="Admin", is_staff=True, is_admin=True
+    )
+
+
+class TestQueryPlans:
+    """The queries of the API are index scans, without sorting the large tables.
+
+    The relevance search is left out, its ranking sorting the matches.
+
+    """
+
+    def test_mediation_requests_pages(self, admin):
+        response = get_as(
+            admin,
+            f"{_get_mediation_request_absolute_url('list')}?page_size=50",
+            MediationRequestViewSet,
+            {"get": "list"},
+        )
+        get_as(admin, response.data["next"], MediationRequestViewSet, {"get": "list"})
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "status=MEDIATING",
+            "request_date_after=2020-01-01T00:00:00Z",
+            "organization_name=Koena",
+        ],
+    )
+    def test_filtered_mediation_requests(self, admin, query):
+        get_as(
+            admin,
+            f"{_get_mediation_request_absolute_url('list')}?{query}&page_size=50",
+            MediationRequestViewSet,
+            {"get": "list"},
+        )
+
+    def test_mediation_requests_of_a_complainant(self, admin, large_dataset):
+        complainant = large_dataset["users"][0]
+        get_as(
+            admin,
+            f"{_get_mediation_request_absolute_url('list')}?complainant={complainant.uuid}&page_size=50",
+            MediationRequestViewSet,
+            {"get": "list"},
+        )
+        get_as(
+            complainant,
+            _get_mediation_request_absolute_url("user"),
+            MediationRequestViewSet,
+            {"get": "user"},
+        )
+
+    def test_mediation_request_changes(self, admin):
+        since = (timezone.now() - datetime.timedelta(minutes=30)).isoformat()
+        response = get_as(
+            admin,
+            f"{_get_mediation_request_absolute_url('list')}?since={since.replace('+', '%2B')}",
+            MediationRequestViewSet,
+            {"get": "list"},
+        )
+        assert response.data["changed"]
+
+    def test_mediation_request(self, admin, large_dataset):
+        mediation_request = large_dataset["mediation_requests"][100]
+        get_as(
+            admin,
+            _get_mediation_request_absolute_url("detail", mediation_request.uuid),
+            MediationRequestViewSet,
+            {"get": "retrieve"},
+            uuid=mediation_request.uuid,
+        )
+
+    def test_trace_reports_of_a_mediation_request(self, admin, large_dataset):
+        mediation_request = large_dataset["mediation_requests"][100]
+        response = get_as(
+            admin,
+            _get_trace_report_absolute_url(
+                "by-mediation-request", mediation_request.uuid
+            ),
+            TraceReportViewSet,
+            {"get": "by_mediation_request"},
+            mediation_request_id=mediation_request.uuid,
+        )
+        assert len(response.data) == TRACE_REPORTS_PER_REQUEST
@@ -0,0 +1,159 @@
+import datetime
+import io
+import json
+import threading
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_classes, get_model
+
+pytestmark = pytest.mark.django_db
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+Tombstone = get_model("mediations", "Tombstone")
+StoredFile = get_model("uploads", "StoredFile")
+FileDeletion = get_model("uploads", "FileDeletion")
+StatisticsStaleDay = get_model("statistics", "StatisticsStaleDay")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+MediationRequestPurger, purge_expired_mediation_requests = get_classes(
+    "mediations.retention",
+    ["MediationRequestPurger", "purge_expired_mediation_requests"],
+)
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+TraceReportFactory = get_class(
+    "mediations.trace_report.tests.factories", "TraceReportFactory"
+)
+
+
+def make_old(mediation_requests, days):
+    MediationRequest.objects.filter(
+        pk__in=[mediation_request.pk for mediation_request in mediation_requests]
+    ).update(modified=timezone.now() - datetime.timedelta(days=days))
+
+
+class TestMediationRequestPurger:
+    def test_purge_deletes_by_batches_with_the_deletion_side_effects(self):
+        mediation_requests = MediationRequestFactory.create_batch(5)
+        trace_report = TraceReportFactory(mediation_request=mediation_requests[0])
+        kept = MediationRequestFactory()
+        shared_name = kept.attached_file.name
+        own = MediationRequestFactory(
+            attached_file=SimpleUploadedFile("own.txt", b"own content")
+        )
+        deleted = mediation_requests + [own]
+        assert (
+            MediationRequestPurger(batch_size=2).purge(
+                MediationRequest.objects.exclude(pk=kept.pk)
+            )
+            == 6
+        )
+        assert list(MediationRequest.objects.all()) == [kept]
+        assert not TraceReport.objects.exists()
+        assert set(
+            Tombstone.objects.filter(model_name="mediationrequest").values_list(
+                "uuid", flat=True
+            )
+        ) == {mediation_request.uuid for mediation_request in deleted}
+        assert Tombstone.objects.filter(
+            model_name="tracereport", uuid=trace_report.uuid
+        ).exists()
+        assert StatisticsStaleDay.objects.filter(
+            day=timezone.localdate(kept.request_date)
+        ).exists()
+        assert StoredFile.objects.get(name=shared_name).references == 1
+        deleted_names = set(FileDeletion.objects.values_list("name", flat=True))
+        assert own.attached_file.name in deleted_names
+        assert shared_name not in deleted_names
+
+    def test_purge_archives_the_requests_before_deleting_them(self):
+        mediation_requests = MediationRequestFactory.create_batch(3)
+        TraceReportFactory(mediation_request=mediation_requests[1], comment="Kept")
+        archive = io.StringIO()
+        assert (
+            MediationRequestPurger(batch_size=2, archive=archive).purge(
+                MediationRequest.objects.all()
+            )
+            == 3
+        )
+        items = [json.loads(line) for line in archive.getvalue().splitlines()]
+        assert [item["id"] for item in items] == [
+            str(mediation_request.uuid) for mediation_request in mediation_requests
+        ]
+        assert items[1]["trace_reports"][0]["comment"] == "Kept"
+
+    def test_purge_resumes_from_the_remaining_requests(self):
+        mediation_requests = MediationRequestFactory.create_batch(4)
+        MediationRequest.objects.filter(pk__lte=mediation_requests[1].pk).delete()
+        with CaptureQueriesContext(connection) as queries:
+            assert (
+                MediationRequestPurger(batch_size=2).purge(
+                    MediationRequest.objects.all()
+                )
+                == 2
+            )
+        # The bounds are the ones of the remaining requests: a single batch.
+        assert sum("FOR UPDATE SKIP LOCKED" in query["sql"] for query in queries) == 1
+
+    def test_purge_fails_on_a_relation_it_does_not_delete(self, monkeypatch):
+        mediation_request = MediationRequestFactory()
+        monkeypatch.setattr(MediationRequestPurger, "deleted_relations", set())
+        with pytest.raises(ImproperlyConfigured):
+            MediationRequestPurger().purge(MediationRequest.objects.all())
+        assert MediationRequest.objects.get() == mediation_request
+
+    @pytest.mark.django_db(transaction=True)
+    def test_purge_counts_the_requests_locked_by_another_transaction(self):
+        locked, purged = MediationRequestFactory.create_batch(2)
+        is_locked = threading.Event()
+        release = threading.Event()
+
+        def lock():
+            with transaction.atomic():
+                MediationRequest.objects.select_for_update().get(pk=locked.pk)
+                is_locked.set()
+                release.wait(10)
+            connection.close()
+
+        thread = threading.Thread(target=lock)
+        thread.start()
+        try:
+            assert is_locked.wait(10)
+            purger = MediationRequestPurger()
+            assert purger.purge(MediationRequest.objects.all()) == 1
+            assert purger.skipped == 1
+        finally:
+            release.set()
+            thread.join()
+        assert MediationRequest.objects.get() == locked
+
+    def test_purge_expired_mediation_requests_applies_the_retention_of_the_status(
+        self, settings, tmp_path
+    ):
+        settings.MEDIATION_RETENTION_DAYS = {"CLOTURED": 30, "MEDIATION_FAILED": 10}
+        settings.MEDIATION_RETENTION_ARCHIVED_STATUSES = ["MEDIATION_FAILED"]
+        settings.MEDIATION_RETENTION_ARCHIVE_ROOT = str(tmp_path / "archives")
+        closed = MediationRequestFactory(status=MediationRequestStatus.CLOTURED)
+        recently_closed = MediationRequestFactory(
+            status=MediationRequestStatus.CLOTURED
+        )
+        failed = MediationRequestFactory(status=MediationRequestStatus.MEDIATION_FAILED)
+        pending = MediationRequestFactory(status=MediationRequestStatus.PENDING)
+        make_old([closed, failed, pending], 40)
+        make_old([recently_closed], 20)
+        assert purge_expired_mediation_requests() == {
+            MediationRequestStatus.CLOTURED: 1,
+            MediationRequestStatus.MEDIATION_FAILED: 1,
+        }
+        assert set(MediationRequest.objects.all()) == {recently_closed, pending}
+        (archive,) = (tmp_path / "archives").iterdir()
+        assert [
+            json.loads(line)["id"] for line in archive.read_text().splitlines()
+        ] == [str(failed.uuid)]
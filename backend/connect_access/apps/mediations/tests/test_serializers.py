@@ -1,11 +1,14 @@
 from operator import itemgetter
 
 import pytest
+from asgiref.sync import async_to_sync
 from dateutil.parser import parse
 from pytest_django.asserts import assertContains
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory
 
 from connect_access.core.loading import get_class, get_classes, get_model
+from connect_access.models.serializers import PLAN_CACHE_SIZE, _get_plan
 
 from .utils import _execute_mediation_request_list, _get_mediation_request_absolute_url
 
@@ -17,6 +20,9 @@ MediationRequestFactory = get_class(
 )
 MediationRequestViewSet = get_class("mediations.api", "MediationRequestViewSet")
 MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestSerializer = get_class(
+    "mediations.serializers", "MediationRequestSerializer"
+)
 
 (
     AssistiveTechnology,
@@ -186,7 +192,9 @@ class TestSerializers:
             url, data=request_data, format="multipart"
         )
         authenticate.authenticate_request_as_admin(request_create)
-        MediationRequestViewSet.as_view({"post": "create"})(request_create)
+        async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+            request_create
+        )
         mediation_request = MediationRequest.objects.first()
         assert str(mediation_request.complainant.uuid) in request_data.values()
         assert (
@@ -261,7 +269,9 @@ class TestSerializers:
             url, data=request_data, format="multipart"
         )
         authenticate.authenticate_request_as_admin(request_create)
-        MediationRequestViewSet.as_view({"post": "create"})(request_create)
+        async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+            request_create
+        )
         mediation_request = MediationRequest.objects.first()
         assert mediation_request.browser_used is None
         assert mediation_request.mobile_app_used is None
@@ -286,7 +296,9 @@ class TestSerializers:
             url, data=request_data, format="multipart"
         )
         authenticate.authenticate_request_as_admin(request_create)
-        response = MediationRequestViewSet.as_view({"post": "create"})(request_create)
+        response = async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+            request_create
+        )
         assert response.status_code == 400
 
     def test_mediation_request_replies_with_error_if_mandatory_email_is_not_provided(
@@ -305,7 +317,9 @@ class TestSerializers:
             url, data=request_data, format="multipart"
         )
         authenticate.authenticate_request_as_admin(request_create)
-        response = MediationRequestViewSet.as_view({"post": "create"})(request_create)
+        response = async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+            request_create
+        )
         assert response.status_code == 400
         assert "email" in response.data
 
@@ -328,10 +342,44 @@ class TestSerializers:
             url, data=request_data, format="multipart"
         )
         authenticate.authenticate_request_as_admin(request_create)
-        MediationRequestViewSet.as_view({"post": "create"})(request_create)
+        async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+            request_create
+        )
         mediation_request = MediationRequest.objects.first()
         assert mediation_request.assistive_technology_used == []
         assert mediation_request.browser == ""
         assert mediation_request.urgency == ""
         assert mediation_request.inaccessibility_level == ""
         assert mediation_request.mobile_app_platform == ""
+
+    @pytest.mark.parametrize("fields", [None, ["id", "status", "attached_file"]])
+    def test_mediation_request_compiled_serialization_matches_the_serializer(
+        self, fields
+    ):
+        MediationRequestFactory()
+        MediationRequestFactory(
+            complainant=None,
+            urgency="",
+            browser_used=None,
+            did_tell_organization=False,
+            assistive_technology_used=[],
+            attached_file="",
+        )
+        queryset = MediationRequest.objects.order_by("-request_date", "-id")
+        context = {
+            "request": APIRequestFactory().get(
+                _get_mediation_request_absolute_url("list")
+            )
+        }
+        plan = MediationRequestSerializer.get_plan(fields)
+        compiled = plan.serialize(queryset.values(*plan.paths), context)
+        serializer = MediationRequestSerializer(
+            queryset, many=True, context=context, fields=fields
+        )
+        assert JSONRenderer().render(compiled) == JSONRenderer().render(serializer.data)
+
+    def test_mediation_request_plans_are_cached_by_sparse_fieldset(self):
+        plan = MediationRequestSerializer.get_plan(["status", "id"])
+        assert MediationRequestSerializer.get_plan(["id", "status", "id"]) is plan
+        assert MediationRequestSerializer.get_plan(["id", "status", "unknown"]) is plan
+        assert _get_plan.cache_info().maxsize == PLAN_CACHE_SIZE
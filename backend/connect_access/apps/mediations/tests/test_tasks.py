@@ -0,0 +1,126 @@
+import datetime
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+MediationRequest = get_model("mediations", "MediationRequest")
+Tombstone = get_model("mediations", "Tombstone")
+send_mediators_digest = get_class("mediations.tasks", "send_mediators_digest")
+purge_tombstones = get_class("mediations.tasks", "purge_tombstones")
+purge_mediation_requests = get_class("mediations.tasks", "purge_mediation_requests")
+remove_personal_information = get_class(
+    "mediations.tasks", "remove_personal_information"
+)
+UrgencyLevel = get_class("mediations.choices", "UrgencyLevel")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+UserFactory = get_class("users.tests.factories", "UserFactory")
+
+
+@pytest.mark.usefixtures("_set_default_language")
+class TestSendMediatorsDigest:
+    def test_sends_one_email_ordered_by_urgency(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.MEDIATION_REQUEST_EMAIL = "mediator@mediation.org"
+        not_urgent = MediationRequestFactory(
+            urgency=UrgencyLevel.NOT_URGENT,
+            issue_description="Not urgent issue",
+            awaiting_digest=True,
+        )
+        very_urgent = MediationRequestFactory(
+            urgency=UrgencyLevel.VERY_URGENT,
+            issue_description="Very urgent issue",
+            awaiting_digest=True,
+        )
+        already_notified = MediationRequestFactory(issue_description="Notified issue")
+        with django_capture_on_commit_callbacks(execute=True):
+            assert send_mediators_digest() == 2
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].recipients() == ["mediator@mediation.org"]
+        assert "2 new" in mail.outbox[0].subject
+        body = mail.outbox[0].body
+        assert body.index("Very urgent issue") < body.index("Not urgent issue")
+        assert "Notified issue" not in body
+        for mediation_request in (not_urgent, very_urgent, already_notified):
+            mediation_request.refresh_from_db()
+            assert not mediation_request.awaiting_digest
+
+    def test_subject_of_a_single_request_is_singular(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.MEDIATION_REQUEST_EMAIL = "mediator@mediation.org"
+        MediationRequestFactory(awaiting_digest=True)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert send_mediators_digest() == 1
+        assert "1 new mediation request has" in mail.outbox[0].subject
+
+    def test_sends_nothing_without_new_requests(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.MEDIATION_REQUEST_EMAIL = "mediator@mediation.org"
+        MediationRequestFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            assert send_mediators_digest() == 0
+        assert len(mail.outbox) == 0
+
+
+class TestPurgeTombstones:
+    def test_deletes_the_tombstones_older_than_the_retention(self, settings):
+        settings.API_SYNC_RETENTION = 30
+        old, recent = MediationRequestFactory.create_batch(2)
+        old.delete()
+        Tombstone.objects.update(deleted=timezone.now() - datetime.timedelta(days=31))
+        recent.delete()
+        assert purge_tombstones() == 1
+        assert list(Tombstone.objects.values_list("uuid", flat=True)) == [recent.uuid]
+
+
+class TestPurgeMediationRequests:
+    def test_deletes_the_requests_past_the_retention_of_their_status(self, settings):
+        settings.MEDIATION_RETENTION_DAYS = {"CLOTURED": 30}
+        old, recent = MediationRequestFactory.create_batch(
+            2, status=MediationRequestStatus.CLOTURED
+        )
+        open_request = MediationRequestFactory(status=MediationRequestStatus.MEDIATING)
+        MediationRequest.objects.exclude(pk=recent.pk).update(
+            modified=timezone.now() - datetime.timedelta(days=31)
+        )
+        assert purge_mediation_requests() == 1
+        assert set(MediationRequest.objects.all()) == {recent, open_request}
+
+
+class TestRemovePersonalInformation:
+    def test_anonymizes_the_closed_anonymous_requests_by_batches(self):
+        closed = MediationRequestFactory.create_batch(3, complainant=None)
+        owned = MediationRequestFactory(complainant=UserFactory())
+        open_request = MediationRequestFactory(complainant=None)
+        # Closed without going through save().
+        MediationRequest.objects.exclude(pk=open_request.pk).update(
+            status=MediationRequestStatus.CLOTURED
+        )
+        MediationRequest.objects.filter(pk=open_request.pk).update(
+            status=MediationRequestStatus.MEDIATING
+        )
+        assert remove_personal_information(batch_size=2) == 3
+        for mediation_request in closed:
+            mediation_request.refresh_from_db()
+            assert not mediation_request.first_name
+            assert not mediation_request.last_name
+            assert not mediation_request.email
+            assert not mediation_request.phone_number
+        owned.refresh_from_db()
+        open_request.refresh_from_db()
+        assert owned.email
+        assert open_request.email
+        assert remove_personal_information() == 0
@@ -1,3 +1,4 @@
+from asgiref.sync import async_to_sync
 from rest_framework.test import APIRequestFactory, force_authenticate
 
 from connect_access.core.loading import get_class
@@ -24,7 +25,9 @@ def _execute_mediation_request_create(permission, request_data, auth):
         _get_mediation_request_absolute_url("list"), request_data
     )
     auth.authenticate_if_needed(request, permission)
-    response = MediationRequestViewSet.as_view({"post": "create"})(request)
+    response = async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+        request
+    )
     return {"response": response}
 
 
@@ -104,4 +107,6 @@ def _add_mediation_request(request_data_for_mediation_request, status, auth):
         url, data=request_data_for_mediation_request, format="json"
     )
     auth.authenticate_request_as_admin(request_post)
-    return MediationRequestViewSet.as_view({"post": "create"})(request_post)
+    return async_to_sync(MediationRequestViewSet.as_view({"post": "create"}))(
+        request_post
+    )
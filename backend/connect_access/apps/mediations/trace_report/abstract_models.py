@@ -1,15 +1,23 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils.models import TimeStampedModel
 
+from connect_access.core.loading import get_class
+
 from . import choices
 
+ContentAddressedStorage = get_class("uploads.storages", "ContentAddressedStorage")
+
 
 def trace_directory_path(instance, filename):
-    # file will be uploaded to MEDIA_ROOT/trace_report/mediation_request_<id>/<filename>
+    # Not used anymore, the files being named after their content (see
+    # ContentAddressedStorage), kept for the migrations.
+    # file was uploaded to MEDIA_ROOT/trace_report/mediation_request_<id>/<filename>
     return (
         f"trace_report/mediation_request_{instance.mediation_request.uuid}/{filename}"
     )
@@ -28,6 +36,15 @@ class AbstractTraceReport(TimeStampedModel):
         app_label = "mediations"
         verbose_name = _("Trace report")
         verbose_name_plural = _("Trace reports")
+        indexes = [
+            GinIndex(fields=["search_vector"], name="trace_report_search_idx"),
+            models.Index(fields=["modified", "id"], name="trace_report_modified_idx"),
+            # Serves the trace reports of a mediation request, latest first.
+            models.Index(
+                fields=["mediation_request", "-contact_date", "-id"],
+                name="trace_report_request_date_idx",
+            ),
+        ]
 
     uuid = models.UUIDField(
         verbose_name=_("Public identifier"),
@@ -39,6 +56,8 @@ class AbstractTraceReport(TimeStampedModel):
         "mediations.MediationRequest",
         verbose_name=_("The mediation request to which this trace is linked"),
         on_delete=models.CASCADE,
+        # Indexed by trace_report_request_date_idx.
+        db_index=False,
     )
     contact_date = models.DateTimeField(
         verbose_name=_("Date of the contact"), default=timezone.now
@@ -76,8 +95,10 @@ class AbstractTraceReport(TimeStampedModel):
         blank=True,
     )
     attached_file = models.FileField(
-        verbose_name=_("Attached file"), upload_to=trace_directory_path, blank=True
+        verbose_name=_("Attached file"), storage=ContentAddressedStorage(), blank=True
     )
+    # Maintained by a database trigger, see connect_access.models.search.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self) -> str:
         return str(self.uuid)
@@ -6,11 +6,9 @@ from connect_access.core.loading import get_model
 TraceReport = get_model("mediations", "TraceReport")
 
 
-class TraceReportAdmin(core_admin.ModelAdminMixin, admin.ModelAdmin):  # type: ignore
-    search_fields = (
-        "mediation_request",
-        "comment",
-    )
+class TraceReportAdmin(  # type: ignore
+    core_admin.FullTextSearchAdminMixin, core_admin.ModelAdminMixin, admin.ModelAdmin
+):
     list_display = (
         "mediation_request",
         "contact_date",
@@ -3,22 +3,39 @@ import logging
 from rest_framework import authentication, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser
-from rest_framework.response import Response
 
+from connect_access.core.filters import FullTextSearchFilter
 from connect_access.core.loading import get_model
+from connect_access.core.views import (
+    CompiledListViewMixin,
+    ConditionalGetViewMixin,
+    DeltaSyncViewMixin,
+    SparseFieldsetViewMixin,
+)
 
 from .serializers import TraceReportSerializer
 
 MediationRequest = get_model("mediations", "MediationRequest")
 TraceReport = get_model("mediations", "TraceReport")
+Tombstone = get_model("mediations", "Tombstone")
 
 logger = logging.getLogger(__name__)
 
 
-class TraceReportViewSet(viewsets.ModelViewSet):
+class TraceReportViewSet(
+    DeltaSyncViewMixin,
+    ConditionalGetViewMixin,
+    CompiledListViewMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """Complete viewset to manage trace reports.
 
-    Admins can do everything, anyone else can't do anything.
+    Admins can do everything, anyone else can't do anything. Lists can be
+    searched by relevance with the ``q`` query parameter. Reads can be
+    restricted to some fields (see SparseFieldsetViewMixin), and support
+    conditional requests (see ConditionalGetViewMixin). The list can return
+    only the changes since a date (see DeltaSyncViewMixin).
 
     """
 
@@ -27,6 +44,10 @@ class TraceReportViewSet(viewsets.ModelViewSet):
     authentication_classes = [authentication.TokenAuthentication]
     serializer_class = TraceReportSerializer
     lookup_field = "uuid"
+    filter_backends = [FullTextSearchFilter]
+
+    def get_tombstones(self):
+        return Tombstone.objects.filter(model_name=TraceReport._meta.model_name)
 
     @action(
         detail=False,
@@ -34,8 +55,9 @@ class TraceReportViewSet(viewsets.ModelViewSet):
         url_path="mediation-request/<uuid:mediation_request_id>",
     )
     def by_mediation_request(self, request, mediation_request_id):
-        trace_reports = TraceReport.objects.filter(
-            mediation_request__uuid=mediation_request_id
-        ).order_by("-contact_date")
-        serializer = self.get_serializer(trace_reports, many=True)
-        return Response(serializer.data)
+        trace_reports = self.filter_queryset(
+            TraceReport.objects.filter(
+                mediation_request__uuid=mediation_request_id
+            ).order_by("-contact_date", "-id")
+        )
+        return self.get_list_response(trace_reports)
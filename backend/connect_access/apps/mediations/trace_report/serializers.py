@@ -1,7 +1,11 @@
 from rest_framework import serializers
 
 from connect_access.core.loading import get_model
-from connect_access.models.serializers import EnumSerializerField
+from connect_access.models.serializers import (
+    CompiledSerializerMixin,
+    EnumSerializerField,
+    SparseFieldsetMixin,
+)
 
 from . import choices
 
@@ -9,10 +13,13 @@ TraceReport = get_model("mediations", "TraceReport")
 MediationRequest = get_model("mediations", "MediationRequest")
 
 
-class TraceReportSerializer(serializers.ModelSerializer):
+class TraceReportSerializer(
+    CompiledSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """Serializes all the fields of trace report.
 
-    attached_file is serialized as a string representing its URL.
+    attached_file is serialized as a string representing its URL. Large files
+    are rather uploaded in chunks, and attached (see UploadViewSet).
 
     """
 
@@ -1,6 +1,9 @@
+import datetime
+
 import pytest
+from django.utils import timezone
 from pytest_django.asserts import assertContains, assertNotContains
-from rest_framework.test import APIRequestFactory
+from rest_framework.test import APIRequestFactory, force_authenticate
 
 from connect_access.core.loading import get_class, get_model
 
@@ -13,6 +16,7 @@ TraceReport = get_model("mediations", "TraceReport")
 TraceReportFactory = get_class(
     "mediations.trace_report.tests.factories", "TraceReportFactory"
 )
+AdminUserFactory = get_class("users.tests.factories", "AdminUserFactory")
 MediationRequestFactory = get_class(
     "mediations.tests.factories", "MediationRequestFactory"
 )
@@ -53,3 +57,79 @@ class TestAPI:
         assertContains(response, trace_report1.comment)
         assertContains(response, trace_report2.comment)
         assertNotContains(response, trace_report3.comment)
+
+    def test_trace_reports_by_mediation_request_can_be_searched(self, authenticate):
+        mediation_request = MediationRequestFactory()
+        phone_call = TraceReportFactory(
+            mediation_request=mediation_request,
+            comment="Appel téléphonique avec l'organisation.",
+        )
+        TraceReportFactory(
+            mediation_request=mediation_request, comment="Courriel au plaignant."
+        )
+        request = APIRequestFactory().get(
+            _get_trace_report_absolute_url(
+                "by-mediation-request", mediation_request.uuid
+            ),
+            {"q": "appels"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = TraceReportViewSet.as_view({"get": "by_mediation_request"})(
+            request, mediation_request_id=mediation_request.uuid
+        )
+        assert [result["id"] for result in response.data] == [phone_call.uuid]
+
+    def test_trace_reports_list_returns_only_requested_fields(self, authenticate):
+        trace_report = TraceReportFactory()
+        request = APIRequestFactory().get(
+            _get_trace_report_absolute_url("list"),
+            {"fields": "id,mediation_request"},
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = TraceReportViewSet.as_view({"get": "list"})(request)
+        assert response.data == [
+            {
+                "id": trace_report.uuid,
+                "mediation_request": trace_report.mediation_request.uuid,
+            }
+        ]
+
+    def test_trace_reports_by_mediation_request_is_not_modified_when_etag_matches(self):
+        admin = AdminUserFactory()
+        trace_report = TraceReportFactory()
+        mediation_request_id = trace_report.mediation_request.uuid
+        url = _get_trace_report_absolute_url(
+            "by-mediation-request", mediation_request_id
+        )
+        view = TraceReportViewSet.as_view({"get": "by_mediation_request"})
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=admin)
+        response = view(request, mediation_request_id=mediation_request_id)
+        etag = response["ETag"]
+        request = APIRequestFactory().get(url, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=admin)
+        assert (
+            view(request, mediation_request_id=mediation_request_id).status_code == 304
+        )
+        TraceReportFactory(mediation_request=trace_report.mediation_request)
+        request = APIRequestFactory().get(url, HTTP_IF_NONE_MATCH=etag)
+        force_authenticate(request, user=admin)
+        assert (
+            view(request, mediation_request_id=mediation_request_id).status_code == 200
+        )
+
+    def test_trace_reports_list_since_returns_the_changes(self, authenticate):
+        old = TraceReportFactory()
+        TraceReport.objects.update(modified=timezone.now() - datetime.timedelta(days=1))
+        since = timezone.now() - datetime.timedelta(hours=1)
+        added = TraceReportFactory()
+        # Deleting the mediation request deletes its trace reports.
+        old_uuid = str(old.uuid)
+        old.mediation_request.delete()
+        request = APIRequestFactory().get(
+            _get_trace_report_absolute_url("list"), {"since": since.isoformat()}
+        )
+        authenticate.authenticate_request_as_admin(request)
+        response = TraceReportViewSet.as_view({"get": "list"})(request)
+        assert [item["id"] for item in response.data["changed"]] == [added.uuid]
+        assert response.data["deleted"] == [old_uuid]
@@ -1,7 +1,7 @@
+import hashlib
 import os
 
 import pytest
-from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from connect_access.core.loading import get_class
@@ -22,38 +22,42 @@ class TestModels:
         trace_report = TraceReportFactory()
         assert str(trace_report.uuid) == str(trace_report)
 
-    def test_trace_report_attached_file_is_stored_in_correct_path(self):
-        mediation_request = MediationRequestFactory()
+    def test_trace_report_attached_file_is_stored_after_its_content(self):
         attached_file = SimpleUploadedFile(
             "test_file.png",
             b"file content",
             content_type="multipart/form-data",
         )
-        trace_report = TraceReportFactory(
-            mediation_request=mediation_request,
-            attached_file=attached_file,
-        )
-        assert (
-            trace_report.attached_file.name
-            == f"trace_report/mediation_request_{mediation_request.uuid}/test_file.png"
-        )
-
-    def test_trace_report_attached_file_is_removed_when_removing_from_db(self):
-        mediation_request = MediationRequestFactory()
-        attached_file = SimpleUploadedFile(
-            "test_file.png",
-            b"file content",
-            content_type="multipart/form-data",
+        trace_report = TraceReportFactory(attached_file=attached_file)
+        digest = hashlib.sha256(b"file content").hexdigest()
+        assert trace_report.attached_file.name == f"sha256/{digest[:2]}/{digest}.png"
+
+    def test_trace_report_attached_file_is_removed_when_removing_from_db(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        mediation_request = MediationRequestFactory(
+            attached_file=SimpleUploadedFile(
+                "request_file.png",
+                b"shared file content",
+                content_type="multipart/form-data",
+            )
         )
         trace_report = TraceReportFactory(
             mediation_request=mediation_request,
-            attached_file=attached_file,
-        )
-        assert os.path.isfile(
-            f"{settings.MEDIA_ROOT}/trace_report/mediation_request_{mediation_request.uuid}/test_file.png"
-        )
-        trace_report.attached_file = None
-        trace_report.save()
-        assert not os.path.isfile(
-            f"{settings.MEDIA_ROOT}/trace_report/mediation_request_{mediation_request.uuid}/test_file.png"
+            attached_file=SimpleUploadedFile(
+                "test_file.png",
+                b"shared file content",
+                content_type="multipart/form-data",
+            ),
         )
+        path = trace_report.attached_file.path
+        assert path == mediation_request.attached_file.path
+        with django_capture_on_commit_callbacks(execute=True):
+            trace_report.attached_file = None
+            trace_report.save()
+        assert os.path.isfile(path)
+        with django_capture_on_commit_callbacks(execute=True):
+            mediation_request.attached_file = None
+            mediation_request.save()
+        assert not os.path.isfile(path)
@@ -3,6 +3,7 @@ from operator import itemgetter
 import pytest
 from dateutil.parser import parse
 from pytest_django.asserts import assertContains
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory
 
 from connect_access.core.loading import get_class, get_classes, get_model
@@ -21,6 +22,12 @@ MediationRequestFactory = get_class(
 )
 TraceReportViewSet = get_class("trace_report.api", "TraceReportViewSet")
 TraceReport = get_model("mediations", "TraceReport")
+TraceReportFactory = get_class(
+    "mediations.trace_report.tests.factories", "TraceReportFactory"
+)
+TraceReportSerializer = get_class(
+    "mediations.trace_report.serializers", "TraceReportSerializer"
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -117,3 +124,15 @@ class TestSerializers:
         assertContains(response, trace_report2.recipient_name)
         assertContains(response, trace_report2.comment)
         assert trace_report2.attached_file.url in data[0]["attached_file"]
+
+    def test_trace_report_compiled_serialization_matches_the_serializer(self):
+        TraceReportFactory()
+        TraceReportFactory(trace_type="", attached_file="")
+        queryset = TraceReport.objects.order_by("-contact_date")
+        context = {
+            "request": APIRequestFactory().get(_get_trace_report_absolute_url("list"))
+        }
+        plan = TraceReportSerializer.get_plan()
+        compiled = plan.serialize(queryset.values(*plan.paths), context)
+        serializer = TraceReportSerializer(queryset, many=True, context=context)
+        assert JSONRenderer().render(compiled) == JSONRenderer().render(serializer.data)
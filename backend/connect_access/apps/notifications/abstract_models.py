@@ -0,0 +1,118 @@
+import base64
+
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+from . import choices
+
+
+class AbstractOutboxEmail(TimeStampedModel):
+    """Email waiting to be delivered, or delivered, by the outbox worker.
+
+    Emails are written to the outbox in the transaction of the change that
+    triggers them, and are thus only delivered if this change is committed.
+
+    """
+
+    class Meta:
+        abstract = True
+        app_label = "notifications"
+        verbose_name = _("Outbox email")
+        verbose_name_plural = _("Outbox emails")
+        indexes = [
+            # Serves the worker, only the pending emails being scanned.
+            models.Index(
+                fields=["next_attempt", "id"],
+                name="outbox_pending_idx",
+                condition=models.Q(status=choices.OutboxEmailStatus.PENDING),
+            ),
+            # Serves the worker claiming again the emails of killed workers.
+            models.Index(
+                fields=["modified"],
+                name="outbox_sending_idx",
+                condition=models.Q(status=choices.OutboxEmailStatus.SENDING),
+            ),
+        ]
+
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=2,
+        choices=choices.OutboxEmailStatus.choices,
+        default=choices.OutboxEmailStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name=_("Delivery attempts"), default=0
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name=_("Next delivery attempt"), default=timezone.now
+    )
+    sent_at = models.DateTimeField(
+        verbose_name=_("Sending date"), null=True, blank=True
+    )
+    last_error = models.TextField(verbose_name=_("Last error"), blank=True)
+    subject = models.TextField(verbose_name=_("Subject"))
+    from_email = models.CharField(verbose_name=_("Sender"), max_length=255)
+    to = models.JSONField(verbose_name=_("Recipients"), default=list)
+    cc = models.JSONField(verbose_name=_("Copy recipients"), default=list)
+    bcc = models.JSONField(verbose_name=_("Blind copy recipients"), default=list)
+    reply_to = models.JSONField(verbose_name=_("Reply to"), default=list)
+    headers = models.JSONField(verbose_name=_("Extra headers"), default=dict)
+    body = models.TextField(verbose_name=_("Body"), blank=True)
+    content_subtype = models.CharField(
+        verbose_name=_("Body content type"), max_length=50, default="plain"
+    )
+    # [content, mimetype] lists, and [filename, base64 content, mimetype] lists.
+    alternatives = models.JSONField(verbose_name=_("Alternatives"), default=list)
+    attachments = models.JSONField(verbose_name=_("Attachments"), default=list)
+
+    def __str__(self) -> str:
+        return f"{self.subject} ({', '.join(self.to)})"
+
+    @classmethod
+    def from_message(cls, message):
+        """Build an outbox email from an EmailMessage.
+
+        Attachments have to be (filename, content, mimetype) tuples, MIMEBase
+        attachments are not supported.
+
+        """
+        attachments = []
+        for filename, content, mimetype in message.attachments:
+            if isinstance(content, str):
+                content = content.encode()
+            attachments.append([filename, base64.b64encode(content).decode(), mimetype])
+        return cls(
+            subject=message.subject,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            headers=dict(message.extra_headers),
+            body=message.body,
+            content_subtype=message.content_subtype,
+            alternatives=[list(alt) for alt in getattr(message, "alternatives", [])],
+            attachments=attachments,
+        )
+
+    def to_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            bcc=self.bcc,
+            reply_to=self.reply_to,
+            headers=self.headers,
+            connection=connection,
+        )
+        message.content_subtype = self.content_subtype
+        for content, mimetype in self.alternatives:
+            message.attach_alternative(content, mimetype)
+        for filename, content, mimetype in self.attachments:
+            message.attach(filename, base64.b64decode(content), mimetype)
+        return message
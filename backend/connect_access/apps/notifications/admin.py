@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from connect_access.core.loading import get_model
+
+from .choices import OutboxEmailStatus
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("created", "subject", "status", "attempts", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = [field.name for field in OutboxEmail._meta.fields]
+    actions = ["retry"]
+
+    @admin.action(description=_("Deliver again"))
+    def retry(self, request, queryset):
+        queryset.update(
+            status=OutboxEmailStatus.PENDING, attempts=0, next_attempt=timezone.now()
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
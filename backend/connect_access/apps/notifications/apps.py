@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationsConfig(AppConfig):
+    label = "notifications"
+    name = "connect_access.apps.notifications"
+    verbose_name = _("Notifications")
@@ -0,0 +1,36 @@
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+
+from connect_access.core.loading import get_model
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Email backend writing the emails to the outbox, in the current transaction.
+
+    The emails are delivered by the drain_outbox task, which is queued once
+    the transaction is committed, and run periodically for the retries.
+
+    """
+
+    # Sending only writes to the database (see send_multialternative_mail_on_commit).
+    transactional = True
+
+    def send_messages(self, email_messages):
+        emails = [
+            OutboxEmail.from_message(message)
+            for message in email_messages
+            if message.recipients()
+        ]
+        if not emails:
+            return 0
+        OutboxEmail.objects.bulk_create(emails)
+        transaction.on_commit(_queue_drain)
+        return len(emails)
+
+
+def _queue_drain():
+    from .tasks import drain_outbox
+
+    drain_outbox.delay()
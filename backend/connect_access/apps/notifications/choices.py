@@ -0,0 +1,9 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxEmailStatus(models.TextChoices):
+    PENDING = "pe", _("Pending")
+    SENDING = "sn", _("Sending")
+    SENT = "se", _("Sent")
+    DEAD = "de", _("Dead letter")
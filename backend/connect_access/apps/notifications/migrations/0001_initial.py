@@ -0,0 +1,130 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:30
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pe", "Pending"),
+                            ("sn", "Sending"),
+                            ("se", "Sent"),
+                            ("de", "Dead letter"),
+                        ],
+                        default="pe",
+                        max_length=2,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Delivery attempts"
+                    ),
+                ),
+                (
+                    "next_attempt",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Next delivery attempt",
+                    ),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Sending date"
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Last error")),
+                ("subject", models.TextField(verbose_name="Subject")),
+                ("from_email", models.CharField(max_length=255, verbose_name="Sender")),
+                ("to", models.JSONField(default=list, verbose_name="Recipients")),
+                ("cc", models.JSONField(default=list, verbose_name="Copy recipients")),
+                (
+                    "bcc",
+                    models.JSONField(
+                        default=list, verbose_name="Blind copy recipients"
+                    ),
+                ),
+                ("reply_to", models.JSONField(default=list, verbose_name="Reply to")),
+                (
+                    "headers",
+                    models.JSONField(default=dict, verbose_name="Extra headers"),
+                ),
+                ("body", models.TextField(blank=True, verbose_name="Body")),
+                (
+                    "content_subtype",
+                    models.CharField(
+                        default="plain", max_length=50, verbose_name="Body content type"
+                    ),
+                ),
+                (
+                    "alternatives",
+                    models.JSONField(default=list, verbose_name="Alternatives"),
+                ),
+                (
+                    "attachments",
+                    models.JSONField(default=list, verbose_name="Attachments"),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbox email",
+                "verbose_name_plural": "Outbox emails",
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(
+                condition=models.Q(("status", "pe")),
+                fields=["next_attempt", "id"],
+                name="outbox_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outboxemail",
+            index=models.Index(
+                condition=models.Q(("status", "sn")),
+                fields=["modified"],
+                name="outbox_sending_idx",
+            ),
+        ),
+    ]
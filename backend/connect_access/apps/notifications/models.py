@@ -0,0 +1,9 @@
+from connect_access.apps.notifications.abstract_models import AbstractOutboxEmail
+from connect_access.core.loading import is_model_registered
+from connect_access.models import model_factory
+
+__all__ = []
+
+if not is_model_registered("notifications", "OutboxEmail"):
+    OutboxEmail = model_factory(AbstractOutboxEmail)
+    __all__.append("OutboxEmail")
@@ -0,0 +1,115 @@
+import logging
+import time
+from datetime import timedelta
+from smtplib import SMTPException, SMTPRecipientsRefused
+
+import celery
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from connect_access.core.loading import get_model
+
+from .choices import OutboxEmailStatus
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+
+logger = logging.getLogger(__name__)
+
+
+@celery.shared_task()
+def drain_outbox(batch_size=None):
+    """Deliver the pending emails of the outbox, over one SMTP connection.
+
+    Emails are claimed by batches, locked with SKIP LOCKED so that several
+    workers can drain the outbox concurrently, and marked as sending in a
+    transaction committed before they are delivered, so that no lock is held
+    while the SMTP server is waited for. A run stops claiming emails after
+    OUTBOX_RUN_TIME seconds, the claimed emails it couldn't deliver meanwhile
+    being pending again, and the next run delivering the rest. The emails of a
+    worker killed while delivering them are claimed again once they have been
+    sending for OUTBOX_SENDING_TIMEOUT seconds, and may thus be delivered twice.
+
+    A failed delivery is retried later with an exponential backoff, and the
+    email becomes a dead letter after OUTBOX_MAX_ATTEMPTS attempts, or at once
+    when the error is permanent.
+
+    Returns:
+        The number of delivered emails.
+
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    deadline = time.monotonic() + settings.OUTBOX_RUN_TIME
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    sent = 0
+    try:
+        while time.monotonic() < deadline:
+            emails = _claim(batch_size)
+            for index, email in enumerate(emails):
+                if time.monotonic() >= deadline:
+                    OutboxEmail.objects.filter(
+                        pk__in=[email.pk for email in emails[index:]]
+                    ).update(status=OutboxEmailStatus.PENDING, modified=timezone.now())
+                    return sent
+                sent += _deliver(connection, email)
+                email.save(
+                    update_fields=[
+                        "status",
+                        "attempts",
+                        "next_attempt",
+                        "sent_at",
+                        "last_error",
+                        "modified",
+                    ]
+                )
+            if len(emails) < batch_size:
+                break
+    finally:
+        connection.close()
+    return sent
+
+
+def _claim(batch_size):
+    now = timezone.now()
+    with transaction.atomic():
+        # Left by killed workers, their time limit being shorter.
+        OutboxEmail.objects.filter(
+            status=OutboxEmailStatus.SENDING,
+            modified__lt=now - timedelta(seconds=settings.OUTBOX_SENDING_TIMEOUT),
+        ).update(status=OutboxEmailStatus.PENDING, next_attempt=now, modified=now)
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmailStatus.PENDING, next_attempt__lte=now)
+            .order_by("next_attempt", "id")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=OutboxEmailStatus.SENDING, modified=now
+        )
+    return emails
+
+
+def _deliver(connection, email):
+    email.attempts += 1
+    try:
+        # Opened here, the connection is kept open by send_messages().
+        connection.open()
+        connection.send_messages([email.to_message()])
+    except (SMTPException, OSError, ValueError) as error:
+        # The connection may be broken, the next message reopens it.
+        connection.close()
+        email.last_error = f"{type(error).__name__}: {error}"
+        permanent = isinstance(error, (SMTPRecipientsRefused, ValueError))
+        if permanent or email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmailStatus.DEAD
+            logger.error(f"The email {email.pk} was dead-lettered: {email.last_error}")
+        else:
+            email.status = OutboxEmailStatus.PENDING
+            email.next_attempt = timezone.now() + timedelta(
+                seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+            )
+        return 0
+    email.status = OutboxEmailStatus.SENT
+    email.sent_at = timezone.now()
+    email.last_error = ""
+    return 1
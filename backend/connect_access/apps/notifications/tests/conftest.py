@@ -0,0 +1 @@
+from .fixtures import *  # noqa
@@ -0,0 +1,23 @@
+import pytest
+
+from .smtp import SMTPSink
+
+__all__ = ["smtp_sink"]
+
+
+@pytest.fixture()
+def smtp_sink(settings):
+    """Deliver the emails of the outbox to a local SMTP server.
+
+    Yields:
+        The SMTPSink server.
+
+    """
+    with SMTPSink(refused=["refused@example.com"]) as sink:
+        settings.OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = "127.0.0.1"
+        settings.EMAIL_PORT = sink.port
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_HOST_USER = None
+        settings.EMAIL_HOST_PASSWORD = None
+        yield sink
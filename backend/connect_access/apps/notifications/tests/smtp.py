@@ -0,0 +1,75 @@
+import socketserver
+import threading
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP server keeping the messages it receives.
+
+    Only the commands used by smtplib without TLS nor authentication are
+    understood. Recipients listed in refused are rejected.
+
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, refused=()):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.refused = set(refused)
+        self.connections = 0
+        self.messages = []
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: SMTPSink
+
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        with self.server._lock:
+            self.server.connections += 1
+        self._reply("220 sink")
+        recipients: list[str] = []
+        for line in self.rfile:
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO", "MAIL", "RSET", "NOOP"):
+                if verb == "MAIL" or verb == "RSET":
+                    recipients = []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip(" <>")
+                if address in self.server.refused:
+                    self._reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                for data_line in self.rfile:
+                    if data_line == b".\r\n":
+                        break
+                    data.append(data_line)
+                with self.server._lock:
+                    self.server.messages.append((recipients, b"".join(data)))
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
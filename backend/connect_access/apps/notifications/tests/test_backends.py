@@ -0,0 +1,52 @@
+import pytest
+from django.core import mail
+from django.db import transaction
+
+from connect_access.core.loading import get_model
+from connect_access.core.tasks import send_multialternative_mail_on_commit
+
+pytestmark = pytest.mark.django_db
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+
+
+class TestBackends:
+    @pytest.fixture(autouse=True)
+    def _outbox_backend(self, settings):
+        settings.EMAIL_BACKEND = (
+            "connect_access.apps.notifications.backends.OutboxEmailBackend"
+        )
+
+    def test_outbox_backend_writes_emails_and_queues_delivery_on_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            assert mail.send_mail("Subject", "Body", None, ["to@example.com"]) == 1
+        assert OutboxEmail.objects.get().to == ["to@example.com"]
+        assert len(callbacks) == 1
+
+    def test_outbox_backend_writes_nothing_when_the_transaction_is_rolled_back(self):
+        def send_and_fail():
+            with transaction.atomic():
+                mail.send_mail("Subject", "Body", None, ["to@example.com"])
+                raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            send_and_fail()
+        assert not OutboxEmail.objects.exists()
+
+    def test_multialternative_mail_joins_the_transaction(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            send_multialternative_mail_on_commit(
+                {"id": "12345678"},
+                "Subject",
+                ["to@example.com"],
+                "mediations/emails/user_request_creation",
+            )
+            # Written before the commit, and not by a task.
+            email = OutboxEmail.objects.get()
+        assert "12345678" in email.body
+        assert email.alternatives[0][1] == "text/html"
+        assert len(callbacks) == 1  # the outbox drain
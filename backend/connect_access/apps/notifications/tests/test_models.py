@@ -0,0 +1,30 @@
+import pytest
+from django.core.mail import EmailMultiAlternatives
+
+from connect_access.core.loading import get_model
+
+pytestmark = pytest.mark.django_db
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+
+
+class TestModels:
+    def test_outbox_email_restores_the_message(self):
+        message = EmailMultiAlternatives(
+            "Subject",
+            "Text",
+            "from@example.com",
+            ["to@example.com"],
+            bcc=["bcc@example.com"],
+            headers={"X-Mediation": "1"},
+        )
+        message.attach_alternative("<p>HTML</p>", "text/html")
+        message.attach("report.pdf", b"%PDF-1.4", "application/pdf")
+        email = OutboxEmail.from_message(message)
+        email.save()
+        restored = OutboxEmail.objects.get(pk=email.pk).to_message()
+        assert restored.recipients() == message.recipients()
+        assert restored.extra_headers == message.extra_headers
+        assert restored.alternatives == message.alternatives
+        assert restored.attachments == message.attachments
+        assert restored.message().as_bytes().count(b"%PDF") == 0  # base64 encoded
@@ -0,0 +1,111 @@
+import datetime
+import time
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.smtp import EmailBackend
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+OutboxEmail = get_model("notifications", "OutboxEmail")
+OutboxEmailStatus = get_class("notifications.choices", "OutboxEmailStatus")
+drain_outbox = get_class("notifications.tasks", "drain_outbox")
+
+
+def _add_emails(count, to="to@example.com"):
+    OutboxEmail.objects.bulk_create(
+        OutboxEmail.from_message(
+            mail.EmailMessage(f"Subject {i}", "Body", "from@example.com", [to])
+        )
+        for i in range(count)
+    )
+
+
+class TestTasks:
+    def test_drain_outbox_delivers_batches_over_one_connection(
+        self, smtp_sink, record_property
+    ):
+        _add_emails(250)
+        start = time.perf_counter()
+        assert drain_outbox(batch_size=100) == 250
+        record_property("emails_per_second", 250 / (time.perf_counter() - start))
+        assert smtp_sink.connections == 1
+        assert len(smtp_sink.messages) == 250
+        assert not OutboxEmail.objects.exclude(status=OutboxEmailStatus.SENT).exists()
+
+    def test_drain_outbox_dead_letters_refused_recipients(self, smtp_sink):
+        _add_emails(1, to="refused@example.com")
+        _add_emails(1)
+        assert drain_outbox() == 1
+        dead = OutboxEmail.objects.get(status=OutboxEmailStatus.DEAD)
+        assert dead.to == ["refused@example.com"]
+        assert "SMTPRecipientsRefused" in dead.last_error
+        # The connection is reopened for the next email.
+        assert len(smtp_sink.messages) == 1
+
+    def test_drain_outbox_retries_later_then_dead_letters(self, smtp_sink, settings):
+        # Connections are refused.
+        smtp_sink.shutdown()
+        smtp_sink.server_close()
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        _add_emails(1)
+        assert drain_outbox() == 0
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmailStatus.PENDING
+        assert email.attempts == 1
+        assert "ConnectionRefusedError" in email.last_error
+        # Not due yet.
+        assert drain_outbox() == 0
+        assert OutboxEmail.objects.get().attempts == 1
+        OutboxEmail.objects.update(next_attempt=email.created)
+        drain_outbox()
+        email = OutboxEmail.objects.get()
+        assert email.status == OutboxEmailStatus.DEAD
+        assert email.attempts == 2
+
+    def test_drain_outbox_delivers_an_email_at_most_once(self, smtp_sink, monkeypatch):
+        _add_emails(3)
+        send_messages = EmailBackend.send_messages
+        statuses = []
+
+        def send_and_stop(backend, messages):
+            # The email was claimed in a committed transaction.
+            statuses.append(list(OutboxEmail.objects.values_list("status", flat=True)))
+            if len(statuses) == 2:
+                raise RuntimeError("Worker stopped")
+            return send_messages(backend, messages)
+
+        monkeypatch.setattr(EmailBackend, "send_messages", send_and_stop)
+        with pytest.raises(RuntimeError):
+            drain_outbox()
+        assert set(statuses[0]) == {OutboxEmailStatus.SENDING}
+        assert sorted(OutboxEmail.objects.values_list("status", flat=True)) == sorted(
+            [OutboxEmailStatus.SENT] + [OutboxEmailStatus.SENDING] * 2
+        )
+        # Neither the delivered email nor the interrupted ones are sent again.
+        monkeypatch.setattr(EmailBackend, "send_messages", send_messages)
+        assert drain_outbox() == 0
+        assert len(smtp_sink.messages) == 1
+
+    def test_drain_outbox_claims_again_the_emails_of_killed_workers(
+        self, smtp_sink, settings
+    ):
+        settings.OUTBOX_SENDING_TIMEOUT = 60
+        _add_emails(2)
+        OutboxEmail.objects.update(status=OutboxEmailStatus.SENDING)
+        OutboxEmail.objects.filter(pk=OutboxEmail.objects.earliest("pk").pk).update(
+            modified=timezone.now() - datetime.timedelta(minutes=2)
+        )
+        assert drain_outbox() == 1
+        assert sorted(OutboxEmail.objects.values_list("status", flat=True)) == sorted(
+            [OutboxEmailStatus.SENT, OutboxEmailStatus.SENDING]
+        )
+
+    def test_drain_outbox_stops_claiming_after_its_run_time(self, smtp_sink, settings):
+        settings.OUTBOX_RUN_TIME = 0
+        _add_emails(1)
+        assert drain_outbox() == 0
+        assert OutboxEmail.objects.get().status == OutboxEmailStatus.PENDING
@@ -0,0 +1,77 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from . import choices
+
+
+class AbstractMediationRequestDailyStatistic(models.Model):
+    """Number of mediation requests of a day having a value of a dimension.
+
+    The mediation requests are counted on the day of their request_date. For
+    the assistive technologies, a request is counted once per technology used.
+    Kept up to date by the update_statistics task.
+
+    """
+
+    day = models.DateField(verbose_name=_("Day"))
+    dimension = models.CharField(
+        verbose_name=_("Dimension"),
+        max_length=2,
+        choices=choices.StatisticDimension.choices,
+    )
+    # Value of the field of the dimension, empty when the field is blank.
+    value = models.CharField(verbose_name=_("Value"), max_length=2, blank=True)
+    count = models.PositiveIntegerField(verbose_name=_("Number of requests"))
+
+    class Meta:
+        abstract = True
+        app_label = "statistics"
+        verbose_name = _("Mediation requests daily statistic")
+        verbose_name_plural = _("Mediation requests daily statistics")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "dimension", "value"],
+                name="daily_statistic_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["dimension", "day"], name="daily_statistic_dimension_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.get_dimension_display()} {self.value}: {self.count}"
+
+
+class AbstractStatisticsCheckpoint(models.Model):
+    """Modification date up to which the statistics have been updated."""
+
+    name = models.CharField(verbose_name=_("Name"), max_length=50, unique=True)
+    modified_until = models.DateTimeField(
+        verbose_name=_("Modified until"), null=True, blank=True
+    )
+
+    class Meta:
+        abstract = True
+        app_label = "statistics"
+        verbose_name = _("Statistics checkpoint")
+        verbose_name_plural = _("Statistics checkpoints")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class AbstractStatisticsStaleDay(models.Model):
+    """Day whose statistics have to be computed again, after a deletion."""
+
+    day = models.DateField(verbose_name=_("Day"), unique=True)
+
+    class Meta:
+        abstract = True
+        app_label = "statistics"
+        verbose_name = _("Statistics stale day")
+        verbose_name_plural = _("Statistics stale days")
+
+    def __str__(self) -> str:
+        return str(self.day)
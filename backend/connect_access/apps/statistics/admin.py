@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from connect_access.core.loading import get_model
+
+MediationRequestDailyStatistic = get_model(
+    "statistics", "MediationRequestDailyStatistic"
+)
+
+
+class MediationRequestDailyStatisticAdmin(admin.ModelAdmin):
+    list_display = ("day", "dimension", "value", "count")
+    list_filter = ("dimension",)
+    date_hierarchy = "day"
+    readonly_fields = [
+        field.name for field in MediationRequestDailyStatistic._meta.fields
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(MediationRequestDailyStatistic, MediationRequestDailyStatisticAdmin)
@@ -0,0 +1,124 @@
+from django.db.models import Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncYear
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from connect_access.core.loading import get_classes, get_model
+
+from .choices import StatisticDimension, StatisticPeriod
+
+MediationRequestDailyStatistic = get_model(
+    "statistics", "MediationRequestDailyStatistic"
+)
+AssistiveTechnology, IssueType, MediationRequestStatus, UrgencyLevel = get_classes(
+    "mediations.choices",
+    ["AssistiveTechnology", "IssueType", "MediationRequestStatus", "UrgencyLevel"],
+)
+
+# Choices of the values of each dimension, to give their names.
+DIMENSION_CHOICES = {
+    StatisticDimension.STATUS: MediationRequestStatus,
+    StatisticDimension.URGENCY: UrgencyLevel,
+    StatisticDimension.ISSUE_TYPE: IssueType,
+    StatisticDimension.ASSISTIVE_TECHNOLOGY: AssistiveTechnology,
+}
+PERIOD_FUNCTIONS = {
+    StatisticPeriod.DAY: TruncDay,
+    StatisticPeriod.MONTH: TruncMonth,
+    StatisticPeriod.YEAR: TruncYear,
+}
+
+
+class MediationRequestStatisticsView(APIView):
+    """Number of mediation requests per period and value of each dimension.
+
+    Read from the daily statistics only (see update_statistics), so that the
+    cost doesn't depend on the number of mediation requests. The query
+    parameters are:
+
+    - ``dimension``: status, urgency, issue_type or assistive_technology,
+      several of them being accepted comma separated, all by default.
+    - ``period``: day, month (the default) or year.
+    - ``after`` and ``before``: inclusive bounds of the days.
+
+    Values are given by their names, like in the mediation requests, an empty
+    name standing for the requests without a value.
+
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        params = request.query_params
+        dimensions = self._get_dimensions(params)
+        period = params.get("period", StatisticPeriod.MONTH)
+        if period not in StatisticPeriod.values:
+            raise ValidationError(
+                {"period": [_("Unknown value %(value)s.") % {"value": period}]}
+            )
+        statistics = MediationRequestDailyStatistic.objects.filter(
+            dimension__in=dimensions
+        )
+        for param, lookup in (("after", "gte"), ("before", "lte")):
+            if params.get(param):
+                statistics = statistics.filter(
+                    **{f"day__{lookup}": self._to_date(param, params)}
+                )
+        rows = (
+            statistics.annotate(period=PERIOD_FUNCTIONS[period]("day"))
+            .values("period", "dimension", "value")
+            .annotate(count=Sum("count"))
+            .order_by("period", "dimension", "value")
+        )
+        return Response(
+            [
+                {
+                    "period": row["period"],
+                    "dimension": StatisticDimension(row["dimension"]).name.lower(),
+                    "value": self._get_name(row["dimension"], row["value"]),
+                    "count": row["count"],
+                }
+                for row in rows
+            ]
+        )
+
+    @staticmethod
+    def _get_dimensions(params):
+        names = [
+            name.strip()
+            for values in params.getlist("dimension")
+            for name in values.split(",")
+            if name.strip()
+        ]
+        try:
+            return [StatisticDimension[name.upper()].value for name in names] or list(
+                StatisticDimension.values
+            )
+        except KeyError as error:
+            raise ValidationError(
+                {
+                    "dimension": [
+                        _("Unknown value %(value)s.") % {"value": error.args[0].lower()}
+                    ]
+                }
+            )
+
+    @staticmethod
+    def _get_name(dimension, value):
+        if not value:
+            return ""
+        try:
+            return DIMENSION_CHOICES[dimension](value).name
+        except ValueError:
+            return value
+
+    @staticmethod
+    def _to_date(param, params):
+        try:
+            return serializers.DateField().to_internal_value(params[param])
+        except serializers.ValidationError as error:
+            raise ValidationError({param: error.detail})
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class StatisticsConfig(AppConfig):
+    label = "statistics"
+    name = "connect_access.apps.statistics"
+    verbose_name = _("Statistics")
+
+    def ready(self):
+        import connect_access.apps.statistics.receivers  # noqa
+
+        super(StatisticsConfig, self).ready()
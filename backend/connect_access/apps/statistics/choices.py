@@ -0,0 +1,15 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class StatisticDimension(models.TextChoices):
+    STATUS = "st", _("Status")
+    URGENCY = "ur", _("Urgency")
+    ISSUE_TYPE = "it", _("Issue type")
+    ASSISTIVE_TECHNOLOGY = "at", _("Assistive technology")
+
+
+class StatisticPeriod(models.TextChoices):
+    DAY = "day", _("Day")
+    MONTH = "month", _("Month")
+    YEAR = "year", _("Year")
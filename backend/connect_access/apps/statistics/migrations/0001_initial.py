@@ -0,0 +1,115 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MediationRequestDailyStatistic",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("st", "Status"),
+                            ("ur", "Urgency"),
+                            ("it", "Issue type"),
+                            ("at", "Assistive technology"),
+                        ],
+                        max_length=2,
+                        verbose_name="Dimension",
+                    ),
+                ),
+                (
+                    "value",
+                    models.CharField(blank=True, max_length=2, verbose_name="Value"),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(verbose_name="Number of requests"),
+                ),
+            ],
+            options={
+                "verbose_name": "Mediation requests daily statistic",
+                "verbose_name_plural": "Mediation requests daily statistics",
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="StatisticsCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=50, unique=True, verbose_name="Name"),
+                ),
+                (
+                    "modified_until",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Modified until"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Statistics checkpoint",
+                "verbose_name_plural": "Statistics checkpoints",
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="StatisticsStaleDay",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True, verbose_name="Day")),
+            ],
+            options={
+                "verbose_name": "Statistics stale day",
+                "verbose_name_plural": "Statistics stale days",
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="mediationrequestdailystatistic",
+            index=models.Index(
+                fields=["dimension", "day"], name="daily_statistic_dimension_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="mediationrequestdailystatistic",
+            constraint=models.UniqueConstraint(
+                fields=("day", "dimension", "value"), name="daily_statistic_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from connect_access.apps.statistics.abstract_models import (
+    AbstractMediationRequestDailyStatistic,
+    AbstractStatisticsCheckpoint,
+    AbstractStatisticsStaleDay,
+)
+from connect_access.core.loading import is_model_registered
+from connect_access.models import model_factory
+
+__all__ = []
+
+if not is_model_registered("statistics", "MediationRequestDailyStatistic"):
+    MediationRequestDailyStatistic = model_factory(
+        AbstractMediationRequestDailyStatistic
+    )
+    __all__.append("MediationRequestDailyStatistic")
+
+if not is_model_registered("statistics", "StatisticsCheckpoint"):
+    StatisticsCheckpoint = model_factory(AbstractStatisticsCheckpoint)
+    __all__.append("StatisticsCheckpoint")
+
+if not is_model_registered("statistics", "StatisticsStaleDay"):
+    StatisticsStaleDay = model_factory(AbstractStatisticsStaleDay)
+    __all__.append("StatisticsStaleDay")
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_init, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from connect_access.core.loading import get_model
+
+MediationRequest = get_model("mediations", "MediationRequest")
+StatisticsStaleDay = get_model("statistics", "StatisticsStaleDay")
+
+
+@receiver(post_init, sender=MediationRequest)
+def remember_request_date(sender, instance, **kwargs):
+    """Remember the request date an instance is loaded with, unless deferred."""
+    if "request_date" in instance.__dict__:
+        instance._original_request_date = instance.request_date
+
+
+@receiver(pre_save, sender=MediationRequest)
+def mark_previous_statistics_day_stale(sender, instance, update_fields=None, **kwargs):
+    """Have the statistics of the previous day of a moved request computed again.
+
+    update_statistics finds the current day of the modified requests only.
+
+    """
+    if "request_date" not in instance.__dict__ or (
+        update_fields is not None and "request_date" not in update_fields
+    ):
+        return
+    if instance._state.adding:
+        original_request_date = None
+    elif "_original_request_date" in instance.__dict__:
+        original_request_date = instance._original_request_date
+    else:
+        original_request_date = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("request_date", flat=True)
+            .first()
+        )
+    instance._original_request_date = instance.request_date
+    if original_request_date is None or original_request_date == instance.request_date:
+        return
+    StatisticsStaleDay.objects.get_or_create(
+        day=timezone.localdate(original_request_date)
+    )
+
+
+@receiver(post_delete, sender=MediationRequest)
+def mark_statistics_day_stale(sender, instance, **kwargs):
+    """Have the statistics of the day of a deleted request computed again.
+
+    Deletions don't leave a modification date for update_statistics to find.
+
+    """
+    StatisticsStaleDay.objects.get_or_create(
+        day=timezone.localdate(instance.request_date)
+    )
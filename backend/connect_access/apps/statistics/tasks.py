@@ -0,0 +1,127 @@
+import datetime
+
+import celery
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_model
+
+from .choices import StatisticDimension
+
+MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestDailyStatistic = get_model(
+    "statistics", "MediationRequestDailyStatistic"
+)
+StatisticsCheckpoint = get_model("statistics", "StatisticsCheckpoint")
+StatisticsStaleDay = get_model("statistics", "StatisticsStaleDay")
+AssistiveTechnology = get_class("mediations.choices", "AssistiveTechnology")
+
+CHECKPOINT_NAME = "mediation_requests"
+# Requests modified this long before the checkpoint are read again, so that
+# those committed after a run, with an earlier modification date, are counted.
+MODIFIED_OVERLAP = datetime.timedelta(minutes=5)
+# Number of days computed per query.
+DAYS_BATCH_SIZE = 100
+# Dimensions counted from a single value field of the mediation requests.
+FIELD_DIMENSIONS = {
+    StatisticDimension.STATUS: "status",
+    StatisticDimension.URGENCY: "urgency",
+    StatisticDimension.ISSUE_TYPE: "issue_type",
+}
+
+
+@celery.shared_task()
+def update_statistics(full=False):
+    """Update the daily statistics of the mediation requests.
+
+    Only the days of the requests modified since the last run, and the days of
+    the deleted requests, are computed again, with a GROUP BY on their
+    requests. The first run, or a run with full, computes all the days.
+
+    Returns:
+        The number of computed days.
+
+    """
+    with transaction.atomic():
+        (
+            checkpoint,
+            _created,
+        ) = StatisticsCheckpoint.objects.select_for_update().get_or_create(
+            name=CHECKPOINT_NAME
+        )
+        now = timezone.now()
+        stale_days = StatisticsStaleDay.objects.all()
+        if full or checkpoint.modified_until is None:
+            MediationRequestDailyStatistic.objects.all().delete()
+            days = _compute_days(MediationRequest.objects.all())
+        else:
+            days = set(
+                MediationRequest.objects.filter(
+                    modified__gte=checkpoint.modified_until - MODIFIED_OVERLAP
+                )
+                .annotate(day=TruncDate("request_date"))
+                .values_list("day", flat=True)
+                .distinct()
+            )
+            days.update(stale_days.values_list("day", flat=True))
+            _update_days(sorted(days))
+        stale_days.delete()
+        checkpoint.modified_until = now
+        checkpoint.save()
+    return len(days)
+
+
+def _update_days(days):
+    for start in range(0, len(days), DAYS_BATCH_SIZE):
+        batch = days[start : start + DAYS_BATCH_SIZE]  # noqa: E203
+        MediationRequestDailyStatistic.objects.filter(day__in=batch).delete()
+        days_filter = Q()
+        for day in batch:
+            start_time = timezone.make_aware(
+                datetime.datetime.combine(day, datetime.time.min)
+            )
+            days_filter |= Q(
+                request_date__gte=start_time,
+                request_date__lt=start_time + datetime.timedelta(days=1),
+            )
+        _compute_days(MediationRequest.objects.filter(days_filter))
+
+
+def _compute_days(mediation_requests):
+    mediation_requests = mediation_requests.annotate(
+        day=TruncDate("request_date")
+    ).order_by()
+    statistics = []
+    for dimension, field in FIELD_DIMENSIONS.items():
+        for row in mediation_requests.values("day", field).annotate(count=Count("id")):
+            statistics.append(
+                MediationRequestDailyStatistic(
+                    day=row["day"],
+                    dimension=dimension,
+                    value=row[field],
+                    count=row["count"],
+                )
+            )
+    # A request can use several technologies: one conditional count per
+    # technology, in a single query.
+    counts = {
+        f"technology_{value}": Count(
+            "id", filter=Q(assistive_technology_used__contains=[value])
+        )
+        for value in AssistiveTechnology.values
+    }
+    for row in mediation_requests.values("day").annotate(**counts):
+        for value in AssistiveTechnology.values:
+            if row[f"technology_{value}"]:
+                statistics.append(
+                    MediationRequestDailyStatistic(
+                        day=row["day"],
+                        dimension=StatisticDimension.ASSISTIVE_TECHNOLOGY,
+                        value=value,
+                        count=row[f"technology_{value}"],
+                    )
+                )
+    MediationRequestDailyStatistic.objects.bulk_create(statistics, batch_size=1000)
+    return {statistic.day for statistic in statistics}
@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+MediationRequestDailyStatistic = get_model(
+    "statistics", "MediationRequestDailyStatistic"
+)
+MediationRequestStatisticsView = get_class(
+    "statistics.api", "MediationRequestStatisticsView"
+)
+StatisticDimension = get_class("statistics.choices", "StatisticDimension")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+UrgencyLevel = get_class("mediations.choices", "UrgencyLevel")
+
+
+def _add_statistic(day, dimension, value, count):
+    MediationRequestDailyStatistic.objects.create(
+        day=datetime.date(2022, 3, day) if isinstance(day, int) else day,
+        dimension=dimension,
+        value=value,
+        count=count,
+    )
+
+
+def _get(params, authenticate, permission="admin"):
+    request = APIRequestFactory().get("/api/statistics/mediation-requests/", params)
+    authenticate.authenticate_if_needed(request, permission)
+    return MediationRequestStatisticsView.as_view()(request)
+
+
+class TestAPI:
+    @pytest.fixture(autouse=True)
+    def _statistics(self):
+        _add_statistic(1, StatisticDimension.STATUS, MediationRequestStatus.FILED, 2)
+        _add_statistic(2, StatisticDimension.STATUS, MediationRequestStatus.FILED, 3)
+        _add_statistic(
+            datetime.date(2022, 4, 1),
+            StatisticDimension.STATUS,
+            MediationRequestStatus.PENDING,
+            1,
+        )
+        _add_statistic(1, StatisticDimension.URGENCY, UrgencyLevel.VERY_URGENT, 4)
+        _add_statistic(1, StatisticDimension.URGENCY, "", 1)
+
+    def test_statistics_are_summed_per_month(self, authenticate):
+        response = _get({"dimension": "status"}, authenticate)
+        assert response.status_code == 200
+        assert response.data == [
+            {
+                "period": datetime.date(2022, 3, 1),
+                "dimension": "status",
+                "value": "FILED",
+                "count": 5,
+            },
+            {
+                "period": datetime.date(2022, 4, 1),
+                "dimension": "status",
+                "value": "PENDING",
+                "count": 1,
+            },
+        ]
+
+    def test_statistics_can_be_given_per_day_between_dates(self, authenticate):
+        response = _get(
+            {"period": "day", "after": "2022-03-02", "before": "2022-03-31"},
+            authenticate,
+        )
+        assert [(row["period"].day, row["count"]) for row in response.data] == [(2, 3)]
+
+    def test_statistics_give_all_dimensions_by_default(self, authenticate):
+        response = _get({}, authenticate)
+        urgencies = [row for row in response.data if row["dimension"] == "urgency"]
+        assert {row["value"]: row["count"] for row in urgencies} == {
+            "": 1,
+            "VERY_URGENT": 4,
+        }
+
+    @pytest.mark.parametrize(
+        "params", [{"dimension": "unknown"}, {"period": "week"}, {"after": "2022"}]
+    )
+    def test_statistics_with_invalid_parameter_are_rejected(self, params, authenticate):
+        assert _get(params, authenticate).status_code == 400
+
+    def test_statistics_are_forbidden_to_users(self, authenticate):
+        assert _get({}, authenticate, "user").status_code == 403
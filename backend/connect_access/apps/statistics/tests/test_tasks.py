@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+MediationRequest = get_model("mediations", "MediationRequest")
+MediationRequestDailyStatistic = get_model(
+    "statistics", "MediationRequestDailyStatistic"
+)
+update_statistics = get_class("statistics.tasks", "update_statistics")
+StatisticDimension = get_class("statistics.choices", "StatisticDimension")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+AssistiveTechnology = get_class("mediations.choices", "AssistiveTechnology")
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+
+FIRST_DAY = timezone.make_aware(datetime.datetime(2022, 3, 1, 10))
+SECOND_DAY = timezone.make_aware(datetime.datetime(2022, 3, 2, 10))
+
+
+def _get_statistics(dimension):
+    return {
+        (statistic.day.day, statistic.value): statistic.count
+        for statistic in MediationRequestDailyStatistic.objects.filter(
+            dimension=dimension
+        )
+    }
+
+
+class TestUpdateStatistics:
+    def _create(self):
+        mediation_requests = [
+            MediationRequestFactory(
+                request_date=FIRST_DAY,
+                status=MediationRequestStatus.FILED.value,
+                assistive_technology_used=[
+                    AssistiveTechnology.BRAILLE_DISPLAY.value,
+                    AssistiveTechnology.KEYBOARD.value,
+                ],
+            ),
+            MediationRequestFactory(
+                request_date=FIRST_DAY,
+                status=MediationRequestStatus.FILED.value,
+                assistive_technology_used=[AssistiveTechnology.KEYBOARD.value],
+            ),
+            MediationRequestFactory(
+                request_date=SECOND_DAY,
+                status=MediationRequestStatus.PENDING.value,
+                assistive_technology_used=[],
+            ),
+        ]
+        # Modified before the runs of the tests.
+        MediationRequest.objects.update(
+            modified=timezone.now() - datetime.timedelta(days=1)
+        )
+        return mediation_requests
+
+    def test_first_run_computes_all_the_days(self):
+        self._create()
+        assert update_statistics() == 2
+        assert _get_statistics(StatisticDimension.STATUS) == {
+            (1, MediationRequestStatus.FILED.value): 2,
+            (2, MediationRequestStatus.PENDING.value): 1,
+        }
+        assert _get_statistics(StatisticDimension.ASSISTIVE_TECHNOLOGY) == {
+            (1, AssistiveTechnology.BRAILLE_DISPLAY.value): 1,
+            (1, AssistiveTechnology.KEYBOARD.value): 2,
+        }
+
+    def test_next_runs_compute_the_days_of_the_modified_requests(self):
+        mediation_requests = self._create()
+        update_statistics()
+        assert update_statistics() == 0
+        mediation_requests[2].status = MediationRequestStatus.FILED.value
+        mediation_requests[2].save()
+        assert update_statistics() == 1
+        assert _get_statistics(StatisticDimension.STATUS) == {
+            (1, MediationRequestStatus.FILED.value): 2,
+            (2, MediationRequestStatus.FILED.value): 1,
+        }
+
+    def test_next_runs_compute_the_days_of_the_deleted_requests(self):
+        mediation_requests = self._create()
+        update_statistics()
+        mediation_requests[0].delete()
+        assert update_statistics() == 1
+        assert _get_statistics(StatisticDimension.STATUS) == {
+            (1, MediationRequestStatus.FILED.value): 1,
+            (2, MediationRequestStatus.PENDING.value): 1,
+        }
+        assert _get_statistics(StatisticDimension.ASSISTIVE_TECHNOLOGY) == {
+            (1, AssistiveTechnology.KEYBOARD.value): 1,
+        }
+
+    def test_next_runs_compute_the_previous_days_of_the_moved_requests(self):
+        mediation_requests = self._create()
+        update_statistics()
+        mediation_requests[2].request_date = FIRST_DAY
+        mediation_requests[2].save()
+        moved = MediationRequest.objects.get(pk=mediation_requests[1].pk)
+        moved.request_date = SECOND_DAY
+        moved.save(update_fields=["request_date", "modified"])
+        assert update_statistics() == 2
+        assert _get_statistics(StatisticDimension.STATUS) == {
+            (1, MediationRequestStatus.FILED.value): 1,
+            (1, MediationRequestStatus.PENDING.value): 1,
+            (2, MediationRequestStatus.FILED.value): 1,
+        }
@@ -0,0 +1,189 @@
+import os
+import uuid
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+from connect_access.core.loading import get_class
+
+from . import choices
+
+User = get_user_model()
+if TYPE_CHECKING:
+    # Imported for the type of the manager to be resolved.
+    from .managers import StoredFileManager
+else:
+    StoredFileManager = get_class("uploads.managers", "StoredFileManager")
+
+# Number of bytes read from the request, and written, at once.
+BLOCK_SIZE = 64 * 1024
+
+
+class AbstractUpload(TimeStampedModel):
+    """File uploaded in chunks, resumable after a connection loss.
+
+    The chunks are appended to a partial file in UPLOADS_PARTIAL_ROOT, read
+    from the request by blocks, so that a file is never held in memory.
+    offset is the number of bytes received. Once complete, the upload is
+    attached to a mediation request or a trace report, which copies it to the
+    storage of their attached_file, and deleted.
+
+    """
+
+    uuid = models.UUIDField(
+        verbose_name=_("Public identifier"),
+        unique=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    # Only the user who started an upload can use it, anonymous uploads being
+    # protected by their identifier.
+    owner = models.ForeignKey(
+        User,
+        verbose_name=_("Owner"),
+        on_delete=models.CASCADE,
+        related_name="uploads",
+        null=True,
+        blank=True,
+    )
+    filename = models.CharField(verbose_name=_("File name"), max_length=255)
+    length = models.PositiveBigIntegerField(verbose_name=_("Length"))
+    offset = models.PositiveBigIntegerField(verbose_name=_("Offset"), default=0)
+
+    class Meta:
+        abstract = True
+        app_label = "uploads"
+        verbose_name = _("Upload")
+        verbose_name_plural = _("Uploads")
+        indexes = [
+            models.Index(fields=["modified"], name="upload_modified_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.length})"
+
+    @property
+    def partial_path(self):
+        return os.path.join(settings.UPLOADS_PARTIAL_ROOT, f"{self.uuid}.part")
+
+    @property
+    def is_complete(self):
+        return self.offset == self.length
+
+    def append(self, stream, size):
+        """Append size bytes read from stream to the partial file.
+
+        The partial file is first cut to offset, dropping the bytes of a chunk
+        whose offset was not saved. When the stream breaks, the bytes already
+        received are kept, for the client to resume from them.
+
+        Returns:
+            The number of appended bytes.
+
+        """
+        os.makedirs(settings.UPLOADS_PARTIAL_ROOT, exist_ok=True)
+        appended = 0
+        with open(self.partial_path, "ab") as partial:
+            partial.truncate(self.offset)
+            try:
+                while appended < size:
+                    block = stream.read(min(BLOCK_SIZE, size - appended))
+                    if not block:
+                        break
+                    partial.write(block)
+                    appended += len(block)
+            except OSError:
+                # UnreadablePostError: the client went away.
+                pass
+        self.offset += appended
+        self.save(update_fields=["offset", "modified"])
+        return appended
+
+    def attach(self, instance):
+        """Save the complete file as the attached_file of instance, and delete the upload.
+
+        The file is copied to the storage by chunks, in the transaction saving
+        instance (see ContentAddressedStorage).
+
+        """
+        with transaction.atomic():
+            with open(self.partial_path, "rb") as partial:
+                instance.attached_file.save(self.filename, File(partial))
+            self.delete()
+
+
+class AbstractStoredFile(models.Model):
+    """File of the storage, with the number of rows referencing it.
+
+    Replaces looking for other rows with the same file name on each deletion:
+    the count is kept by the receivers of connect_access.models.receivers, for
+    all the file fields, and the file is deleted when it reaches zero.
+
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255, unique=True)
+    references = models.PositiveIntegerField(
+        verbose_name=_("Number of references"), default=0
+    )
+
+    objects = StoredFileManager()
+
+    class Meta:
+        abstract = True
+        app_label = "uploads"
+        verbose_name = _("Stored file")
+        verbose_name_plural = _("Stored files")
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.references})"
+
+
+class AbstractFileDeletion(TimeStampedModel):
+    """File to delete from its storage, no row referencing it anymore.
+
+    Recorded in the transaction releasing the last reference to the file (see
+    StoredFileQuerySet.release), so that the file is kept if this transaction
+    is rolled back, and deleted by the delete_files task once committed.
+
+    """
+
+    class Meta:
+        abstract = True
+        app_label = "uploads"
+        verbose_name = _("File deletion")
+        verbose_name_plural = _("File deletions")
+        indexes = [
+            # Serves the worker, only the pending deletions being scanned.
+            models.Index(
+                fields=["next_attempt", "id"],
+                name="file_deletion_pending_idx",
+                condition=models.Q(status=choices.FileDeletionStatus.PENDING),
+            ),
+            models.Index(fields=["name"], name="file_deletion_name_idx"),
+        ]
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255)
+    # Import path of the storage class, instantiated without arguments.
+    storage = models.CharField(verbose_name=_("Storage"), max_length=255)
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=2,
+        choices=choices.FileDeletionStatus.choices,
+        default=choices.FileDeletionStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name=_("Deletion attempts"), default=0
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name=_("Next deletion attempt"), default=timezone.now
+    )
+    last_error = models.TextField(verbose_name=_("Last error"), blank=True)
+
+    def __str__(self) -> str:
+        return self.name
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from connect_access.core.loading import get_model
+
+from .choices import FileDeletionStatus
+
+FileDeletion = get_model("uploads", "FileDeletion")
+
+
+class FileDeletionAdmin(admin.ModelAdmin):
+    list_display = ("created", "name", "status", "attempts", "next_attempt")
+    list_filter = ("status",)
+    search_fields = ("name",)
+    readonly_fields = [field.name for field in FileDeletion._meta.fields]
+    actions = ["retry"]
+
+    @admin.action(description=_("Delete again"))
+    def retry(self, request, queryset):
+        queryset.update(
+            status=FileDeletionStatus.PENDING, attempts=0, next_attempt=timezone.now()
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(FileDeletion, FileDeletionAdmin)
@@ -0,0 +1,234 @@
+import base64
+import binascii
+import os
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from rest_framework import authentication, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+
+from connect_access.core.loading import get_class, get_model
+
+from .permissions import IsUploadOwner
+from .serializers import UploadAttachSerializer, UploadSerializer
+from .tokens import check_attach_token
+
+MediationRequest = get_model("mediations", "MediationRequest")
+Upload = get_model("uploads", "Upload")
+CLOSED_STATUSES = get_class("mediations.managers", "CLOSED_STATUSES")
+
+TUS_VERSION = "1.0.0"
+TUS_EXTENSIONS = "creation,termination"
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+
+
+class UploadViewSet(viewsets.GenericViewSet):
+    """Chunked and resumable uploads of the attached files.
+
+    Follows the tus protocol (https://tus.io/protocols/resumable-upload), with
+    its creation and termination extensions:
+
+    - ``POST`` creates an upload, from the ``Upload-Length`` header and the
+      filename of the ``Upload-Metadata`` header, and gives its URL in the
+      ``Location`` header.
+    - ``HEAD`` gives the number of bytes received in the ``Upload-Offset``
+      header, to resume an interrupted upload from there.
+    - ``PATCH`` appends its body, of application/offset+octet-stream type, to
+      the upload, when its ``Upload-Offset`` header is the one of the upload.
+    - ``DELETE`` abandons the upload.
+
+    A complete upload is then attached to a mediation request or a trace
+    report by the attach action. The uploads neither completed nor attached
+    are deleted after UPLOADS_EXPIRATION hours (see purge_expired_uploads).
+
+    The files of the anonymous users are limited to UPLOADS_ANONYMOUS_MAX_LENGTH
+    bytes, and the creation of the uploads is throttled with the ``uploads``
+    scope of DEFAULT_THROTTLE_RATES. The chunks are not, for the clients to
+    resume their uploads as soon as they can.
+
+    """
+
+    queryset = Upload.objects.all()
+    permission_classes = [IsUploadOwner]
+    authentication_classes = [authentication.TokenAuthentication]
+    serializer_class = UploadSerializer
+    lookup_field = "uuid"
+    throttle_scope = "uploads"
+
+    def get_throttles(self):
+        if self.action != "create":
+            return []
+        return [ScopedRateThrottle()]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("partial_update", "attach"):
+            # Chunks of an upload are appended one at a time.
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def create(self, request):
+        length = self._get_int_header(request, "Upload-Length")
+        if length > self._get_max_length(request.user):
+            return Response(
+                {"message": _("The file is too large.")},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        filename = os.path.basename(self._get_metadata(request).get("filename", ""))
+        if not filename:
+            raise ValidationError({"Upload-Metadata": [_("A filename is required.")]})
+        upload = Upload.objects.create(
+            owner=request.user if request.user.is_authenticated else None,
+            filename=filename[: Upload._meta.get_field("filename").max_length],
+            length=length,
+        )
+        response = self._get_progress_response(upload, status.HTTP_201_CREATED)
+        response["Location"] = request.build_absolute_uri(
+            reverse("api:uploads-detail", kwargs={"uuid": upload.uuid})
+        )
+        return response
+
+    def retrieve(self, request, uuid=None):
+        response = self._get_progress_response(self.get_object())
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def partial_update(self, request, uuid=None):
+        if request.content_type.split(";")[0].strip() != CHUNK_CONTENT_TYPE:
+            return Response(
+                {
+                    "message": _("Chunks are sent as %(type)s.")
+                    % {"type": CHUNK_CONTENT_TYPE}
+                },
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        upload = self.get_object()
+        offset = self._get_int_header(request, "Upload-Offset")
+        if offset != upload.offset:
+            response = Response(
+                {
+                    "message": _("The offset of the upload is %(offset)s.")
+                    % {"offset": upload.offset}
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+            response["Upload-Offset"] = upload.offset
+            return response
+        size = int(request.META.get("CONTENT_LENGTH") or 0)
+        if upload.offset + size > upload.length:
+            raise ValidationError(
+                {"Content-Length": [_("The chunk exceeds the length of the upload.")]}
+            )
+        if size:
+            upload.append(request.stream, size)
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response["Upload-Offset"] = upload.offset
+        return response
+
+    def destroy(self, request, uuid=None):
+        self.get_object().delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["POST"])
+    def attach(self, request, uuid=None):
+        """Attach the complete upload to a mediation request or a trace report.
+
+        The body gives the identifier of either a ``mediation_request`` or a
+        ``trace_report``, whose attached file is replaced. Trace reports are
+        reserved to the staff, mediation requests to the staff and to their
+        complainant. A request without complainant can also be given its
+        first attached file while it isn't closed, with the ``upload_token``
+        returned by its creation, for the anonymous submissions.
+
+        Raises:
+            PermissionDenied: when the user can't change the attached file.
+
+        """
+        upload = self.get_object()
+        serializer = UploadAttachSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data["target"]
+        if not self._can_attach(
+            request.user, target, serializer.validated_data.get("upload_token", "")
+        ):
+            raise PermissionDenied()
+        if not upload.is_complete:
+            return Response(
+                {"message": _("The upload is not complete.")},
+                status=status.HTTP_409_CONFLICT,
+            )
+        upload.attach(target)
+        return Response(
+            {"attached_file": request.build_absolute_uri(target.attached_file.url)}
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        response["Tus-Resumable"] = TUS_VERSION
+        if request.method == "OPTIONS":
+            response["Tus-Version"] = TUS_VERSION
+            response["Tus-Extension"] = TUS_EXTENSIONS
+            response["Tus-Max-Size"] = self._get_max_length(request.user)
+        return response
+
+    @staticmethod
+    def _get_max_length(user):
+        if user.is_authenticated:
+            return settings.UPLOADS_MAX_LENGTH
+        return min(settings.UPLOADS_ANONYMOUS_MAX_LENGTH, settings.UPLOADS_MAX_LENGTH)
+
+    @staticmethod
+    def _can_attach(user, target, upload_token):
+        if user.is_staff:
+            return True
+        if not isinstance(target, MediationRequest):
+            return False
+        if target.complainant_id is not None:
+            return target.complainant_id == user.pk
+        return (
+            not target.attached_file
+            and target.status not in CLOSED_STATUSES
+            and check_attach_token(upload_token, target)
+        )
+
+    @staticmethod
+    def _get_progress_response(upload, status_code=status.HTTP_200_OK):
+        response = Response(UploadSerializer(upload).data, status=status_code)
+        response["Upload-Offset"] = upload.offset
+        response["Upload-Length"] = upload.length
+        return response
+
+    @staticmethod
+    def _get_int_header(request, header):
+        try:
+            value = int(request.headers[header])
+        except (KeyError, ValueError):
+            value = -1
+        if value < 0:
+            raise ValidationError({header: [_("A positive integer is required.")]})
+        return value
+
+    @staticmethod
+    def _get_metadata(request):
+        """Decode the Upload-Metadata header: comma separated keys and base64 values.
+
+        Raises:
+            ValidationError: when a value is not base64 encoded.
+
+        """
+        metadata = {}
+        for pair in request.headers.get("Upload-Metadata", "").split(","):
+            key, _separator, value = pair.strip().partition(" ")
+            if not key:
+                continue
+            try:
+                metadata[key] = base64.b64decode(value, validate=True).decode()
+            except (binascii.Error, UnicodeDecodeError):
+                raise ValidationError(
+                    {"Upload-Metadata": [_("Values are base64 encoded.")]}
+                )
+        return metadata
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class UploadsConfig(AppConfig):
+    label = "uploads"
+    name = "connect_access.apps.uploads"
+    verbose_name = _("Uploads")
+
+    def ready(self):
+        import connect_access.apps.uploads.receivers  # noqa
+
+        super(UploadsConfig, self).ready()
@@ -0,0 +1,7 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class FileDeletionStatus(models.TextChoices):
+    PENDING = "pe", _("Pending")
+    FAILED = "fa", _("Failed")
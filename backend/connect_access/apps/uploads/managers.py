@@ -0,0 +1,125 @@
+import collections
+import logging
+
+from django.db import connection, models, transaction
+from kombu.exceptions import OperationalError
+
+from connect_access.core.loading import get_model
+
+logger = logging.getLogger(__name__)
+
+
+class StoredFileQuerySet(models.QuerySet):
+    def acquire(self, name):
+        """Count a new reference to the file of name, cancelling its pending deletion."""
+        self.acquire_many([name])
+
+    def acquire_many(self, names):
+        """Count a new reference to the files of names, cancelling their deletions.
+
+        A name listed several times gains as many references.
+
+        """
+        counts = collections.Counter(name for name in names if name)
+        if not counts:
+            return
+        with transaction.atomic():
+            self.bulk_create(
+                [self.model(name=name) for name in counts], ignore_conflicts=True
+            )
+            stored_files = list(
+                self.select_for_update().filter(name__in=counts).order_by("name")
+            )
+            for stored_file in stored_files:
+                stored_file.references += counts[stored_file.name]
+            self.bulk_update(stored_files, ["references"])
+            get_model("uploads", "FileDeletion").objects.filter(
+                name__in=counts
+            ).delete()
+
+    def reserve(self, name):
+        """Keep the file of name from being deleted until the transaction ends.
+
+        Its row is locked, and created without references if missing, so that
+        the file can't be released meanwhile, and its pending deletion is
+        cancelled, a deletion in progress being waited for. Called before
+        looking for the file in the storage, in the transaction acquiring it.
+
+        """
+        with transaction.atomic():
+            self.bulk_create([self.model(name=name)], ignore_conflicts=True)
+            list(self.select_for_update().filter(name=name))
+            get_model("uploads", "FileDeletion").objects.filter(name=name).delete()
+
+    def release(self, name, storage):
+        """Remove a reference to the file of name, queuing its deletion at zero."""
+        self.release_many([name], storage)
+
+    def release_many(self, names, storage):
+        """Remove a reference to the files of names, queuing the deletions at zero.
+
+        A name listed several times loses as many references. The deletions
+        are recorded in the transaction, and the delete_files task queued once
+        it is committed. Files stored before the references were counted are
+        deleted on their first release.
+
+        """
+        counts = collections.Counter(name for name in names if name)
+        if not counts:
+            return
+        with transaction.atomic():
+            stored_files = {
+                stored_file.name: stored_file
+                for stored_file in self.select_for_update()
+                .filter(name__in=counts)
+                .order_by("name")
+            }
+            referenced, unreferenced = [], []
+            for name, count in counts.items():
+                stored_file = stored_files.get(name)
+                if stored_file and stored_file.references > count:
+                    stored_file.references -= count
+                    referenced.append(stored_file)
+                else:
+                    unreferenced.append(name)
+            self.bulk_update(referenced, ["references"])
+            if not unreferenced:
+                return
+            self.filter(name__in=unreferenced).delete()
+            file_deletion_model = get_model("uploads", "FileDeletion")
+            file_deletion_model.objects.bulk_create(
+                file_deletion_model(name=name, storage=get_storage_path(storage))
+                for name in unreferenced
+            )
+        queue_file_deletions()
+
+
+StoredFileManager = models.Manager.from_queryset(StoredFileQuerySet)
+
+
+def get_storage_path(storage):
+    storage_class = type(storage)
+    return f"{storage_class.__module__}.{storage_class.__qualname__}"
+
+
+def queue_file_deletions():
+    """Queue the delete_files task once the current transaction is committed.
+
+    Queued once per transaction, however many files it releases: the task
+    deletes all the pending files.
+
+    """
+    # Entries are (savepoint ids, callback, ...) tuples.
+    if any(entry[1] is _queue_delete_files for entry in connection.run_on_commit):
+        return
+    transaction.on_commit(_queue_delete_files)
+
+
+def _queue_delete_files():
+    from .tasks import delete_files
+
+    try:
+        delete_files.delay()
+    except OperationalError as error:
+        # Run periodically anyway.
+        logger.error(f"The file deletions couldn't be queued. Actual error: {error}")
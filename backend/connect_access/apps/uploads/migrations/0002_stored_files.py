@@ -0,0 +1,68 @@
+# Generated by Django 4.0.8 on 2026-10-18 11:58
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    """Count the rows referencing the files stored before the counts."""
+    StoredFile = apps.get_model("uploads", "StoredFile")
+    references = Counter()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                rows = (
+                    model.objects.exclude(**{field.name: ""})
+                    .values(field.name)
+                    .annotate(count=Count("pk"))
+                    .order_by()
+                )
+                for row in rows:
+                    references[row[field.name]] += row["count"]
+    StoredFile.objects.bulk_create(
+        [StoredFile(name=name, references=count) for name, count in references.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("uploads", "0001_initial"),
+        ("mediations", "0008_content_addressed_attachments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredFile",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=255, unique=True, verbose_name="Name"),
+                ),
+                (
+                    "references",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Number of references"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Stored file",
+                "verbose_name_plural": "Stored files",
+                "abstract": False,
+            },
+        ),
+        migrations.RunPython(count_references, reverse_code=migrations.RunPython.noop),
+    ]
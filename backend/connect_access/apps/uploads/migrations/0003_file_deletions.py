@@ -0,0 +1,87 @@
+# Generated by Django 4.0.8 on 2026-10-18 12:04
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("uploads", "0002_stored_files"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileDeletion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="Name")),
+                ("storage", models.CharField(max_length=255, verbose_name="Storage")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pe", "Pending"), ("fa", "Failed")],
+                        default="pe",
+                        max_length=2,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Deletion attempts"
+                    ),
+                ),
+                (
+                    "next_attempt",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Next deletion attempt",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="Last error")),
+            ],
+            options={
+                "verbose_name": "File deletion",
+                "verbose_name_plural": "File deletions",
+                "abstract": False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name="filedeletion",
+            index=models.Index(
+                condition=models.Q(("status", "pe")),
+                fields=["next_attempt", "id"],
+                name="file_deletion_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="filedeletion",
+            index=models.Index(fields=["name"], name="file_deletion_name_idx"),
+        ),
+    ]
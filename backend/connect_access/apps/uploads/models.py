@@ -0,0 +1,21 @@
+from connect_access.apps.uploads.abstract_models import (
+    AbstractFileDeletion,
+    AbstractStoredFile,
+    AbstractUpload,
+)
+from connect_access.core.loading import is_model_registered
+from connect_access.models import model_factory
+
+__all__ = []
+
+if not is_model_registered("uploads", "Upload"):
+    Upload = model_factory(AbstractUpload)
+    __all__.append("Upload")
+
+if not is_model_registered("uploads", "StoredFile"):
+    StoredFile = model_factory(AbstractStoredFile)
+    __all__.append("StoredFile")
+
+if not is_model_registered("uploads", "FileDeletion"):
+    FileDeletion = model_factory(AbstractFileDeletion)
+    __all__.append("FileDeletion")
@@ -0,0 +1,11 @@
+from rest_framework import permissions
+
+
+class IsUploadOwner(permissions.BasePermission):
+    """Uploads are open to everyone, but an upload started by a user is theirs."""
+
+    def has_permission(self, request, view):
+        return True
+
+    def has_object_permission(self, request, view, obj):
+        return obj.owner_id is None or obj.owner_id == request.user.pk
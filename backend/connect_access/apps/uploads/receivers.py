@@ -0,0 +1,23 @@
+import os
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from connect_access.core.loading import get_model
+
+Upload = get_model("uploads", "Upload")
+
+
+@receiver(post_delete, sender=Upload)
+def delete_partial_file(sender, instance, **kwargs):
+    """Delete the partial file of a deleted upload, once the deletion is committed."""
+    path = instance.partial_path
+    transaction.on_commit(lambda: _remove(path))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,45 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from connect_access.core.loading import get_model
+
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+Upload = get_model("uploads", "Upload")
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    """Serializes the progress of an upload."""
+
+    id = serializers.ReadOnlyField(source="uuid")
+
+    class Meta:
+        model = Upload
+        fields = ["id", "filename", "length", "offset"]
+        read_only_fields = fields
+
+
+class UploadAttachSerializer(serializers.Serializer):
+    """Validates the mediation request or the trace report to attach an upload to."""
+
+    mediation_request = serializers.SlugRelatedField(
+        slug_field="uuid", queryset=MediationRequest.objects.all(), required=False
+    )
+    trace_report = serializers.SlugRelatedField(
+        slug_field="uuid", queryset=TraceReport.objects.all(), required=False
+    )
+    # Given to the submitters without account when they create their request.
+    upload_token = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        targets = [
+            attrs[field]
+            for field in ("mediation_request", "trace_report")
+            if field in attrs
+        ]
+        if len(targets) != 1:
+            raise serializers.ValidationError(
+                _("Give either a mediation request or a trace report.")
+            )
+        attrs["target"] = targets[0]
+        return attrs
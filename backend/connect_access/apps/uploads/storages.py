@@ -0,0 +1,53 @@
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.utils.deconstruct import deconstructible
+
+from connect_access.core.loading import get_model
+
+# Directory of the files, named after their digests.
+CONTENT_DIRECTORY = "sha256"
+# Extensions kept in the names, for the content type of the served files.
+EXTENSION_PATTERN = re.compile(r"\.[a-z0-9]{1,10}")
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage naming the files after the SHA-256 of their content.
+
+    Identical contents are stored once, whatever the name they are uploaded
+    with and the rows attaching them: saving a content already stored returns
+    its name without writing it again. The rows referencing each name are
+    counted by StoredFile, which deletes the file once no row references it
+    (see connect_access.models.receivers and the delete_files task). The file
+    is reserved before it is looked for (see StoredFileQuerySet.reserve), so
+    that it can't be deleted before the row saved in the same transaction
+    counts its reference.
+
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        name = self.get_content_name(digest.hexdigest(), name)
+        with transaction.atomic():
+            get_model("uploads", "StoredFile").objects.reserve(name)
+            if self.exists(name):
+                return name
+            return super().save(name, content, max_length=max_length)
+
+    @staticmethod
+    def get_content_name(digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        if not EXTENSION_PATTERN.fullmatch(extension):
+            extension = ""
+        return f"{CONTENT_DIRECTORY}/{digest[:2]}/{digest}{extension}"
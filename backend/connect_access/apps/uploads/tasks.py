@@ -0,0 +1,185 @@
+import datetime
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import celery
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from connect_access.core.loading import get_classes, get_model
+
+from .choices import FileDeletionStatus
+
+Upload = get_model("uploads", "Upload")
+StoredFile = get_model("uploads", "StoredFile")
+FileDeletion = get_model("uploads", "FileDeletion")
+ContentAddressedStorage, CONTENT_DIRECTORY = get_classes(
+    "uploads.storages", ["ContentAddressedStorage", "CONTENT_DIRECTORY"]
+)
+get_storage_path, queue_file_deletions = get_classes(
+    "uploads.managers", ["get_storage_path", "queue_file_deletions"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+@celery.shared_task()
+def purge_expired_uploads():
+    """Delete the uploads left UPLOADS_EXPIRATION hours without chunk nor attachment.
+
+    Returns:
+        The number of deleted uploads.
+
+    """
+    expiration = datetime.timedelta(hours=getattr(settings, "UPLOADS_EXPIRATION", 24))
+    deleted, _rows = Upload.objects.filter(
+        modified__lt=timezone.now() - expiration
+    ).delete()
+    return deleted
+
+
+@celery.shared_task()
+def delete_files(batch_size=None):
+    """Delete the files recorded by the file deletions, in parallel.
+
+    Deletions are fetched by batches, locked with SKIP LOCKED so that several
+    workers can run concurrently, and the files of a batch are deleted by
+    FILE_DELETION_WORKERS threads, the storage calls waiting on the disk or
+    the network. A file referenced again since its deletion was recorded is
+    kept. A failed deletion is retried later with an exponential backoff,
+    and fails for good after FILE_DELETION_MAX_ATTEMPTS attempts.
+
+    Returns:
+        The number of deleted files.
+
+    """
+    batch_size = batch_size or settings.FILE_DELETION_BATCH_SIZE
+    deleted = 0
+    with ThreadPoolExecutor(max_workers=settings.FILE_DELETION_WORKERS) as executor:
+        while True:
+            with transaction.atomic():
+                deletions = list(
+                    FileDeletion.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        status=FileDeletionStatus.PENDING,
+                        next_attempt__lte=timezone.now(),
+                    )
+                    .order_by("next_attempt", "id")[:batch_size]
+                )
+                referenced = set(
+                    StoredFile.objects.filter(
+                        name__in={deletion.name for deletion in deletions},
+                        references__gt=0,
+                    ).values_list("name", flat=True)
+                )
+                to_delete = [
+                    deletion
+                    for deletion in deletions
+                    if deletion.name not in referenced
+                ]
+                errors = executor.map(_delete_file, to_delete)
+                done, failed = [], []
+                for deletion, error in zip(to_delete, errors):
+                    if error is None:
+                        done.append(deletion.pk)
+                    else:
+                        _retry_later(deletion, error)
+                        failed.append(deletion)
+                FileDeletion.objects.filter(
+                    pk__in=done
+                    + [
+                        deletion.pk
+                        for deletion in deletions
+                        if deletion.name in referenced
+                    ]
+                ).delete()
+                FileDeletion.objects.bulk_update(
+                    failed, ["status", "attempts", "next_attempt", "last_error"]
+                )
+                deleted += len(done)
+            if len(deletions) < batch_size:
+                return deleted
+
+
+@celery.shared_task()
+def reconcile_stored_files():
+    """Record the deletion of the files of the storage that no row references.
+
+    Such orphans are left by the files written without the transaction of
+    their row committing, by the files reserved without any row referencing
+    them (see StoredFileQuerySet.reserve), or by the deletions recorded before
+    the files were counted. Only the files older than FILE_ORPHAN_GRACE hours are deleted,
+    the younger ones being possibly referenced by a transaction in progress.
+
+    Returns:
+        The number of orphan files.
+
+    """
+    storage = ContentAddressedStorage()
+    limit = timezone.now() - datetime.timedelta(hours=settings.FILE_ORPHAN_GRACE)
+    orphans = []
+    for names in _iter_content_names(storage):
+        known = set(
+            StoredFile.objects.filter(name__in=names, references__gt=0).values_list(
+                "name", flat=True
+            )
+        ) | set(
+            FileDeletion.objects.filter(name__in=names).values_list("name", flat=True)
+        )
+        orphans += [
+            FileDeletion(name=name, storage=get_storage_path(storage))
+            for name in names
+            if name not in known and storage.get_modified_time(name) < limit
+        ]
+    with transaction.atomic():
+        FileDeletion.objects.bulk_create(orphans)
+        if orphans:
+            logger.warning(f"{len(orphans)} orphan files are deleted.")
+            queue_file_deletions()
+    return len(orphans)
+
+
+def _iter_content_names(storage):
+    """Yield the names of the files of the storage, one directory at a time.
+
+    Yields:
+        The names of the files of a directory.
+
+    """
+    if not storage.exists(CONTENT_DIRECTORY):
+        return
+    directories, _files = storage.listdir(CONTENT_DIRECTORY)
+    for directory in sorted(directories):
+        path = f"{CONTENT_DIRECTORY}/{directory}"
+        _directories, files = storage.listdir(path)
+        if files:
+            yield [f"{path}/{name}" for name in files]
+
+
+def _delete_file(deletion):
+    """Delete the file of the deletion, returning the error raised if any."""
+    try:
+        _get_storage(deletion.storage).delete(deletion.name)
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_storage(path):
+    return import_string(path)()
+
+
+def _retry_later(deletion, error):
+    deletion.attempts += 1
+    deletion.last_error = error
+    if deletion.attempts >= settings.FILE_DELETION_MAX_ATTEMPTS:
+        deletion.status = FileDeletionStatus.FAILED
+        logger.error(f"The file {deletion.name} couldn't be deleted: {error}")
+    else:
+        deletion.next_attempt = timezone.now() + datetime.timedelta(
+            seconds=settings.FILE_DELETION_RETRY_DELAY * 2 ** (deletion.attempts - 1)
+        )
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _upload_directories(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.UPLOADS_PARTIAL_ROOT = str(tmp_path / "partial_uploads")
+
+
+@pytest.fixture(autouse=True)
+def _clear_throttling():
+    # The throttling history is kept in the cache.
+    cache.clear()
@@ -0,0 +1,218 @@
+import base64
+import os
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.throttling import ScopedRateThrottle
+
+from connect_access.core.loading import get_class, get_model
+
+pytestmark = pytest.mark.django_db
+
+UploadViewSet = get_class("uploads.api", "UploadViewSet")
+Upload = get_model("uploads", "Upload")
+MediationRequestStatus = get_class("mediations.choices", "MediationRequestStatus")
+MediationRequestFactory = get_class(
+    "mediations.tests.factories", "MediationRequestFactory"
+)
+TraceReportFactory = get_class(
+    "mediations.trace_report.tests.factories", "TraceReportFactory"
+)
+UserFactory = get_class("users.tests.factories", "UserFactory")
+make_attach_token = get_class("uploads.tokens", "make_attach_token")
+
+CONTENT = b"0123456789" * 10
+
+
+def _metadata(filename):
+    return f"filename {base64.b64encode(filename.encode()).decode()}"
+
+
+def _create(length=None, filename="screen recording.webm", user=None):
+    request = APIRequestFactory().post(
+        reverse("api:uploads-list"),
+        HTTP_UPLOAD_LENGTH=str(len(CONTENT) if length is None else length),
+        HTTP_UPLOAD_METADATA=_metadata(filename),
+    )
+    if user:
+        force_authenticate(request, user=user)
+    return UploadViewSet.as_view({"post": "create"})(request)
+
+
+def _send_chunk(upload, offset, chunk, user=None):
+    request = APIRequestFactory().patch(
+        reverse("api:uploads-detail", kwargs={"uuid": upload.uuid}),
+        data=chunk,
+        content_type="application/offset+octet-stream",
+        HTTP_UPLOAD_OFFSET=str(offset),
+    )
+    if user:
+        force_authenticate(request, user=user)
+    return UploadViewSet.as_view({"patch": "partial_update"})(request, uuid=upload.uuid)
+
+
+def _attach(upload, data, user=None):
+    request = APIRequestFactory().post(
+        reverse("api:uploads-attach", kwargs={"uuid": upload.uuid}),
+        data,
+        format="json",
+    )
+    if user:
+        force_authenticate(request, user=user)
+    return UploadViewSet.as_view({"post": "attach"})(request, uuid=upload.uuid)
+
+
+class TestAPI:
+    def test_upload_in_chunks_and_attach_to_an_anonymous_mediation_request(self):
+        response = _create()
+        assert response.status_code == 201
+        assert response["Upload-Offset"] == "0"
+        upload = Upload.objects.get()
+        assert response["Location"].endswith(f"/api/uploads/{upload.uuid}/")
+        assert upload.filename == "screen recording.webm"
+
+        response = _send_chunk(upload, 0, CONTENT[:60])
+        assert response.status_code == 204
+        assert response["Upload-Offset"] == "60"
+        request = APIRequestFactory().head(
+            reverse("api:uploads-detail", kwargs={"uuid": upload.uuid})
+        )
+        response = UploadViewSet.as_view({"get": "retrieve"})(request, uuid=upload.uuid)
+        assert response["Upload-Offset"] == "60"
+        assert response["Upload-Length"] == str(len(CONTENT))
+        assert response["Tus-Resumable"] == "1.0.0"
+        assert _send_chunk(upload, 60, CONTENT[60:]).status_code == 204
+
+        mediation_request = MediationRequestFactory(
+            complainant=None,
+            attached_file=None,
+            status=MediationRequestStatus.PENDING,
+        )
+        response = _attach(
+            upload,
+            {
+                "mediation_request": str(mediation_request.uuid),
+                "upload_token": make_attach_token(mediation_request),
+            },
+        )
+        assert response.status_code == 200
+        mediation_request.refresh_from_db()
+        with mediation_request.attached_file.open("rb") as attached_file:
+            assert attached_file.read() == CONTENT
+        assert not Upload.objects.exists()
+
+    def test_chunk_at_another_offset_is_refused(self):
+        _create()
+        upload = Upload.objects.get()
+        _send_chunk(upload, 0, CONTENT[:10])
+        response = _send_chunk(upload, 0, CONTENT[:10])
+        assert response.status_code == 409
+        assert response["Upload-Offset"] == "10"
+
+    def test_chunk_beyond_the_length_is_refused(self):
+        _create(length=5)
+        response = _send_chunk(Upload.objects.get(), 0, CONTENT[:10])
+        assert response.status_code == 400
+
+    def test_create_refuses_too_large_files(self, settings):
+        settings.UPLOADS_MAX_LENGTH = 10
+        assert _create(length=11).status_code == 413
+
+    def test_create_limits_the_files_of_anonymous_users_further(self, settings):
+        settings.UPLOADS_MAX_LENGTH = 10
+        settings.UPLOADS_ANONYMOUS_MAX_LENGTH = 5
+        assert _create(length=6).status_code == 413
+        assert _create(length=6, user=UserFactory()).status_code == 201
+
+    def test_create_is_throttled(self, monkeypatch):
+        monkeypatch.setattr(ScopedRateThrottle, "THROTTLE_RATES", {"uploads": "2/hour"})
+        assert _create().status_code == 201
+        assert _create().status_code == 201
+        assert _create().status_code == 429
+
+    def test_chunks_are_not_throttled(self, monkeypatch):
+        monkeypatch.setattr(ScopedRateThrottle, "THROTTLE_RATES", {"uploads": "1/hour"})
+        _create()
+        upload = Upload.objects.get()
+        assert _send_chunk(upload, 0, CONTENT[:10]).status_code == 204
+        assert _send_chunk(upload, 10, CONTENT[10:]).status_code == 204
+
+    @pytest.mark.parametrize("upload_token", [None, "", "forged"])
+    def test_attach_to_an_anonymous_mediation_request_requires_its_token(
+        self, upload_token
+    ):
+        _create()
+        upload = Upload.objects.get()
+        _send_chunk(upload, 0, CONTENT)
+        mediation_request = MediationRequestFactory(
+            complainant=None,
+            attached_file=None,
+            status=MediationRequestStatus.PENDING,
+        )
+        data = {"mediation_request": str(mediation_request.uuid)}
+        if upload_token is not None:
+            data["upload_token"] = upload_token
+        assert _attach(upload, data).status_code == 403
+
+    def test_attach_with_the_token_of_another_mediation_request_is_forbidden(self):
+        _create()
+        upload = Upload.objects.get()
+        _send_chunk(upload, 0, CONTENT)
+        (
+            mediation_request,
+            other_mediation_request,
+        ) = MediationRequestFactory.create_batch(
+            2,
+            complainant=None,
+            attached_file=None,
+            status=MediationRequestStatus.PENDING,
+        )
+        response = _attach(
+            upload,
+            {
+                "mediation_request": str(mediation_request.uuid),
+                "upload_token": make_attach_token(other_mediation_request),
+            },
+        )
+        assert response.status_code == 403
+
+    def test_create_requires_a_filename(self):
+        assert _create(filename="").status_code == 400
+
+    def test_upload_of_a_user_is_forbidden_to_others(self):
+        _create(user=UserFactory())
+        response = _send_chunk(Upload.objects.get(), 0, CONTENT, user=UserFactory())
+        assert response.status_code == 403
+
+    def test_incomplete_upload_is_not_attached(self):
+        user = UserFactory()
+        _create(user=user)
+        upload = Upload.objects.get()
+        mediation_request = MediationRequestFactory(complainant=user)
+        response = _attach(
+            upload, {"mediation_request": str(mediation_request.uuid)}, user=user
+        )
+        assert response.status_code == 409
+
+    def test_attach_to_a_trace_report_is_reserved_to_the_staff(self):
+        _create()
+        upload = Upload.objects.get()
+        _send_chunk(upload, 0, CONTENT)
+        response = _attach(upload, {"trace_report": str(TraceReportFactory().uuid)})
+        assert response.status_code == 403
+
+    def test_destroy_deletes_the_partial_file(self, django_capture_on_commit_callbacks):
+        _create()
+        upload = Upload.objects.get()
+        _send_chunk(upload, 0, CONTENT[:10])
+        assert os.path.exists(upload.partial_path)
+        request = APIRequestFactory().delete(
+            reverse("api:uploads-detail", kwargs={"uuid": upload.uuid})
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            response = UploadViewSet.as_view({"delete": "destroy"})(
+                request, uuid=upload.uuid
+            )
+        assert response.status_code == 204
+        assert not os.path.exists(upload.partial_path)
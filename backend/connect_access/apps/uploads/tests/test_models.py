@@ -0,0 +1,41 @@
+import io
+
+import pytest
+from django.http import UnreadablePostError
+
+from connect_access.core.loading import get_model
+
+pytestmark = pytest.mark.django_db
+
+Upload = get_model("uploads", "Upload")
+
+
+class BrokenStream(io.BytesIO):
+    """Stream whose connection breaks after its content."""
+
+    def read(self, size=-1):
+        block = super().read(size)
+        if not block:
+            raise UnreadablePostError("connection lost")
+        return block
+
+
+class TestModels:
+    def test_append_keeps_the_bytes_received_before_a_broken_connection(self):
+        upload = Upload.objects.create(filename="file.txt", length=10)
+        assert upload.append(BrokenStream(b"abcd"), 10) == 4
+        upload.refresh_from_db()
+        assert upload.offset == 4
+        assert upload.append(io.BytesIO(b"efghij"), 6) == 6
+        with open(upload.partial_path, "rb") as partial:
+            assert partial.read() == b"abcdefghij"
+        assert upload.is_complete
+
+    def test_append_drops_the_bytes_beyond_the_offset(self):
+        upload = Upload.objects.create(filename="file.txt", length=6)
+        upload.append(io.BytesIO(b"abc"), 3)
+        with open(upload.partial_path, "ab") as partial:
+            partial.write(b"xyz")
+        upload.append(io.BytesIO(b"def"), 3)
+        with open(upload.partial_path, "rb") as partial:
+            assert partial.read() == b"abcdef"
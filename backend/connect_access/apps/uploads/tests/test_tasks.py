@@ -0,0 +1,136 @@
+import datetime
+import io
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+
+from connect_access.core.loading import get_class, get_classes, get_model
+
+pytestmark = pytest.mark.django_db
+
+Upload = get_model("uploads", "Upload")
+StoredFile = get_model("uploads", "StoredFile")
+FileDeletion = get_model("uploads", "FileDeletion")
+FileDeletionStatus = get_class("uploads.choices", "FileDeletionStatus")
+if TYPE_CHECKING:
+    from connect_access.apps.uploads.storages import ContentAddressedStorage
+else:
+    ContentAddressedStorage = get_class("uploads.storages", "ContentAddressedStorage")
+purge_expired_uploads, delete_files, reconcile_stored_files = get_classes(
+    "uploads.tasks",
+    ["purge_expired_uploads", "delete_files", "reconcile_stored_files"],
+)
+
+
+class BrokenStorage(ContentAddressedStorage):
+    def delete(self, name):
+        raise OSError("Disk unavailable")
+
+
+def store(content):
+    storage = ContentAddressedStorage()
+    name = storage.save("file.txt", ContentFile(content))
+    StoredFile.objects.acquire(name)
+    return storage, name
+
+
+class TestTasks:
+    def test_purge_expired_uploads_deletes_the_old_uploads_and_their_files(
+        self, django_capture_on_commit_callbacks
+    ):
+        expired = Upload.objects.create(filename="expired.txt", length=10)
+        expired.append(io.BytesIO(b"abc"), 3)
+        Upload.objects.filter(pk=expired.pk).update(
+            modified=timezone.now() - datetime.timedelta(hours=25)
+        )
+        recent = Upload.objects.create(filename="recent.txt", length=10)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert purge_expired_uploads() == 1
+        assert list(Upload.objects.all()) == [recent]
+        assert not os.path.exists(expired.partial_path)
+
+    def test_released_files_are_deleted_by_batches_after_commit(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        files = [store(f"content {index}".encode()) for index in range(5)]
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            for storage, name in files:
+                StoredFile.objects.release(name, storage)
+        # The deletions are queued once for the transaction.
+        assert len(callbacks) == 1
+        assert all(storage.exists(name) for storage, name in files)
+        assert delete_files(batch_size=2) == 5
+        assert not any(storage.exists(name) for storage, name in files)
+        assert not FileDeletion.objects.exists()
+
+    def test_rolled_back_release_keeps_the_file(self):
+        storage, name = store(b"content")
+        with transaction.atomic():
+            StoredFile.objects.release(name, storage)
+            transaction.set_rollback(True)
+        assert StoredFile.objects.get(name=name).references == 1
+        assert not FileDeletion.objects.exists()
+        assert storage.exists(name)
+
+    def test_delete_files_keeps_the_files_referenced_again(self):
+        storage, name = store(b"content")
+        StoredFile.objects.release(name, storage)
+        # Referenced again by a row saved without the receivers, like a fixture.
+        StoredFile.objects.create(name=name, references=1)
+        assert delete_files() == 0
+        assert storage.exists(name)
+        assert not FileDeletion.objects.exists()
+
+    def test_storing_a_released_file_again_cancels_its_deletion(self):
+        storage, name = store(b"content")
+        StoredFile.objects.release(name, storage)
+        assert FileDeletion.objects.filter(name=name).exists()
+        # Reused before the row referencing it again is saved.
+        assert storage.save("other.txt", ContentFile(b"content")) == name
+        assert not FileDeletion.objects.exists()
+        assert delete_files() == 0
+        assert storage.exists(name)
+        StoredFile.objects.acquire(name)
+        assert StoredFile.objects.get(name=name).references == 1
+
+    def test_delete_files_retries_later_then_fails(self, settings):
+        settings.FILE_DELETION_MAX_ATTEMPTS = 2
+        storage = ContentAddressedStorage()
+        name = storage.save("file.txt", ContentFile(b"content"))
+        deletion = FileDeletion.objects.create(
+            name=name, storage=f"{__name__}.BrokenStorage"
+        )
+        assert delete_files() == 0
+        deletion.refresh_from_db()
+        assert deletion.status == FileDeletionStatus.PENDING
+        assert deletion.attempts == 1
+        assert deletion.next_attempt > timezone.now()
+        assert deletion.last_error == "OSError: Disk unavailable"
+        assert delete_files() == 0
+        FileDeletion.objects.update(next_attempt=timezone.now())
+        assert delete_files() == 0
+        deletion.refresh_from_db()
+        assert deletion.status == FileDeletionStatus.FAILED
+        assert storage.exists(name)
+
+    def test_reconcile_stored_files_deletes_the_old_orphans(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.CELERY_TASK_ALWAYS_EAGER = True
+        settings.FILE_ORPHAN_GRACE = 1
+        storage, referenced = store(b"referenced")
+        orphan = storage.save("orphan.txt", ContentFile(b"orphan"))
+        recent_orphan = storage.save("recent.txt", ContentFile(b"recent"))
+        two_hours_ago = (timezone.now() - datetime.timedelta(hours=2)).timestamp()
+        for name in (referenced, orphan):
+            os.utime(storage.path(name), (two_hours_ago, two_hours_ago))
+        with django_capture_on_commit_callbacks(execute=True):
+            assert reconcile_stored_files() == 1
+        assert not storage.exists(orphan)
+        assert storage.exists(referenced)
+        assert storage.exists(recent_orphan)
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core import signing
+
+SALT = "connect_access.uploads.attach"
+
+
+def make_attach_token(instance):
+    """Return the token letting a submitter without account attach a file to instance.
+
+    The token is signed, so that nothing is stored, and expires after
+    UPLOADS_EXPIRATION hours, like the uploads.
+
+    """
+    return signing.dumps(_get_value(instance), salt=SALT)
+
+
+def check_attach_token(token, instance):
+    """Tell whether token, made by make_attach_token, is the one of instance."""
+    try:
+        value = signing.loads(
+            token, salt=SALT, max_age=settings.UPLOADS_EXPIRATION * 3600
+        )
+    except signing.BadSignature:
+        return False
+    return value == _get_value(instance)
+
+
+def _get_value(instance):
+    return f"{instance._meta.label_lower}:{instance.uuid}"
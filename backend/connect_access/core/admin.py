@@ -1,7 +1,10 @@
+import uuid
 from typing import Optional, Tuple
 
 from django.utils.translation import gettext_lazy as _
 
+from connect_access.models.search import search
+
 
 class ModelAdminMixin:
     _fieldsets = None
@@ -35,3 +38,23 @@ class ModelAdminMixin:
     @fieldsets.setter
     def fieldsets(self, value) -> None:
         self._fieldsets = value
+
+
+class FullTextSearchAdminMixin:
+    """Search the admin list on the search vector of the model.
+
+    The search box is shown as long as search_fields is not empty. A public
+    identifier (uuid) given as search term is looked up exactly.
+
+    """
+
+    search_fields: Tuple[str, ...] = ("uuid",)
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        try:
+            return queryset.filter(uuid=uuid.UUID(search_term)), False
+        except ValueError:
+            return search(queryset, search_term), False
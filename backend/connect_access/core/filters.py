@@ -0,0 +1,26 @@
+from rest_framework.filters import BaseFilterBackend
+
+from connect_access.models.search import search
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Full-text search on the search vector of the model, ordered by relevance.
+
+    The terms are given in the ``q`` query parameter, with the web search
+    syntax, and are stemmed according to the language of the request. An
+    explicit ordering (OrderingFilter placed after this backend) replaces the
+    relevance ordering.
+
+    """
+
+    search_param = "q"
+
+    def is_filtering(self, request):
+        """Tell whether search terms are given."""
+        return bool(request.query_params.get(self.search_param, "").strip())
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms:
+            return queryset
+        return search(queryset, terms)
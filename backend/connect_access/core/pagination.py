@@ -0,0 +1,176 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (a.k.a. seek) pagination with an opaque cursor.
+
+    The position in the list is given by the values of the ordering fields of
+    the last returned row, so fetching a page is an index range scan whatever
+    its depth, unlike offset pagination. The ordering of the queryset is used,
+    and the primary key is appended to it when missing to make it total.
+
+    Pagination is opt-in to keep the list endpoints backward compatible: a
+    response is paginated only when the request carries the page size or the
+    cursor query parameter.
+
+    """
+
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def __init__(self):
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 100)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 1000)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+
+        results = list(page_queryset)
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_page_queryset(self, queryset, request, always=False):
+        """Return the rows of the requested page, and the first of the next one.
+
+        With always, the request is paginated even without the query parameters.
+
+        Returns:
+            The sliced queryset, or None when the request isn't paginated.
+
+        """
+        params = request.query_params
+        if (
+            not always
+            and self.page_size_query_param not in params
+            and self.cursor_query_param not in params
+        ):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded_cursor = params.get(self.cursor_query_param)
+        if encoded_cursor:
+            position = self.decode_cursor(encoded_cursor, queryset.model)
+            queryset = queryset.filter(self._seek_filter(position))
+        return queryset[: self.page_size + 1]
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    @staticmethod
+    def get_ordering(queryset):
+        ordering = [
+            field for field in queryset.query.order_by if isinstance(field, str)
+        ]
+        pk_name = queryset.model._meta.pk.name
+        if not {f"-{pk_name}", pk_name, "-pk", "pk"} & set(ordering):
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        position = [self._get_value(last, field.lstrip("-")) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position)
+        )
+
+    def encode_cursor(self, position):
+        payload = json.dumps(
+            {"o": self.ordering, "p": position}, default=self._encode_value
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, encoded_cursor, model):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode()))
+            if payload["o"] != self.ordering or len(payload["p"]) != len(self.ordering):
+                raise ValueError("The cursor was made for another ordering.")
+            return [
+                self._decode_value(model, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, payload["p"])
+            ]
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _seek_filter(self, position):
+        """Build the WHERE clause selecting the rows after the given position.
+
+        For an ordering (a, b, c), it is a > x OR (a = x AND b > y) OR
+        (a = x AND b = y AND c > z), with the comparison operators flipped for
+        descending fields. The redundant bound on the leading field lets the
+        planner turn it into a range scan on the composite index.
+
+        """
+        seek = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            seek |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        leading = self.ordering[0]
+        leading_lookup = "lte" if leading.startswith("-") else "gte"
+        return Q(**{f"{leading.lstrip('-')}__{leading_lookup}": position[0]}) & seek
+
+    @staticmethod
+    def _get_value(instance, name):
+        if isinstance(instance, dict):  # .values() row
+            return instance[name]
+        if name == "pk":
+            return instance.pk
+        return getattr(instance, name)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def _decode_value(model, name, value):
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations, such as a search rank, keep their JSON value.
+            return value
+        return field.to_python(value)
@@ -0,0 +1,33 @@
+import json
+
+from django.conf import settings
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Parse newline delimited JSON into the list of its documents.
+
+    The stream is read line by line, blank lines being ignored.
+
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        documents = []
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                documents.append(json.loads(line.decode(encoding)))
+            except ValueError as error:
+                raise ParseError(
+                    _("NDJSON parse error on line %(number)d - %(error)s")
+                    % {"number": number, "error": error}
+                )
+        return documents
@@ -1,10 +1,181 @@
-from django.core.mail import EmailMultiAlternatives
+import logging
+from smtplib import SMTPException
+
+import celery
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.core.mail import BadHeaderError, EmailMultiAlternatives, get_connection
+from django.db import transaction
 from django.template.loader import get_template
+from django.utils import translation
+from kombu.exceptions import OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+@celery.shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=10,
+    retry_backoff_max=30 * 60,
+    retry_jitter=True,
+    max_retries=8,
+)
+def send_multialternative_mail(context, subject, to, content_filename, language=None):
+    """Render and send an email with a text and an HTML version.
+
+    SMTP and connection errors are retried with an exponential backoff. The
+    arguments have to be serializable to JSON, and the templates are rendered
+    in the given language.
+
+    """
+    # Send with the backend behind the Celery email backend, if any, as we
+    # are already in a task.
+    connection = get_connection(getattr(settings, "CELERY_EMAIL_BACKEND", None))
+    msg = _build_multialternative_mail(
+        context, subject, to, content_filename, language, connection
+    )
+    try:
+        msg.send()
+    except BadHeaderError as error:
+        logger.error(
+            f"The header of the email {content_filename} was incorrectly formed. "
+            f"The email couldn't be sent. Actual error: {error}"
+        )
 
 
-def send_multialternative_mail(context, subject, to, content_filename):
-    text_content = get_template(f"{content_filename}.txt").render(context)
-    html_content = get_template(f"{content_filename}.html").render(context)
-    msg = EmailMultiAlternatives(subject, text_content, None, to)
+def _build_multialternative_mail(
+    context, subject, to, content_filename, language, connection
+):
+    with translation.override(language):
+        text_content = get_template(f"{content_filename}.txt").render(context)
+        html_content = get_template(f"{content_filename}.html").render(context)
+    msg = EmailMultiAlternatives(subject, text_content, None, to, connection=connection)
     msg.attach_alternative(html_content, "text/html")
-    msg.send()
+    return msg
+
+
+@celery.shared_task(bind=True, max_retries=8)
+def send_multialternative_mails(self, mails, language=None):
+    """Render and send several emails over a single connection.
+
+    mails is a list of dicts holding the arguments of send_multialternative_mail.
+    On SMTP and connection errors, only the emails not sent yet are retried,
+    with the backoff of send_multialternative_mail.
+
+    """
+    connection = get_connection(getattr(settings, "CELERY_EMAIL_BACKEND", None))
+    sent = 0
+    try:
+        with connection:
+            for mail in mails:
+                msg = _build_multialternative_mail(
+                    mail["context"],
+                    mail["subject"],
+                    mail["to"],
+                    mail["content_filename"],
+                    language,
+                    connection,
+                )
+                try:
+                    msg.send()
+                except BadHeaderError as error:
+                    logger.error(
+                        f"The header of the email {mail['content_filename']} was "
+                        f"incorrectly formed. The email couldn't be sent. "
+                        f"Actual error: {error}"
+                    )
+                sent += 1
+    except (SMTPException, OSError) as error:
+        # Raises Retry.
+        self.retry(
+            args=(mails[sent:],),
+            kwargs={"language": language},
+            exc=error,
+            countdown=get_exponential_backoff_interval(
+                factor=10,
+                retries=self.request.retries,
+                maximum=30 * 60,
+                full_jitter=True,
+            ),
+        )
+
+
+def send_multialternative_mail_on_commit(context, subject, to, content_filename):
+    """Send the email once the current transaction is committed.
+
+    With a transactional email backend (see OutboxEmailBackend), the email is
+    handed to it right away, and is part of the transaction. Otherwise it is
+    sent from a task queued on commit, a failure to reach the broker being
+    logged without failing the request that triggered the email. The subject
+    is translated, and the templates rendered, in the current language.
+
+    """
+    connection = get_connection()
+    if getattr(connection, "transactional", False):
+        _build_multialternative_mail(
+            context,
+            str(subject),
+            to,
+            content_filename,
+            translation.get_language(),
+            connection,
+        ).send()
+        return
+
+    kwargs = {
+        "context": context,
+        "subject": str(subject),
+        "to": to,
+        "content_filename": content_filename,
+        "language": translation.get_language(),
+    }
+
+    def enqueue():
+        try:
+            send_multialternative_mail.delay(**kwargs)
+        except OperationalError as error:
+            logger.error(
+                f"The email {content_filename} couldn't be queued. "
+                f"Actual error: {error}"
+            )
+
+    transaction.on_commit(enqueue)
+
+
+def send_multialternative_mails_on_commit(mails, batch_size=100):
+    """Send several emails once the current transaction is committed.
+
+    Like send_multialternative_mail_on_commit, but the emails are handed to a
+    transactional backend all at once, or sent from one task per batch.
+
+    """
+    mails = [{**mail, "subject": str(mail["subject"])} for mail in mails]
+    language = translation.get_language()
+    connection = get_connection()
+    if getattr(connection, "transactional", False):
+        connection.send_messages(
+            [
+                _build_multialternative_mail(
+                    mail["context"],
+                    mail["subject"],
+                    mail["to"],
+                    mail["content_filename"],
+                    language,
+                    connection,
+                )
+                for mail in mails
+            ]
+        )
+        return
+
+    def enqueue():
+        for start in range(0, len(mails), batch_size):
+            batch = mails[start : start + batch_size]  # noqa: E203
+            try:
+                send_multialternative_mails.delay(batch, language=language)
+            except OperationalError as error:
+                logger.error(
+                    f"{len(batch)} emails couldn't be queued. Actual error: {error}"
+                )
+
+    transaction.on_commit(enqueue)
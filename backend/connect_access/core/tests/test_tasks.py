@@ -0,0 +1,83 @@
+from smtplib import SMTPException
+
+from celery.exceptions import Retry
+from django.core import mail
+
+from connect_access.core.tasks import (
+    send_multialternative_mail,
+    send_multialternative_mails,
+)
+
+
+class TestTasks:
+    def _send(self, subject="Subject"):
+        return send_multialternative_mail.apply(
+            kwargs={
+                "context": {"id": "12345678"},
+                "subject": subject,
+                "to": ["john@doe.com"],
+                "content_filename": "mediations/emails/user_request_creation",
+                "language": "fr",
+            }
+        )
+
+    def test_send_multialternative_mail_renders_in_the_given_language(self):
+        result = self._send()
+        assert result.successful()
+        assert len(mail.outbox) == 1
+        email = mail.outbox[0]
+        assert isinstance(email, mail.EmailMultiAlternatives)
+        assert "12345678" in email.body
+        assert email.alternatives[0][1] == "text/html"
+
+    def test_send_multialternative_mail_is_retried_on_smtp_errors(self, monkeypatch):
+        def send(*args, **kwargs):
+            raise SMTPException("Service unavailable")
+
+        retried = []
+
+        def retry(*args, exc=None, **kwargs):
+            retried.append(exc)
+            raise Retry(exc=exc)
+
+        monkeypatch.setattr(mail.EmailMultiAlternatives, "send", send)
+        monkeypatch.setattr(send_multialternative_mail, "retry", retry)
+        assert self._send().state == "RETRY"
+        assert isinstance(retried[0], SMTPException)
+
+    def test_send_multialternative_mail_with_bad_header_is_not_sent(self):
+        result = self._send(subject="Subject\nBcc: spam@example.com")
+        assert result.successful()
+        assert len(mail.outbox) == 0
+
+    def test_send_multialternative_mails_retries_only_the_unsent_emails(
+        self, monkeypatch
+    ):
+        mails = [
+            {
+                "context": {"id": str(i)},
+                "subject": f"Subject {i}",
+                "to": [f"{i}@doe.com"],
+                "content_filename": "mediations/emails/user_request_creation",
+            }
+            for i in range(3)
+        ]
+        send = mail.EmailMultiAlternatives.send
+
+        def send_two(msg, *args, **kwargs):
+            if len(mail.outbox) == 2:
+                raise SMTPException("Service unavailable")
+            return send(msg, *args, **kwargs)
+
+        retried = []
+
+        def retry(*args, **kwargs):
+            retried.append(kwargs)
+            raise Retry(exc=kwargs["exc"])
+
+        monkeypatch.setattr(mail.EmailMultiAlternatives, "send", send_two)
+        monkeypatch.setattr(send_multialternative_mails, "retry", retry)
+        result = send_multialternative_mails.apply(args=(mails,))
+        assert result.state == "RETRY"
+        assert [email.to for email in mail.outbox] == [["0@doe.com"], ["1@doe.com"]]
+        assert retried[0]["args"] == (mails[2:],)
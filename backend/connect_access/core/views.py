@@ -0,0 +1,452 @@
+import asyncio
+import datetime
+import functools
+import hashlib
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import SlugRelatedField
+from rest_framework.response import Response
+
+from connect_access.core.pagination import KeysetPagination
+
+if TYPE_CHECKING:
+    from rest_framework import mixins, viewsets
+    from rest_framework.views import APIView as APIViewBase
+
+    class ViewSetMixinBase(
+        mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+    ):
+        """What the mixins below expect from the viewsets they are placed in."""
+
+        def get_list_response(self, queryset: Any) -> Response:
+            raise NotImplementedError
+
+        def get_list_data(self, queryset: Any) -> Any:
+            raise NotImplementedError
+
+else:
+    APIViewBase = object
+    ViewSetMixinBase = object
+
+
+class SparseFieldsetViewMixin(ViewSetMixinBase):
+    """Sparse fieldsets on the reads of a viewset.
+
+    The ``fields`` query parameter lists the fields to return, and the ``omit``
+    one the fields not to return, both comma separated. The serializer class
+    must accept a fields argument (see SparseFieldsetMixin).
+
+    The columns that are not needed by the remaining fields, nor by the
+    ordering, are deferred so that they are not even read from the database.
+
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def get_sparse_fieldset(self):
+        """Return the names of the fields to serialize, or None for all of them."""
+        if not hasattr(self, "_sparse_fieldset"):
+            self._sparse_fieldset = self._parse_sparse_fieldset()
+        return self._sparse_fieldset
+
+    def _parse_sparse_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        params = self.request.query_params
+        fields = self._get_names(params, self.fields_query_param)
+        omit = self._get_names(params, self.omit_query_param)
+        if fields is None and omit is None:
+            return None
+
+        # Serializers accepting a fields argument, see SparseFieldsetMixin.
+        serializer_class: Any = self.get_serializer_class()
+        all_fields = list(serializer_class(context={}).fields)
+        for param, names in (
+            (self.fields_query_param, fields),
+            (self.omit_query_param, omit),
+        ):
+            unknown = set(names or []) - set(all_fields)
+            if unknown:
+                raise ValidationError(
+                    {
+                        param: [
+                            _("Unknown field %(field)s.") % {"field": name}
+                            for name in sorted(unknown)
+                        ]
+                    }
+                )
+        return [
+            name
+            for name in all_fields
+            if (fields is None or name in fields) and (omit is None or name not in omit)
+        ]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_sparse_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fieldset()
+        if fields is None:
+            return queryset
+        serializer_class: Any = self.get_serializer_class()
+        serializer = serializer_class(context={}, fields=fields)
+        columns, related = self._get_columns(queryset, serializer.fields.values())
+        if columns is None:
+            return queryset
+        return queryset.select_related(*related).only(*columns)
+
+    @staticmethod
+    def _get_names(params, param):
+        if param not in params:
+            return None
+        return {
+            name.strip()
+            for values in params.getlist(param)
+            for name in values.split(",")
+            if name.strip()
+        }
+
+    @staticmethod
+    def _get_columns(queryset, serializer_fields):
+        """Return the model fields to load, and the relations to join.
+
+        None is returned for the columns if some serializer field does not map
+        to a model field, in which case nothing can be deferred safely.
+
+        """
+        opts = queryset.model._meta
+        columns, related = [], []
+        ordering = [
+            field.lstrip("-")
+            for field in queryset.query.order_by
+            if isinstance(field, str)
+        ]
+        for name in ordering:
+            try:
+                columns.append(opts.get_field(name).name)
+            except FieldDoesNotExist:
+                pass  # pk alias, or annotation such as a search rank
+        for field in serializer_fields:
+            if field.source == "*":
+                return None, []
+            name = field.source_attrs[0]
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return None, []
+            if model_field.is_relation and isinstance(field, SlugRelatedField):
+                related.append(name)
+                columns.append(f"{name}__{field.slug_field}")
+            else:
+                columns.append(name)
+        return columns, related
+
+
+class CompiledListViewMixin(ViewSetMixinBase):
+    """Serialize the lists of a viewset with the compiled plan of its serializer.
+
+    The rows are read with .values() and serialized in bulk (see
+    CompiledSerializerMixin), falling back on the serializer when it can't be
+    compiled. Sparse fieldsets and keyset pagination are supported.
+
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.get_list_response(self.filter_queryset(self.get_queryset()))
+
+    def get_list_response(self, queryset):
+        plan = self._get_plan()
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        # The paginator reads the position from the ordering columns.
+        ordering = [
+            field.lstrip("-")
+            for field in queryset.query.order_by
+            if isinstance(field, str)
+        ]
+        paths = [*plan.paths, *ordering, queryset.model._meta.pk.name]
+        rows = queryset.values(*dict.fromkeys(paths))
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, context))
+        return Response(plan.serialize(rows, context))
+
+    def get_list_data(self, queryset):
+        """Serialize all the rows of the queryset, without pagination."""
+        plan = self._get_plan()
+        if plan is None:
+            return self.get_serializer(queryset, many=True).data
+        return plan.serialize(
+            queryset.values(*plan.paths), self.get_serializer_context()
+        )
+
+    def _get_plan(self):
+        fields = None
+        if isinstance(self, SparseFieldsetViewMixin):
+            fields = self.get_sparse_fieldset()
+        # Serializers compiling their plan, see CompiledSerializerMixin.
+        serializer_class: Any = self.get_serializer_class()
+        return serializer_class.get_plan(fields)
+
+
+class ConditionalGetViewMixin(ViewSetMixinBase):
+    """Conditional GET on the lists and details of a viewset.
+
+    The ETag of a list is computed from the last modification date (see
+    TimeStampedModel) and the number of its rows, with a single aggregate
+    query: when it matches If-None-Match, a 304 is returned without reading nor
+    serializing the rows. The count accounts for deletions, which don't change
+    the last modification date, so lists have no Last-Modified header. Details
+    are given both, from the modification date of the row.
+
+    Responses are marked no-cache, so that browsers keep them and revalidate
+    them with the ETag. To be placed before CompiledListViewMixin.
+
+    """
+
+    def get_list_response(self, queryset):
+        page = self._get_page_queryset(queryset)
+        if page is not None:
+            etag = self._get_etag(
+                *(
+                    f"{pk}@{modified.isoformat()}"
+                    for pk, modified in page.values_list("pk", "modified")
+                )
+            )
+        else:
+            aggregate = queryset.order_by().aggregate(
+                last_modified=Max("modified"), count=Count("pk")
+            )
+            last_modified = aggregate["last_modified"]
+            etag = self._get_etag(
+                last_modified.isoformat() if last_modified else "", aggregate["count"]
+            )
+        not_modified = get_conditional_response(self.request, etag=etag)
+        response = not_modified or super().get_list_response(queryset)
+        return self._patch_response(response, etag)
+
+    def _get_page_queryset(self, queryset):
+        paginator = self.paginator
+        if paginator is None or not hasattr(paginator, "get_page_queryset"):
+            return None
+        return paginator.get_page_queryset(queryset, self.request)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self._get_etag(instance.modified.isoformat())
+        last_modified = int(instance.modified.timestamp())
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        response = not_modified or Response(self.get_serializer(instance).data)
+        response["Last-Modified"] = http_date(last_modified)
+        return self._patch_response(response, etag)
+
+    def _get_etag(self, *values):
+        # The representation also depends on the query string (sparse
+        # fieldsets, pages), and lists on the user (user action).
+        key = ":".join(
+            str(value)
+            for value in (*values, self.request.get_full_path(), self.request.user.pk)
+        )
+        return quote_etag(hashlib.sha256(key.encode()).hexdigest())
+
+    @staticmethod
+    def _patch_response(response, etag):
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class DeltaSyncViewMixin(ViewSetMixinBase):
+    """Changes of the list of a viewset since a date.
+
+    With the ``since`` query parameter, the list returns, instead of all its
+    rows, the rows created or modified since then (an index range scan on
+    modified), and the identifiers of the rows deleted since then (see
+    get_tombstones). The response gives the ``since`` value of the next call,
+    a bit earlier than the time of the call, so that rows committed late are
+    not missed: a row can thus be given twice, clients update their copy by
+    identifier.
+
+    The changes are paginated with KeysetPagination, API_SYNC_PAGE_SIZE rows
+    per page by default: while ``next`` gives the link of the following page,
+    ``deleted`` is empty and ``since`` null, both being given by the last page
+    only, so that the deletions made while the pages are read are included.
+
+    The deletions are kept API_SYNC_RETENTION days: clients asking for older
+    changes get a 410, and have to read the whole list again. Only the rows
+    actually deleted are returned as deletions: a row modified so that it
+    leaves the filters of the list is not reported at all, clients keeping a
+    filtered copy having to read the whole list again to drop such rows. To be
+    placed before ConditionalGetViewMixin.
+
+    """
+
+    since_query_param = "since"
+
+    def list(self, request, *args, **kwargs):
+        since = self.get_since()
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        now = timezone.now()
+        retention = datetime.timedelta(days=getattr(settings, "API_SYNC_RETENTION", 30))
+        if since < now - retention:
+            return Response(
+                {"message": _("since is too old, the whole list has to be read")},
+                status=status.HTTP_410_GONE,
+            )
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .filter(modified__gte=since)
+            .order_by("modified", "pk")
+        )
+        paginator = KeysetPagination()
+        paginator.page_size = getattr(settings, "API_SYNC_PAGE_SIZE", 1000)
+        page_queryset = paginator.get_page_queryset(queryset, request, always=True)
+        changed = self.get_list_data(page_queryset)
+        paginator.has_next = len(changed) > paginator.page_size
+        if paginator.has_next:
+            changed = changed[: paginator.page_size]
+            names = [field.lstrip("-") for field in paginator.ordering]
+            paginator.page = [
+                dict(
+                    zip(
+                        names,
+                        page_queryset.values_list(*names)[paginator.page_size - 1],
+                    )
+                )
+            ]
+            return Response(
+                {
+                    "next": paginator.get_next_link(),
+                    "changed": changed,
+                    "deleted": [],
+                    "since": None,
+                }
+            )
+        deleted = self.get_tombstones().filter(deleted__gte=since)
+        overlap = datetime.timedelta(seconds=getattr(settings, "API_SYNC_OVERLAP", 60))
+        return Response(
+            {
+                "next": None,
+                "changed": changed,
+                "deleted": [
+                    str(uuid) for uuid in deleted.values_list("uuid", flat=True)
+                ],
+                "since": (now - overlap).isoformat(),
+            }
+        )
+
+    def get_since(self):
+        value = self.request.query_params.get(self.since_query_param)
+        if not value:
+            return None
+        try:
+            return serializers.DateTimeField().to_internal_value(value)
+        except serializers.ValidationError as error:
+            raise ValidationError({self.since_query_param: error.detail})
+
+    def get_tombstones(self):
+        """Return the tombstones of the deleted rows, with uuid and deleted.
+
+        Raises:
+            NotImplementedError: to be implemented by the viewsets.
+
+        """
+        raise NotImplementedError("get_tombstones() must be implemented.")
+
+
+class AsyncViewMixin(APIViewBase):
+    """Asynchronous handlers, defined with ``async def``, in DRF views.
+
+    DRF 3.13 only calls synchronous handlers, and Django 4.0 only runs
+    asynchronous function views. When a handler of the view is asynchronous,
+    as_view thus returns an asynchronous view. The authentication, the
+    permissions and the throttling, which can read the database, run in a
+    thread, like the synchronous handlers of the view. The asynchronous
+    handlers run on the event loop, awaiting their database accesses with
+    sync_to_async, the ORM having no asynchronous interface before Django
+    4.1, in transactions of their own: ATOMIC_REQUESTS doesn't apply to the
+    view, a transaction being unable to span the thread and the event loop,
+    and the one of the thread only costing a round trip. Under WSGI,
+    Django runs the view in an event loop of its own. To be placed first in
+    the bases of the view.
+
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+        # The actions of a viewset, or the methods of a view.
+        handler_names = getattr(view, "actions", {}).values() or cls.http_method_names
+        if not any(
+            asyncio.iscoroutinefunction(getattr(cls, name, None))
+            for name in handler_names
+        ):
+            return view
+
+        async def async_view(request, *args, **kwargs):
+            response = await sync_to_async(view)(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        functools.update_wrapper(async_view, view)
+        return transaction.non_atomic_requests(async_view)
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return the response, or a coroutine for an asynchronous handler.
+
+        Returns:
+            The response, or a coroutine returning it.
+
+        """
+        method = request.method.lower()
+        handler = getattr(self, method, None)
+        if method not in self.http_method_names or not asyncio.iscoroutinefunction(
+            handler
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            self.initial(request, *args, **kwargs)
+        except Exception as exc:
+            self.response = self.finalize_response(
+                request, self.handle_exception(exc), *args, **kwargs
+            )
+            return self.response
+        return self._dispatch_async(handler, request, *args, **kwargs)
+
+    async def _dispatch_async(self, handler, request, *args, **kwargs):
+        try:
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
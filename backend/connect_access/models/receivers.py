@@ -1,46 +1,94 @@
+import functools
+
+from django.apps import apps
 from django.db import models
-from django.db.models.signals import post_delete, pre_save
-from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 
+from connect_access.core.loading import get_model
 
-@receiver(post_delete)
-def delete_files_when_row_deleted_from_db(sender, instance, **kwargs):
-    """Whenever ANY model is deleted, if it has a file field on it, delete the associated file too."""
-    for field in sender._meta.concrete_fields:
-        if isinstance(field, models.FileField):
-            instance_file_field = getattr(instance, field.name)
-            delete_file_if_unused(sender, instance, field, instance_file_field)
+StoredFile = get_model("uploads", "StoredFile")
 
 
-@receiver(pre_save)
-def delete_files_when_file_changed(sender, instance, **kwargs):
-    """Delete the file if something else get uploaded in its place."""
-    # Don't run on initial save
-    if not instance.pk:
-        return
-    for field in sender._meta.concrete_fields:
-        if isinstance(field, models.FileField):
-            # its got a file field. Let's see if it changed
-            try:
-                instance_in_db = sender.objects.get(pk=instance.pk)
-            except sender.DoesNotExist:
-                # We are probably in a transaction and the PK is just temporary
-                # Don't worry about deleting attachments if they aren't actually saved yet.
-                return
-            instance_in_db_file_field = getattr(instance_in_db, field.name)
-            instance_file_field = getattr(instance, field.name)
-            if instance_in_db_file_field.name != instance_file_field.name:
-                delete_file_if_unused(
-                    sender, instance, field, instance_in_db_file_field
-                )
-
-
-def delete_file_if_unused(model, instance, field, instance_file_field):
-    """Only delete the file if no other instances of that model are using it."""
-    dynamic_field = {}
-    dynamic_field[field.name] = instance_file_field.name
-    other_refs_exist = (
-        model.objects.filter(**dynamic_field).exclude(pk=instance.pk).exists()
+@functools.lru_cache(maxsize=None)
+def get_file_fields(model):
+    """Return the file fields of model, computed once per model."""
+    return tuple(
+        field
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
     )
-    if not other_refs_exist:
-        instance_file_field.delete(False)
+
+
+def remember_file_names(sender, instance, **kwargs):
+    """Remember the names of the files an instance is loaded with.
+
+    Compared with the names of the saved files to count their references,
+    without reading the row again. Deferred fields are not remembered.
+
+    """
+    instance._original_file_names = {
+        field.attname: _get_name(instance.__dict__[field.attname])
+        for field in get_file_fields(sender)
+        if field.attname in instance.__dict__
+    }
+
+
+def remember_deferred_file_names(sender, instance, update_fields=None, **kwargs):
+    """Read the original names of the deferred file fields given a value since loaded."""
+    if instance._state.adding:
+        return
+    original_file_names = instance.__dict__.setdefault("_original_file_names", {})
+    for field in get_file_fields(sender):
+        if (
+            field.attname not in original_file_names
+            and field.attname in instance.__dict__
+            and (update_fields is None or field.name in update_fields)
+        ):
+            original_file_names[field.attname] = _get_name(
+                sender._base_manager.filter(pk=instance.pk)
+                .values_list(field.attname, flat=True)
+                .first()
+            )
+
+
+def count_files_when_file_changed(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    """Count a reference to the saved files, and release the ones they replaced."""
+    original_file_names = instance.__dict__.setdefault("_original_file_names", {})
+    for field in get_file_fields(sender):
+        if field.attname not in instance.__dict__ or (
+            update_fields is not None and field.name not in update_fields
+        ):
+            continue
+        original_name = "" if created else original_file_names.get(field.attname, "")
+        name = _get_name(instance.__dict__[field.attname])
+        original_file_names[field.attname] = name
+        if name == original_name:
+            continue
+        if name:
+            StoredFile.objects.acquire(name)
+        if original_name:
+            StoredFile.objects.release(original_name, field.storage)
+
+
+def release_files_when_row_deleted_from_db(sender, instance, **kwargs):
+    """Whenever a model with a file field is deleted, release the associated files."""
+    for field in get_file_fields(sender):
+        instance_file_field = getattr(instance, field.name)
+        if instance_file_field.name:
+            StoredFile.objects.release(instance_file_field.name, field.storage)
+
+
+def _get_name(value):
+    return getattr(value, "name", value) or ""
+
+
+# Connected only to the models having file fields, so that the others don't
+# pay for them.
+for model in apps.get_models():
+    if get_file_fields(model):
+        post_init.connect(remember_file_names, sender=model)
+        pre_save.connect(remember_deferred_file_names, sender=model)
+        post_save.connect(count_files_when_file_changed, sender=model)
+        post_delete.connect(release_files_when_row_deleted_from_db, sender=model)
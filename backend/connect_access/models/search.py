@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+from django.utils import translation
+
+# PostgreSQL text search configurations of the languages in LANGUAGES.
+TEXT_SEARCH_CONFIGS = {
+    "fr": "french",
+    "en": "english",
+}
+DEFAULT_TEXT_SEARCH_CONFIG = "simple"
+
+
+def get_search_configs():
+    """Return the text search configurations used to index the documents."""
+    configs = []
+    for language, _name in settings.LANGUAGES:
+        config = TEXT_SEARCH_CONFIGS.get(language[:2], DEFAULT_TEXT_SEARCH_CONFIG)
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def get_search_config(language=None):
+    """Return the text search configuration of the (current) language."""
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    return TEXT_SEARCH_CONFIGS.get(language[:2], DEFAULT_TEXT_SEARCH_CONFIG)
+
+
+def search(queryset, terms, field="search_vector"):
+    """Filter the queryset on the terms and order it by relevance.
+
+    The terms use the web search syntax (quotes, "or", "-"). The rank is
+    available on the results as ``search_rank``.
+
+    """
+    query = SearchQuery(terms, config=get_search_config(), search_type="websearch")
+    return (
+        queryset.filter(**{field: query})
+        .annotate(search_rank=SearchRank(F(field), query))
+        .order_by("-search_rank", "-pk")
+    )
+
+
+def _search_vector_sql(weighted_columns, prefix=""):
+    """Build the tsvector expression of the weighted columns.
+
+    Free text columns are indexed with the configuration of every language of
+    LANGUAGES, so that a search in any of them matches the stemmed words.
+    Names are indexed without stemming.
+
+    """
+    parts = []
+    for column, weight, stemmed in weighted_columns:
+        configs = get_search_configs() if stemmed else [DEFAULT_TEXT_SEARCH_CONFIG]
+        for config in configs:
+            parts.append(
+                f"setweight(to_tsvector('{config}', "
+                f"coalesce({prefix}\"{column}\", '')), '{weight}')"
+            )
+    return " || ".join(parts)
+
+
+def create_search_vector_trigger(schema_editor, model, weighted_columns):
+    """Keep model.search_vector up to date with a trigger, and fill it.
+
+    weighted_columns is a list of (column, weight, stemmed) tuples.
+
+    """
+    table = model._meta.db_table
+    columns = ", ".join(f'"{column}"' for column, _weight, _stemmed in weighted_columns)
+    schema_editor.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION "{table}_search_vector_update"() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {_search_vector_sql(weighted_columns, "NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+        CREATE TRIGGER "{table}_search_vector_trigger"
+            BEFORE INSERT OR UPDATE OF {columns} ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION "{table}_search_vector_update"();
+        UPDATE "{table}" SET search_vector = {_search_vector_sql(weighted_columns)};
+        """
+    )
+
+
+def drop_search_vector_trigger(schema_editor, model):
+    table = model._meta.db_table
+    schema_editor.execute(
+        f"""
+        DROP TRIGGER IF EXISTS "{table}_search_vector_trigger" ON "{table}";
+        DROP FUNCTION IF EXISTS "{table}_search_vector_update"();
+        """
+    )
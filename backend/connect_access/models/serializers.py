@@ -1,12 +1,16 @@
+import functools
 import json
 from collections import OrderedDict
+from typing import Any, Hashable, cast
 from uuid import UUID
 
 from bidict import bidict
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.fields import SkipField
-from rest_framework.relations import PKOnlyObject
+from rest_framework.relations import PKOnlyObject, SlugRelatedField
+from rest_framework.settings import api_settings
 
 
 class UUIDEncoder(json.JSONEncoder):
@@ -131,3 +135,172 @@ class ToReprMixin(object):
             else:
                 ret[field.field_name] = field.to_representation(attribute)
         return ret
+
+
+class SparseFieldsetMixin(object):
+    """Allows to restrict the serialized fields with a fields argument.
+
+    fields is an iterable of field names, the other fields being dropped.
+
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):  # type: ignore
+                self.fields.pop(name)  # type: ignore
+
+
+class CompiledSerializerMixin(object):
+    """Read-only fast path serializing querysets in bulk from .values() rows.
+
+    The fields of the serializer are compiled once per class (and per sparse
+    fieldset) into a flat plan: the .values() path of each field, and a
+    conversion function, enum fields using plain dict lookups. Serializing a
+    row is then a loop over the plan, without the get_attribute calls and
+    checks of to_representation. The result is the same as the data of the
+    serializer, as a list of dicts.
+
+    The serializer must accept a fields argument (see SparseFieldsetMixin).
+    The plan is None when some field can't be compiled (nested serializer,
+    method field, source not mapping to a column...), callers then have to use
+    the serializer itself.
+
+    """
+
+    @classmethod
+    def get_plan(cls, fields=None):
+        """Return the plan of the serializer, restricted to fields if given.
+
+        The plans are cached by sparse fieldset, reduced to the fields of the
+        serializer whatever their order, the most recently used ones only (see
+        PLAN_CACHE_SIZE): the fieldsets come from the clients.
+
+        """
+        serializer_class = cast(Hashable, cls)
+        if fields is not None:
+            fields = tuple(sorted(set(fields) & _get_field_names(serializer_class)))
+        return _get_plan(serializer_class, fields)
+
+    @classmethod
+    def _compile(cls, fields):
+        serializer: Any = cls(context={}, fields=fields)  # type: ignore[call-arg]
+        opts = serializer.Meta.model._meta
+        plan = []
+        for field in serializer._readable_fields:
+            compiled = _compile_field(opts, field)
+            if compiled is None:
+                return None
+            path, convert = compiled
+            null = None
+            if isinstance(serializer, ToReprMixin) and isinstance(
+                field, BooleanSerializerNullField
+            ):
+                null = field.to_representation(None)
+            plan.append((field.field_name, path, convert, null))
+        return SerializerPlan(plan)
+
+
+# Plans kept in memory, for all the serializers and sparse fieldsets.
+PLAN_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=None)
+def _get_field_names(serializer_class: Any):
+    return frozenset(serializer_class(context={}).fields)
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _get_plan(serializer_class: Any, fields):
+    return serializer_class._compile(fields)
+
+
+class SerializerPlan(object):
+    def __init__(self, plan):
+        self.plan = plan
+        self.paths = list(dict.fromkeys(path for _name, path, _c, _n in plan))
+
+    def serialize(self, rows, context=None):
+        """Serialize the rows of ``queryset.values(*plan.paths)``."""
+        request = (context or {}).get("request")
+        plan = [
+            (
+                name,
+                path,
+                convert.bind(request)
+                if isinstance(convert, _FileRepresentation)
+                else convert,
+                null,
+            )
+            for name, path, convert, null in self.plan
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, path, convert, null in plan:
+                value = row[path]
+                if value is None:
+                    item[name] = null
+                elif convert is None:
+                    item[name] = value
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+
+def _compile_field(opts, field):
+    """Return the .values() path and the conversion function of a field."""
+    if field.source == "*" or len(field.source_attrs) != 1:
+        return None
+    try:
+        model_field = opts.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many:
+        return None
+    if model_field.is_relation:
+        if isinstance(field, SlugRelatedField):
+            return f"{model_field.name}__{field.slug_field}", None
+        return None
+    return model_field.name, _get_converter(model_field, field)
+
+
+def _get_converter(model_field, field):
+    """Return the conversion function, or None to keep the value as is."""
+    if isinstance(field, EnumSerializerField):
+        enum_map = dict(field.enum_map)
+        return lambda value: enum_map[value] if value else ""
+    if isinstance(field, EnumArraySerializerField):
+        enum_map = dict(field.enum_map)
+        return lambda values: [enum_map[value] for value in values if value]
+    if isinstance(field, BooleanSerializerNullField):
+        booleans = {True: "YES", False: "NO"}
+        return lambda value: booleans.get(value, "")
+    if isinstance(field, serializers.FileField):
+        use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+        return _FileRepresentation(model_field.storage, use_url)
+    if isinstance(field, serializers.ReadOnlyField) or (
+        type(field).to_representation is serializers.CharField.to_representation
+    ):
+        return None
+    return field.to_representation
+
+
+class _FileRepresentation(object):
+    """Representation of a file name, as FileField does it for a FieldFile."""
+
+    def __init__(self, storage, use_url):
+        self.storage = storage
+        self.use_url = use_url
+
+    def bind(self, request):
+        def convert(name):
+            if not name:
+                return None
+            if not self.use_url:
+                return name
+            url = self.storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return convert
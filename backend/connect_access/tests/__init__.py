@@ -0,0 +1,119 @@
+"""Pytest plugin of Connect Access, registered by the pytest11 entry point.
+
+It runs the benchmarks, the tests marked with benchmark, when --benchmark is
+given, at each of the dataset sizes of --benchmark-sizes (see benchmarks.py).
+
+"""
+import pytest
+
+from .benchmarks import (
+    BASELINES_PATH,
+    BUDGET_MEASURES,
+    BUDGETS_PATH,
+    MACHINE_MEASURES,
+    ROUNDS,
+    TOLERANCE,
+    Baselines,
+    Benchmark,
+)
+
+DATASET_SIZES = "100,1000,10000"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("connect_access", "Connect Access benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks, compared with their stored baselines.",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        help="Store the results of the benchmarks as their new budgets and baselines.",
+    )
+    group.addoption(
+        "--benchmark-sizes",
+        default=DATASET_SIZES,
+        help="Comma separated numbers of mediation requests of the datasets.",
+    )
+    group.addoption(
+        "--benchmark-rounds", type=int, default=ROUNDS, help="Rounds of each benchmark."
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=TOLERANCE,
+        help="Ratio of the baseline latency and peak memory allowed.",
+    )
+    group.addoption(
+        "--benchmark-budgets",
+        default=str(BUDGETS_PATH),
+        help="JSON file of the query budgets, committed.",
+    )
+    group.addoption(
+        "--benchmark-baselines",
+        default=str(BASELINES_PATH),
+        help="JSON file of the latency and peak memory baselines of the machine.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: benchmark, only run with the --benchmark option"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with the --benchmark option")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_generate_tests(metafunc):
+    if "dataset_size" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "dataset_size",
+            [
+                int(size)
+                for size in metafunc.config.getoption("benchmark_sizes").split(",")
+            ],
+            scope="module",
+        )
+
+
+@pytest.fixture(scope="session")
+def benchmark_baselines(request):
+    """Load the query budgets and the baselines of the machine.
+
+    They are saved at the end of the session when changed.
+
+    Yields:
+        The query budgets and the baselines of the machine.
+
+    """
+    config = request.config
+    baselines = (
+        Baselines(config.getoption("benchmark_budgets"), BUDGET_MEASURES),
+        Baselines(config.getoption("benchmark_baselines"), MACHINE_MEASURES),
+    )
+    yield baselines
+    for stored in baselines:
+        if stored.changed:
+            stored.save()
+
+
+@pytest.fixture()
+def benchmark(request, benchmark_baselines):
+    """Measure a callable against its baselines, named after the test."""
+    config = request.config
+    return Benchmark(
+        request.node.nodeid,
+        benchmark_baselines,
+        rounds=config.getoption("benchmark_rounds"),
+        tolerance=config.getoption("benchmark_tolerance"),
+        save=config.getoption("benchmark_save"),
+    )
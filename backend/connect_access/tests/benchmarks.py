@@ -0,0 +1,176 @@
+import gc
+import json
+import math
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Query budgets of the benchmarks, the same on every machine and committed.
+BUDGETS_PATH = Path(__file__).with_name("benchmarks.json")
+# Latency and peak memory baselines, depending on the machine and recorded on
+# each one, out of the repository.
+BASELINES_PATH = Path(__file__).resolve().parents[2] / ".benchmarks" / "baselines.json"
+BUDGET_MEASURES = ("queries",)
+MACHINE_MEASURES = ("p50", "p99", "peak_memory")
+# Rounds of each benchmark, after the ones warming the caches.
+ROUNDS = 100
+WARMUP_ROUNDS = 5
+# Ratio of the baseline latency and peak memory above which they regressed,
+# the query counts having to stay within their baseline.
+TOLERANCE = 1.5
+# Milliseconds added to the latency budgets, for the scheduling noise of the
+# fastest requests.
+LATENCY_SLACK = 5
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of values."""
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+def measure(func, rounds=ROUNDS):
+    """Run func rounds times, and measure its latency, queries and memory.
+
+    The garbage collector is disabled during the timed rounds, as timeit does,
+    and the memory is traced on a round of its own, tracemalloc slowing down
+    the execution of Python code.
+
+    Returns:
+        The p50 and p99 latency in milliseconds, the highest number of
+        queries of a round, and the peak of the memory allocated by a round
+        in kilobytes.
+
+    """
+    for _round in range(WARMUP_ROUNDS):
+        func()
+    latencies = []
+    queries = 0
+    gc.disable()
+    try:
+        for _round in range(rounds):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                func()
+                latencies.append((time.perf_counter() - start) * 1000)
+            queries = max(queries, len(context.captured_queries))
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "p50": round(percentile(latencies, 50), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "queries": queries,
+        "peak_memory": round(peak / 1024, 1),
+    }
+
+
+def get_regressions(result, baseline, tolerance=TOLERANCE):
+    """Compare the measures of result with the ones of baseline.
+
+    The measures missing from baseline aren't compared.
+
+    Returns:
+        A description of each regression.
+
+    """
+    regressions = []
+    if "queries" in baseline and result["queries"] > baseline["queries"]:
+        regressions.append(
+            f"{result['queries']} queries instead of {baseline['queries']}"
+        )
+    for measure_name, unit, slack in (
+        ("p50", "ms", LATENCY_SLACK),
+        ("p99", "ms", LATENCY_SLACK),
+        ("peak_memory", "kB", 0),
+    ):
+        if measure_name not in baseline:
+            continue
+        if result[measure_name] > baseline[measure_name] * tolerance + slack:
+            regressions.append(
+                f"{measure_name} of {result[measure_name]} {unit} instead of "
+                f"{baseline[measure_name]} {unit}"
+            )
+    return regressions
+
+
+class Baselines:
+    """The measures of the benchmarks, stored as JSON in path, by benchmark name.
+
+    Only the given measures of the results are stored.
+
+    """
+
+    def __init__(self, path=BASELINES_PATH, measures=MACHINE_MEASURES):
+        self.path = Path(path)
+        self.measures = measures
+        self.results = {}
+        self.changed = False
+        if self.path.exists():
+            self.results = json.loads(self.path.read_text())
+
+    def get(self, name):
+        return self.results.get(name)
+
+    def update(self, name, result):
+        self.results[name] = {
+            measure_name: result[measure_name] for measure_name in self.measures
+        }
+        self.changed = True
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(dict(sorted(self.results.items())), indent=2) + "\n"
+        )
+
+
+class Benchmark:
+    """Measure a callable, and fail when it regressed from its baselines.
+
+    baselines is a sequence of Baselines, the query budgets and the baselines
+    of the machine for instance. Without baseline in one of them, or when save
+    is set, the result becomes its baseline, stored once the session ends.
+
+    """
+
+    def __init__(self, name, baselines, rounds=ROUNDS, tolerance=TOLERANCE, save=False):
+        self.name = name
+        self.baselines = baselines
+        self.rounds = rounds
+        self.tolerance = tolerance
+        self.save = save
+        self.result = None
+
+    def __call__(self, func, *args, **kwargs):
+        """Measure func called with args and kwargs.
+
+        Returns:
+            The result of the last call of func.
+
+        """
+        returned = {}
+
+        def call():
+            returned["value"] = func(*args, **kwargs)
+
+        self.result = measure(call, self.rounds)
+        baseline = {}
+        for baselines in self.baselines:
+            stored = baselines.get(self.name)
+            if self.save or stored is None:
+                baselines.update(self.name, self.result)
+            else:
+                baseline.update(stored)
+        regressions = get_regressions(self.result, baseline, self.tolerance)
+        assert not regressions, f"{self.name}: {'; '.join(regressions)}"
+        return returned["value"]
@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Rows that can be sorted in memory at each request.
+MAX_SORTED_ROWS = 1000
+
+
+def explain(sql):
+    """Return the plan of a query, as the JSON output of EXPLAIN."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        return cursor.fetchone()[0][0]["Plan"]
+
+
+def get_plan_problems(plan, tables, max_sorted_rows=MAX_SORTED_ROWS):
+    """List the sequential scans of tables, and the sorts of their rows, in plan.
+
+    The sorts of at most max_sorted_rows rows (estimated), such as the ones of
+    the few rows selected by an index, are accepted.
+
+    Returns:
+        A description of each problem.
+
+    """
+    problems = []
+    node_type = plan["Node Type"]
+    if node_type == "Seq Scan" and plan.get("Relation Name") in tables:
+        problems.append(f"Seq Scan on {plan['Relation Name']}")
+    if node_type == "Sort" and plan["Plan Rows"] > max_sorted_rows:
+        sorted_tables = _get_scanned_tables(plan) & set(tables)
+        if sorted_tables:
+            problems.append(
+                f"Sort of {plan['Plan Rows']} rows of {', '.join(sorted(sorted_tables))}"
+            )
+    for child in plan.get("Plans", []):
+        problems += get_plan_problems(child, tables, max_sorted_rows)
+    return problems
+
+
+def _get_scanned_tables(plan):
+    tables = {plan["Relation Name"]} if "Relation Name" in plan else set()
+    for child in plan.get("Plans", []):
+        tables |= _get_scanned_tables(child)
+    return tables
+
+
+class AssertIndexedQueries(CaptureQueriesContext):
+    """Fail when a query run in the block scans or sorts one of tables.
+
+    The plans of the SELECT queries reading tables are computed with EXPLAIN
+    once the block is exited, so that the tables have to be large enough, and
+    analyzed, for the planner to choose the plans of the production database.
+
+    """
+
+    def __init__(self, tables):
+        super().__init__(connection)
+        self.tables = tables
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        selects = [
+            query["sql"]
+            for query in self.captured_queries
+            if query["sql"].startswith("SELECT")
+            and any(f'"{table}"' in query["sql"] for table in self.tables)
+        ]
+        assert selects, f"No query read {', '.join(self.tables)}."
+        for sql in selects:
+            problems = get_plan_problems(explain(sql), self.tables)
+            assert not problems, f"{'; '.join(problems)} in {sql}"
@@ -0,0 +1,133 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from connect_access.core.loading import get_class, get_classes, get_model
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+User = get_user_model()
+MediationRequest = get_model("mediations", "MediationRequest")
+TraceReport = get_model("mediations", "TraceReport")
+MediationDataGenerator = get_class("mediations.generators", "MediationDataGenerator")
+AboutServiceInformationFactory, ContactInformationFactory = get_classes(
+    "configuration.tests.factories",
+    ["AboutServiceInformationFactory", "ContactInformationFactory"],
+)
+
+
+@pytest.fixture(scope="module")
+def dataset(dataset_size, django_db_setup, django_db_blocker):
+    """dataset_size generated mediation requests, for the module.
+
+    Created in a transaction rolled back at the end of the module, the tests
+    running in savepoints.
+
+    Yields:
+        The number of mediation requests.
+
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        MediationDataGenerator(users=max(10, dataset_size // 10)).generate(dataset_size)
+        with connection.cursor() as cursor:
+            for model in (User, MediationRequest, TraceReport):
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+        yield dataset_size
+        transaction.set_rollback(True)
+
+
+@pytest.fixture()
+def admin_client(dataset):
+    client = APIClient()
+    client.force_authenticate(
+        User.objects.create(
+            email="admin@example.com", first_name="Admin", is_staff=True, is_admin=True
+        )
+    )
+    return client
+
+
+@pytest.fixture()
+def mediation_request(dataset):
+    return (
+        MediationRequest.objects.exclude(complainant=None)
+        .order_by("-request_date")
+        .first()
+    )
+
+
+def assert_ok(response):
+    assert response.status_code == 200, response.content
+    return response
+
+
+class TestMediationRequestBenchmarks:
+    def test_list(self, benchmark, admin_client):
+        response = benchmark(
+            admin_client.get,
+            reverse("api:mediation_requests-list"),
+            {"page_size": 50},
+        )
+        assert len(assert_ok(response).data["results"]) == 50
+
+    def test_create(self, benchmark, mediation_request):
+        client = APIClient()
+        client.force_authenticate(mediation_request.complainant)
+        response = benchmark(
+            client.post,
+            reverse("api:mediation_requests-list"),
+            {
+                "status": "PENDING",
+                "first_name": "John",
+                "email": "john@doe.com",
+                "issue_description": "Here is the problem",
+            },
+        )
+        assert response.status_code == 201, response.content
+
+    def test_retrieve(self, benchmark, admin_client, mediation_request):
+        assert_ok(
+            benchmark(
+                admin_client.get,
+                reverse("api:mediation_requests-detail", args=[mediation_request.uuid]),
+            )
+        )
+
+    def test_user(self, benchmark, mediation_request):
+        client = APIClient()
+        client.force_authenticate(mediation_request.complainant)
+        response = benchmark(client.get, reverse("api:mediation_requests-user"))
+        assert assert_ok(response).data
+
+
+class TestTraceReportBenchmarks:
+    def test_by_mediation_request(self, benchmark, admin_client, mediation_request):
+        assert_ok(
+            benchmark(
+                admin_client.get,
+                reverse(
+                    "api:trace_reports-by-mediation-request",
+                    args=[mediation_request.uuid],
+                ),
+            )
+        )
+
+
+class TestConfigurationBenchmarks:
+    def test_contact_information(self, benchmark, dataset):
+        ContactInformationFactory()
+        assert_ok(
+            benchmark(APIClient().get, reverse("api:configuration-contact-information"))
+        )
+
+    def test_about_service(self, benchmark, dataset):
+        AboutServiceInformationFactory.create_batch(5)
+        response = benchmark(
+            APIClient().get, reverse("api:configuration-about-service")
+        )
+        assert len(assert_ok(response).json()) == 5
+
+    def test_index(self, benchmark, dataset):
+        assert_ok(benchmark(APIClient().get, reverse("home")))
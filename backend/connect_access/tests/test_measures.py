@@ -0,0 +1,84 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from connect_access.tests.benchmarks import (
+    BUDGET_MEASURES,
+    Baselines,
+    Benchmark,
+    get_regressions,
+    measure,
+    percentile,
+)
+
+User = get_user_model()
+
+BASELINE = {"p50": 10, "p99": 20, "queries": 3, "peak_memory": 100}
+
+
+def test_percentile_is_the_nearest_rank():
+    values = list(range(100, 0, -1))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+
+
+@pytest.mark.django_db()
+def test_measure_counts_the_queries_of_a_round():
+    result = measure(lambda: list(User.objects.all()), rounds=3)
+    assert result["queries"] == 1
+    assert result["p50"] <= result["p99"]
+    assert result["peak_memory"] > 0
+
+
+def test_get_regressions_allows_the_tolerance_of_the_measures():
+    assert not get_regressions(
+        {"p50": 19, "p99": 34, "queries": 3, "peak_memory": 149}, BASELINE
+    )
+    assert get_regressions(
+        {"p50": 21, "p99": 20, "queries": 4, "peak_memory": 151}, BASELINE
+    ) == [
+        "4 queries instead of 3",
+        "p50 of 21 ms instead of 10 ms",
+        "peak_memory of 151 kB instead of 100 kB",
+    ]
+
+
+def test_get_regressions_ignores_the_measures_missing_from_the_baseline():
+    assert get_regressions(
+        {"p50": 21, "p99": 20, "queries": 4, "peak_memory": 151}, {"queries": 3}
+    ) == ["4 queries instead of 3"]
+
+
+@pytest.mark.django_db()
+def test_benchmark_records_the_missing_baselines_apart(tmp_path):
+    budgets = Baselines(tmp_path / "budgets.json", BUDGET_MEASURES)
+    baselines = Baselines(tmp_path / "machine" / "baselines.json")
+    assert Benchmark("sum", (budgets, baselines), rounds=2)(sum, [1, 2]) == 3
+    budgets.save()
+    baselines.save()
+    assert Baselines(tmp_path / "budgets.json").get("sum") == {"queries": 0}
+    assert set(Baselines(tmp_path / "machine" / "baselines.json").get("sum")) == {
+        "p50",
+        "p99",
+        "peak_memory",
+    }
+
+
+@pytest.mark.django_db()
+def test_benchmark_compares_with_the_budgets_without_machine_baselines(tmp_path):
+    budgets = Baselines(tmp_path / "budgets.json", BUDGET_MEASURES)
+    budgets.update("count", {"queries": 0})
+    baselines = Baselines(tmp_path / "baselines.json")
+    benchmark = Benchmark("count", (budgets, baselines), rounds=2)
+    with pytest.raises(AssertionError, match="count: 1 queries instead of 0"):
+        benchmark(User.objects.count)
+    assert baselines.changed
+
+
+@pytest.mark.django_db()
+def test_benchmark_fails_on_regression(tmp_path):
+    baselines = Baselines(tmp_path / "baselines.json")
+    baselines.update("sum", {"p50": 0, "p99": 0, "queries": 0, "peak_memory": 0})
+    benchmark = Benchmark("sum", (baselines,), rounds=2)
+    with pytest.raises(AssertionError, match="sum: peak_memory"):
+        benchmark(list, map(str, range(1000)))